@@ -12,7 +12,7 @@ from typing import Any, Callable, Optional, Union
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import FileResponse
 
-from .. import background_tasks, core, helpers
+from .. import background_tasks, core, helpers, outbox
 from ..client import Client
 from ..logging import log
 from ..native import NativeConfig
@@ -70,6 +70,16 @@ class App(FastAPI):
         """Return whether NiceGUI is stopped."""
         return self._state == State.STOPPED
 
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of the outbox metrics aggregated over all clients (*added in version 3.5.0*).
+
+        Contains counters for enqueued updates and messages, emitted messages, packets and bytes,
+        histograms of flush durations and acknowledgement lags,
+        as well as the current queue depths, unacknowledged bytes, history sizes and compression statistics.
+        """
+        return outbox.get_metrics(client.outbox for client in Client.instances.values())
+
     def start(self) -> None:
         """Start NiceGUI. (For internal use only.)"""
         self._state = State.STARTING
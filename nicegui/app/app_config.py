@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal, Optional, Union
 
+from .. import optional_features
 from ..dataclasses import KWONLY_SLOTS
 from ..language import Language
 
@@ -38,6 +39,12 @@ class AppConfig:
     binding_refresh_interval: Optional[float] = field(init=False)
     reconnect_timeout: float = field(init=False)
     message_history_length: int = field(init=False)
+    message_history_size: int = field(init=False)
+    message_history_total_size: int = field(init=False)
+    message_batch_size: int = field(init=False)
+    message_buffer_size: Optional[int] = field(init=False)
+    message_compression_threshold: Optional[int] = field(init=False)
+    socket_encoding: Literal['json', 'msgpack'] = field(init=False)
     cache_control_directives: str = field(init=False)
     tailwind: bool = field(init=False)
     prod_js: bool = field(init=False)
@@ -55,6 +62,12 @@ class AppConfig:
                        binding_refresh_interval: Optional[float],
                        reconnect_timeout: float,
                        message_history_length: int,
+                       message_history_size: int,
+                       message_history_total_size: int,
+                       message_batch_size: int,
+                       message_buffer_size: Optional[int],
+                       message_compression_threshold: Optional[int],
+                       socket_encoding: Literal['json', 'msgpack'],
                        cache_control_directives: str = 'public, max-age=31536000, immutable, stale-while-revalidate=31536000',
                        tailwind: bool,
                        prod_js: bool,
@@ -70,6 +83,14 @@ class AppConfig:
         self.binding_refresh_interval = binding_refresh_interval
         self.reconnect_timeout = reconnect_timeout
         self.message_history_length = message_history_length
+        self.message_history_size = message_history_size
+        self.message_history_total_size = message_history_total_size
+        self.message_batch_size = message_batch_size
+        self.message_buffer_size = message_buffer_size
+        self.message_compression_threshold = message_compression_threshold
+        if socket_encoding == 'msgpack' and not optional_features.has('msgpack'):
+            raise ImportError('msgpack is not installed. Please run "pip install nicegui[msgpack]".')
+        self.socket_encoding = socket_encoding
         self.cache_control_directives = cache_control_directives
         self.tailwind = tailwind
         self.prod_js = prod_js
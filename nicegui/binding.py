@@ -3,31 +3,96 @@ from __future__ import annotations
 import asyncio
 import copyreg
 import dataclasses
+import functools
+import itertools
 import time
 import weakref
 from collections import defaultdict
-from collections.abc import Iterable, Mapping
-from contextvars import ContextVar
+from collections.abc import Iterable, Iterator, Mapping
+from contextvars import ContextVar, Token
 from typing import TYPE_CHECKING, Any, Callable, Literal, TypeVar
 
 from typing_extensions import dataclass_transform
 
-from . import core
+from . import core, helpers
+from .dataclasses import KWONLY_SLOTS
 from .logging import log
+from .observables import ObservableCollection
 
 if TYPE_CHECKING:
     from _typeshed import DataclassInstance, IdentityFunction
 
 MAX_PROPAGATION_TIME = 0.01
+REFRESH_TIME_BUDGET: float | None = 0.005
+MAX_REFRESH_BACKOFF = 8
+
+
+class _BindableProperties(Mapping):
+    """Read-only view of all bindable properties that have been set, keyed by object ID and property name.
+
+    Objects are registered once when the first of their bindable properties is set
+    and are dropped automatically when they are garbage collected.
+    """
+
+    def __getitem__(self, key: tuple[int, str]) -> Any:
+        obj_id, name = key
+        owner = _bindable_owners.get(obj_id)
+        if owner is None or name not in _set_bindable_property_names(owner):
+            raise KeyError(key)
+        return owner
+
+    def __iter__(self) -> Iterator[tuple[int, str]]:
+        for obj_id, owner in list(_bindable_owners.items()):
+            for name in _set_bindable_property_names(owner):
+                yield obj_id, name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def clear(self) -> None:
+        """Forget all registered objects."""
+        _bindable_owners.clear()
+
+
+def _set_bindable_property_names(owner: Any) -> list[str]:
+    values = vars(owner)
+    return [
+        name
+        for cls in type(owner).__mro__
+        for name, attribute in vars(cls).items()
+        if isinstance(attribute, BindableProperty) and attribute.attribute_name in values
+    ]
 
-propagation_visited: ContextVar[set[tuple[int, str]] | None] = ContextVar('propagation_visited', default=None)
 
-bindings: defaultdict[tuple[int, str], list[tuple[Any, Any, str, Callable[[Any], Any] | None]]] = defaultdict(list)
-bindable_properties: weakref.WeakValueDictionary[tuple[int, str], Any] = weakref.WeakValueDictionary()
-active_links: list[tuple[Any, str, Any, str, Callable[[Any], Any] | None]] = []
+propagation_visited: ContextVar[set[tuple[int, str]] | None] = ContextVar('propagation_visited', default=None)
+_deferred_sources: ContextVar[dict[tuple[int, str], tuple[Any, str, Any]] | None] = \
+    ContextVar('deferred_sources', default=None)
+_MISSING = object()
+
+bindings: defaultdict[tuple[int, str], dict[int, tuple[Any, Any, str, Callable[[Any], Any] | None]]] = defaultdict(dict)
+_bindable_owners: weakref.WeakValueDictionary[int, Any] = weakref.WeakValueDictionary()
+active_links: dict[int, tuple[Any, str, Any, str, Callable[[Any], Any] | None]] = {}
+observed_links: defaultdict[int, dict[int, tuple[Any, str, Any, str, Callable[[Any], Any] | None]]] = defaultdict(dict)
+_links: dict[int, tuple[Any, str, Any, str, Callable[[Any], Any] | None]] = {}
+_object_links: defaultdict[int, set[int]] = defaultdict(set)
+_link_ids = itertools.count()
+_observed_sources: weakref.WeakValueDictionary[int, Any] = weakref.WeakValueDictionary()
+_observer_hooks: dict[int, Callable[..., Any]] = {}
+_dirty_sources: set[int] = set()
+_poll_queue: list[int] = []
+_poll_position = 0
+_poll_round = 0
+_poll_schedule: dict[int, tuple[int, int]] = {}
+_link_stats: dict[tuple[int, str, int, str], LinkStats] | None = None
+_dependents: defaultdict[tuple[int, str], dict[tuple[int, str], tuple[weakref.ref, ComputedProperty]]] = \
+    defaultdict(dict)
+_dependencies: dict[tuple[int, str], set[tuple[int, str]]] = {}
+_dependency_stack: list[list[tuple[Any, str]]] = []
+bindable_properties = _BindableProperties()
 _active_links_added = asyncio.Event()
 
 TC = TypeVar('TC', bound=type)
+F = TypeVar('F', bound=Callable[..., Any])
 T = TypeVar('T')
 
 
@@ -59,29 +124,188 @@ async def refresh_loop() -> None:
         core.app.config.binding_refresh_interval = 0.1
         log.warning('Starting active binding loop even though it was disabled via binding_refresh_interval=None.')
     while True:
-        _refresh_step()
+        _refresh_step(REFRESH_TIME_BUDGET)
         try:
             await asyncio.sleep(core.app.config.binding_refresh_interval)
         except asyncio.CancelledError:
             break
 
 
-def _refresh_step() -> None:
+def _refresh_step(time_budget: float | None = None) -> None:
+    """Refresh links of dirty sources and poll active links.
+
+    Without time budget all active links are polled.
+    Otherwise polling stops when the budget is exhausted and resumes at the same position in the next step.
+    Links whose source did not change are polled less often (up to every ``MAX_REFRESH_BACKOFF`` rounds).
+    """
     t = time.time()
-    for link in active_links:
-        (source_obj, source_name, target_obj, target_name, transform) = link
-        if _has_attribute(source_obj, source_name):
-            source_value = _get_attribute(source_obj, source_name)
-            value = transform(source_value) if transform else source_value
-            if not _has_attribute(target_obj, target_name) or _get_attribute(target_obj, target_name) != value:
-                _set_attribute(target_obj, target_name, value)
-                _propagate(target_obj, target_name)
-        del link, source_obj, target_obj  # pylint: disable=modified-iterating-list
+    count = 0
+    if _dirty_sources:
+        dirty_sources = list(_dirty_sources)
+        _dirty_sources.clear()
+        for source_id in dirty_sources:
+            links = tuple(observed_links.get(source_id, {}).values())
+            count += len(links)
+            for link in links:
+                _refresh_link(link)
+            if (source_id, '') in _dependents:
+                _update_dependents((source_id, ''))
+    if time_budget is None:
+        for link_id, link in tuple(active_links.items()):
+            if _refresh_link(link):
+                _poll_schedule.pop(link_id, None)
+        count += len(active_links)
+    else:
+        count += _poll_active_links(t + time_budget)
     if time.time() - t > MAX_PROPAGATION_TIME:
-        log.warning(f'binding propagation for {len(active_links)} active links took {time.time() - t:.3f} s')
+        log.warning(f'binding propagation for {count} active links took {time.time() - t:.3f} s')
+
+
+def _poll_active_links(deadline: float) -> int:
+    global _poll_position, _poll_round  # pylint: disable=global-statement # noqa: PLW0603
+    if _poll_position >= len(_poll_queue):
+        _poll_queue[:] = active_links
+        _poll_position = 0
+        _poll_round += 1
+    count = 0
+    while _poll_position < len(_poll_queue):
+        link_id = _poll_queue[_poll_position]
+        _poll_position += 1
+        link = active_links.get(link_id)
+        if link is None:
+            continue
+        next_round, backoff = _poll_schedule.get(link_id, (0, 1))
+        if next_round > _poll_round:
+            continue
+        backoff = 1 if _refresh_link(link) else min(2 * backoff, MAX_REFRESH_BACKOFF)
+        _poll_schedule[link_id] = (_poll_round + backoff, backoff)
+        count += 1
+        if time.time() > deadline:
+            break
+    return count
+
+
+def _refresh_link(link: tuple[Any, str, Any, str, Callable[[Any], Any] | None]) -> bool:
+    (source_obj, source_name, target_obj, target_name, transform) = link
+    if _has_attribute(source_obj, source_name):
+        source_value = _get_attribute(source_obj, source_name)
+        if _link_stats is None:
+            value = transform(source_value) if transform else source_value
+        else:
+            value = _profile_transform(source_obj, source_name, target_obj, target_name, transform, source_value)
+        if not _has_attribute(target_obj, target_name) or _get_attribute(target_obj, target_name) != value:
+            if _link_stats is not None:
+                _profile_change(source_obj, source_name, target_obj, target_name)
+            _set_attribute(target_obj, target_name, value)
+            _propagate(target_obj, target_name)
+            return True
+    return False
+
+
+def _mark_dirty(source_id: int) -> None:
+    _dirty_sources.add(source_id)
+
+
+def _observe(source_obj: Any) -> bool:
+    """Register a change hook on the source object if it can notify about changes itself.
+
+    Observable collections and objects exposing an ``on_binding_change(callback)`` method are observed.
+    The hook is registered only once per object and marks the object as dirty whenever it reports a change.
+
+    :return: whether the source object is observed or needs to be polled
+    """
+    source_id = id(source_obj)
+    if _observed_sources.get(source_id) is source_obj:
+        return True
+    if isinstance(source_obj, ObservableCollection):
+        register = source_obj.on_change
+    elif isinstance(source_obj, type) or not callable(getattr(source_obj, 'on_binding_change', None)):
+        return False
+    else:
+        register = source_obj.on_binding_change
+    try:
+        _observed_sources[source_id] = source_obj
+    except TypeError:
+        return False  # NOTE: objects without support for weak references are polled
+    hook = functools.partial(_mark_dirty, source_id)
+    register(hook)
+    if isinstance(source_obj, ObservableCollection):
+        _observer_hooks[source_id] = hook
+    return True
+
+
+def _unobserve_if_unused(source_id: int) -> None:
+    """Remove the change hook of a source object that is no longer the source of observed links or computed properties.
+
+    Objects with an ``on_binding_change`` method keep their hook, because it can not be unregistered.
+    """
+    if source_id in observed_links or (source_id, '') in _dependents:
+        return
+    hook = _observer_hooks.pop(source_id, None)
+    if hook is None:
+        return
+    source_obj = _observed_sources.pop(source_id, None)
+    if source_obj is not None:
+        source_obj.remove_change_handler(hook)
+    _dirty_sources.discard(source_id)
+
+
+def _is_bindable_property(obj: Any, name: str) -> bool:
+    return isinstance(getattr(type(obj), name, None), (BindableProperty, ComputedProperty))
+
+
+def _add_link(source_obj: Any, source_name: str, target_obj: Any, target_name: str,
+              transform: Callable[[Any], Any] | None) -> None:
+    link_id = next(_link_ids)
+    link = (source_obj, source_name, target_obj, target_name, transform)
+    _links[link_id] = link
+    _object_links[id(source_obj)].add(link_id)
+    _object_links[id(target_obj)].add(link_id)
+    bindings[(id(source_obj), source_name)][link_id] = (source_obj, target_obj, target_name, transform)
+    if _is_bindable_property(source_obj, source_name):
+        return
+    if _observe(source_obj):
+        observed_links[id(source_obj)][link_id] = link
+    else:
+        active_links[link_id] = link
+    _active_links_added.set()
+
+
+def _remove_link(link_id: int) -> None:
+    source_obj, source_name, target_obj, _, _ = _links.pop(link_id)
+    source_id = id(source_obj)
+    for obj_id in {source_id, id(target_obj)}:
+        link_ids = _object_links.get(obj_id)
+        if link_ids is not None:
+            link_ids.discard(link_id)
+            if not link_ids:
+                del _object_links[obj_id]
+    key = (source_id, source_name)
+    binding_dict = bindings[key]
+    del binding_dict[link_id]
+    if not binding_dict:
+        del bindings[key]
+    active_links.pop(link_id, None)
+    _poll_schedule.pop(link_id, None)
+    links = observed_links.get(source_id)
+    if links is not None:
+        links.pop(link_id, None)
+        if not links:
+            del observed_links[source_id]
+            _dirty_sources.discard(source_id)
+            _unobserve_if_unused(source_id)
 
 
 def _propagate(source_obj: Any, source_name: str) -> None:
+    key = (id(source_obj), source_name)
+    if key not in bindings and key not in _dependents:
+        return
+    deferred_sources = _deferred_sources.get()
+    if deferred_sources is not None:
+        if key not in deferred_sources:
+            value = _get_attribute(source_obj, source_name) if _has_attribute(source_obj, source_name) else _MISSING
+            deferred_sources[key] = (source_obj, source_name, value)
+        return
     token = propagation_visited.set(set())
     try:
         _propagate_recursively(source_obj, source_name)
@@ -102,15 +326,236 @@ def _propagate_recursively(source_obj: Any, source_name: str) -> None:
         return
     source_value = _get_attribute(source_obj, source_name)
 
-    for _, target_obj, target_name, transform in bindings.get((source_obj_id, source_name), []):
+    for _, target_obj, target_name, transform in tuple(bindings.get((source_obj_id, source_name), {}).values()):
         if (id(target_obj), target_name) in visited:
             continue
 
-        target_value = transform(source_value) if transform else source_value
+        if _link_stats is None:
+            target_value = transform(source_value) if transform else source_value
+        else:
+            target_value = _profile_transform(source_obj, source_name, target_obj, target_name, transform, source_value)
         if not _has_attribute(target_obj, target_name) or _get_attribute(target_obj, target_name) != target_value:
+            if _link_stats is not None:
+                _profile_change(source_obj, source_name, target_obj, target_name)
             _set_attribute(target_obj, target_name, target_value)
             _propagate_recursively(target_obj, target_name)
 
+    if (source_obj_id, source_name) in _dependents:
+        _update_dependents((source_obj_id, source_name))
+
+
+def _update_dependents(key: tuple[int, str]) -> None:
+    """Update all computed properties depending on the given key and propagate those whose value changed."""
+    visited = propagation_visited.get()
+    token = propagation_visited.set(set()) if visited is None else None
+    try:
+        for owner_ref, prop in tuple(_dependents.get(key, {}).values()):
+            owner = owner_ref()
+            if owner is not None and prop._update(owner):  # pylint: disable=protected-access
+                visited = propagation_visited.get()
+                assert visited is not None
+                visited.discard((id(owner), prop.name))
+                _propagate_recursively(owner, prop.name)
+    finally:
+        if token is not None:
+            propagation_visited.reset(token)
+
+
+@dataclasses.dataclass(**KWONLY_SLOTS)
+class LinkStats:
+    """Statistics of a single binding link recorded by the binding profiler."""
+    source: str
+    target: str
+    evaluations: int = 0
+    changes: int = 0
+    transform_time: float = 0.0
+    max_transform_time: float = 0.0
+
+    @property
+    def change_rate(self) -> float:
+        """Fraction of evaluations that changed the target."""
+        return self.changes / self.evaluations if self.evaluations else 0.0
+
+
+def start_profiling() -> None:
+    """Start recording evaluation count, transform time and change frequency of every binding link.
+
+    Profiling adds some overhead to each propagation and should only be enabled for diagnosis.
+
+    *Added in version 3.5.0*
+    """
+    global _link_stats  # pylint: disable=global-statement # noqa: PLW0603
+    if _link_stats is None:
+        _link_stats = {}
+
+
+def stop_profiling() -> None:
+    """Stop the binding profiler and discard the recorded statistics.
+
+    *Added in version 3.5.0*
+    """
+    global _link_stats  # pylint: disable=global-statement # noqa: PLW0603
+    _link_stats = None
+
+
+def get_profile_report(*,
+                       sort_by: Literal['transform_time', 'evaluations', 'changes'] = 'transform_time',
+                       limit: int | None = None) -> list[LinkStats]:
+    """Get the statistics recorded by the binding profiler, most expensive links first.
+
+    *Added in version 3.5.0*
+
+    :param sort_by: statistic to sort by (default: "transform_time")
+    :param limit: maximum number of links to return (default: all)
+    """
+    if _link_stats is None:
+        return []
+    report = sorted(_link_stats.values(), key=lambda stats: getattr(stats, sort_by), reverse=True)
+    return report[:limit]
+
+
+def log_profile_report(*,
+                       sort_by: Literal['transform_time', 'evaluations', 'changes'] = 'transform_time',
+                       limit: int | None = 20) -> None:
+    """Log the statistics recorded by the binding profiler, most expensive links first.
+
+    *Added in version 3.5.0*
+
+    :param sort_by: statistic to sort by (default: "transform_time")
+    :param limit: maximum number of links to log (default: 20)
+    """
+    lines = [
+        f'{stats.transform_time * 1000:10.3f} ms {stats.evaluations:8d} evaluations {stats.change_rate:6.1%} changes  '
+        f'{stats.source} -> {stats.target}'
+        for stats in get_profile_report(sort_by=sort_by, limit=limit)
+    ]
+    log.info('binding profile:\n' + '\n'.join(lines) if lines else 'binding profile: no links evaluated')
+
+
+def _describe(obj: Any, name: str) -> str:
+    if isinstance(obj, type):
+        return f'{obj.__name__}.{name}'
+    if isinstance(obj, Mapping):
+        return f'{type(obj).__name__}[{name!r}]'
+    obj_id = getattr(obj, 'id', None)
+    if isinstance(obj_id, int):
+        return f'{type(obj).__name__}(id={obj_id}).{name}'
+    return f'{type(obj).__name__}.{name}'
+
+
+def _get_link_stats(source_obj: Any, source_name: str, target_obj: Any, target_name: str) -> LinkStats:
+    assert _link_stats is not None
+    key = (id(source_obj), source_name, id(target_obj), target_name)
+    stats = _link_stats.get(key)
+    if stats is None:
+        stats = _link_stats[key] = LinkStats(source=_describe(source_obj, source_name),
+                                             target=_describe(target_obj, target_name))
+    return stats
+
+
+def _profile_transform(source_obj: Any, source_name: str, target_obj: Any, target_name: str,
+                       transform: Callable[[Any], Any] | None, value: Any) -> Any:
+    stats = _get_link_stats(source_obj, source_name, target_obj, target_name)
+    start = time.perf_counter()
+    try:
+        return transform(value) if transform else value
+    finally:
+        duration = time.perf_counter() - start
+        stats.evaluations += 1
+        stats.transform_time += duration
+        stats.max_transform_time = max(stats.max_transform_time, duration)
+
+
+def _profile_change(source_obj: Any, source_name: str, target_obj: Any, target_name: str) -> None:
+    _get_link_stats(source_obj, source_name, target_obj, target_name).changes += 1
+
+
+class _Batch:
+
+    def __init__(self) -> None:
+        self._token: Token[dict[tuple[int, str], tuple[Any, str, Any]] | None] | None = None
+
+    def __enter__(self) -> None:
+        if _deferred_sources.get() is None:
+            self._token = _deferred_sources.set({})
+
+    def __exit__(self, *_: Any) -> None:
+        if self._token is None:
+            return
+        deferred_sources = _deferred_sources.get()
+        assert deferred_sources is not None
+        _deferred_sources.reset(self._token)
+        self._token = None
+        _propagate_deferred(deferred_sources)
+
+    def __call__(self, func: F) -> F:
+        if helpers.is_coroutine_function(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _Batch():
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _Batch():
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore
+
+
+def batch() -> _Batch:
+    """Defer binding propagation until the end of a block.
+
+    Within the ``with binding.batch():`` block (or the function decorated with ``@binding.batch()``)
+    changes of bindable properties are recorded instead of being propagated immediately.
+    When leaving the outermost batch, each changed source is propagated once
+    and sources that are reached by other changed sources are propagated after them (topological order).
+    Every affected property is updated at most once.
+
+    *Added in version 3.5.0*
+    """
+    return _Batch()
+
+
+def _propagate_deferred(deferred_sources: dict[tuple[int, str], tuple[Any, str, Any]]) -> None:
+    while deferred_sources:
+        downstream: set[tuple[int, str]] = set()
+        for key in deferred_sources:
+            downstream.update(k for k in _reachable_keys(key) if k != key and k in deferred_sources)
+        keys = [key for key in deferred_sources if key not in downstream] + \
+            [key for key in deferred_sources if key in downstream]
+        visited: set[tuple[int, str]] = set()
+        visited_token = propagation_visited.set(visited)
+        deferred_token = _deferred_sources.set({})
+        try:
+            for key in keys:
+                source_obj, source_name, _ = deferred_sources[key]
+                _propagate_recursively(source_obj, source_name)
+        finally:
+            nested_sources = _deferred_sources.get()
+            _deferred_sources.reset(deferred_token)
+            propagation_visited.reset(visited_token)
+        assert nested_sources is not None
+        # NOTE: nodes updated during this round have been propagated already unless change handlers modified them again
+        deferred_sources = {
+            key: (source_obj, source_name, value)
+            for key, (source_obj, source_name, value) in nested_sources.items()
+            if key not in visited or not _has_attribute(source_obj, source_name) or
+            _get_attribute(source_obj, source_name) != value
+        }
+
+
+def _reachable_keys(key: tuple[int, str]) -> set[tuple[int, str]]:
+    reachable: set[tuple[int, str]] = set()
+    stack = [key]
+    while stack:
+        for _, target_obj, target_name, _ in bindings.get(stack.pop(), {}).values():
+            target_key = (id(target_obj), target_name)
+            if target_key not in reachable:
+                reachable.add(target_key)
+                stack.append(target_key)
+    return reachable
+
 
 def _check_attribute_exists(other_obj: Any, other_name: str, *, role: Literal['self', 'other']) -> None:
     if not _has_attribute(other_obj, other_name):
@@ -152,10 +597,7 @@ def bind_to(self_obj: Any, self_name: str, other_obj: Any, other_name: str,
         (default: None, performs a check if the object is not a dictionary, *added in version 3.0.0*).
     """
     _check_self_and_other_attribute(self_obj, self_name, other_obj, other_name, self_strict, other_strict)
-    bindings[(id(self_obj), self_name)].append((self_obj, other_obj, other_name, forward))
-    if (id(self_obj), self_name) not in bindable_properties:
-        active_links.append((self_obj, self_name, other_obj, other_name, forward))
-        _active_links_added.set()
+    _add_link(self_obj, self_name, other_obj, other_name, forward)
     _propagate(self_obj, self_name)
 
 
@@ -178,10 +620,7 @@ def bind_from(self_obj: Any, self_name: str, other_obj: Any, other_name: str,
         performs a check if the object is not a dictionary, *added in version 3.0.0*).
     """
     _check_self_and_other_attribute(self_obj, self_name, other_obj, other_name, self_strict, other_strict)
-    bindings[(id(other_obj), other_name)].append((other_obj, self_obj, self_name, backward))
-    if (id(other_obj), other_name) not in bindable_properties:
-        active_links.append((other_obj, other_name, self_obj, self_name, backward))
-        _active_links_added.set()
+    _add_link(other_obj, other_name, self_obj, self_name, backward)
     _propagate(other_obj, other_name)
 
 
@@ -219,47 +658,146 @@ class BindableProperty:
 
     def __set_name__(self, _, name: str) -> None:
         self.name = name  # pylint: disable=attribute-defined-outside-init
+        self.attribute_name = '___' + name  # pylint: disable=attribute-defined-outside-init
 
     def __get__(self, owner: Any, _=None) -> Any:
-        return getattr(owner, '___' + self.name)
+        if owner is None:
+            return self
+        if _dependency_stack:
+            _dependency_stack[-1].append((owner, self.name))
+        try:
+            return owner.__dict__[self.attribute_name]
+        except KeyError:
+            raise AttributeError(f"'{type(owner).__name__}' object has no attribute '{self.name}'") from None
 
     def __set__(self, owner: Any, value: Any) -> None:
-        has_attr = hasattr(owner, '___' + self.name)
+        values = owner.__dict__
+        old_value = values.get(self.attribute_name, _MISSING)
+        has_attr = old_value is not _MISSING
         if not has_attr:
-            _make_copyable(type(owner))
-        value_changed = has_attr and getattr(owner, '___' + self.name) != value
+            _register_owner(owner)
+        value_changed = has_attr and old_value != value
         if has_attr and not value_changed:
             return
-        setattr(owner, '___' + self.name, value)
-        key = (id(owner), str(self.name))
-        bindable_properties[key] = owner
+        values[self.attribute_name] = value
         _propagate(owner, self.name)
         if value_changed and self._change_handler is not None:
             self._change_handler(owner, value)
 
 
+def _register_owner(owner: Any) -> None:
+    if _bindable_owners.get(id(owner)) is not owner:
+        _make_copyable(type(owner))
+        _bindable_owners[id(owner)] = owner
+
+
+class ComputedProperty:
+
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self._func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, _, name: str) -> None:
+        self.name = name  # pylint: disable=attribute-defined-outside-init
+
+    def __get__(self, owner: Any, _=None) -> Any:
+        if owner is None:
+            return self
+        if _dependency_stack:
+            _dependency_stack[-1].append((owner, self.name))
+        value = owner.__dict__.get('___' + self.name, _MISSING)
+        if value is _MISSING or (id(owner), self.name) not in _dependencies:
+            value = self._evaluate(owner)
+        return value
+
+    def __set__(self, owner: Any, value: Any) -> None:
+        raise AttributeError(f'Computed property "{self.name}" can not be set')
+
+    def _evaluate(self, owner: Any) -> Any:
+        reads: list[tuple[Any, str]] = []
+        _dependency_stack.append(reads)
+        try:
+            value = self._func(owner)
+        finally:
+            _dependency_stack.pop()
+        owner.__dict__['___' + self.name] = value
+        _set_dependencies(owner, self, reads)
+        return value
+
+    def _update(self, owner: Any) -> bool:
+        """Re-evaluate the value if someone is listening, otherwise invalidate it.
+
+        :return: whether the value has changed
+        """
+        key = (id(owner), self.name)
+        if key not in bindings and key not in _dependents:
+            owner.__dict__.pop('___' + self.name, None)
+            return False
+        old_value = owner.__dict__.get('___' + self.name, _MISSING)
+        new_value = self._evaluate(owner)
+        return old_value is _MISSING or new_value != old_value
+
+
+def computed(func: Callable[[Any], Any]) -> Any:
+    """Decorator turning a method into a computed bindable property.
+
+    The value is cached and only re-evaluated when one of the bindable or computed properties read during evaluation
+    (or an observable collection stored in one of them) changes.
+    Bindings to the computed property are updated only if the new value differs from the old one.
+    Computed properties can be used as source for bindings, but can not be set.
+
+    *Added in version 3.5.0*
+
+    :param func: method computing the value from other properties of the object
+    """
+    return ComputedProperty(func)
+
+
+def _set_dependencies(owner: Any, prop: ComputedProperty, reads: list[tuple[Any, str]]) -> None:
+    key = (id(owner), prop.name)
+    dependencies: set[tuple[int, str]] = set()
+    for obj, name in reads:
+        dependencies.add((id(obj), name))
+        value = vars(obj).get('___' + name)
+        if isinstance(value, ObservableCollection) and _observe(value):
+            dependencies.add((id(value), ''))
+            _active_links_added.set()
+    old_dependencies = _dependencies.get(key)
+    if old_dependencies is None:
+        weakref.finalize(owner, _forget_dependencies, key)
+        old_dependencies = set()
+    for dependency in old_dependencies - dependencies:
+        _remove_dependent(dependency, key)
+    for dependency in dependencies - old_dependencies:
+        _dependents[dependency][key] = (weakref.ref(owner), prop)
+    _dependencies[key] = dependencies
+
+
+def _forget_dependencies(key: tuple[int, str]) -> None:
+    for dependency in _dependencies.pop(key, ()):
+        _remove_dependent(dependency, key)
+
+
+def _remove_dependent(dependency: tuple[int, str], key: tuple[int, str]) -> None:
+    dependents = _dependents.get(dependency)
+    if dependents is not None:
+        dependents.pop(key, None)
+        if not dependents:
+            del _dependents[dependency]
+            if dependency[1] == '':
+                _unobserve_if_unused(dependency[0])
+
+
 def remove(objects: Iterable[Any]) -> None:
     """Remove all bindings that involve the given objects.
 
     :param objects: The objects to remove.
     """
-    object_ids = set(map(id, objects))
-    active_links[:] = [
-        (source_obj, source_name, target_obj, target_name, transform)
-        for source_obj, source_name, target_obj, target_name, transform in active_links
-        if id(source_obj) not in object_ids and id(target_obj) not in object_ids
-    ]
-    for key, binding_list in list(bindings.items()):
-        binding_list[:] = [
-            (source_obj, target_obj, target_name, transform)
-            for source_obj, target_obj, target_name, transform in binding_list
-            if id(source_obj) not in object_ids and id(target_obj) not in object_ids
-        ]
-        if not binding_list:
-            del bindings[key]
-    for obj_id, name in list(bindable_properties):
-        if obj_id in object_ids:
-            del bindable_properties[(obj_id, name)]
+    link_ids: set[int] = set()
+    for obj in objects:
+        link_ids.update(_object_links.pop(id(obj), ()))
+    for link_id in link_ids:
+        _remove_link(link_id)
 
 
 def reset() -> None:
@@ -267,9 +805,27 @@ def reset() -> None:
 
     This function is intended for testing purposes only.
     """
+    global _poll_position, _poll_round  # pylint: disable=global-statement # noqa: PLW0603
+    stop_profiling()
+    for source_id, hook in _observer_hooks.items():
+        source_obj = _observed_sources.get(source_id)
+        if source_obj is not None:
+            source_obj.remove_change_handler(hook)
+    _observer_hooks.clear()
+    _observed_sources.clear()
+    _poll_position = 0
+    _poll_round = 0
     bindings.clear()
     bindable_properties.clear()
     active_links.clear()
+    observed_links.clear()
+    _poll_queue.clear()
+    _poll_schedule.clear()
+    _dependents.clear()
+    _dependencies.clear()
+    _links.clear()
+    _object_links.clear()
+    _dirty_sources.clear()
 
 
 @dataclass_transform()
@@ -314,7 +870,7 @@ def bindable_dataclass(cls: TC | None = None, /, *,
 
 
 def _make_copyable(cls: type[T]) -> None:
-    """Tell the copy module to update the ``bindable_properties`` dictionary when an object is copied."""
+    """Tell the copy module to register copies of objects with bindable properties."""
     if cls in copyreg.dispatch_table:
         return
 
@@ -325,9 +881,8 @@ def _make_copyable(cls: type[T]) -> None:
 
         def creator_with_hook(*args, **kwargs) -> T:
             copy = creator(*args, **kwargs)
-            for attr_name in dir(obj):
-                if (id(obj), attr_name) in bindable_properties:
-                    bindable_properties[(id(copy), attr_name)] = copy
+            if _bindable_owners.get(id(obj)) is obj:
+                _bindable_owners[id(copy)] = copy
             return copy
         return (creator_with_hook, *reduced[1:])
     copyreg.pickle(cls, _pickle_function)
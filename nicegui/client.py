@@ -5,7 +5,7 @@ import inspect
 import time
 import uuid
 from collections import defaultdict
-from collections.abc import Awaitable, Iterable
+from collections.abc import Awaitable, Hashable, Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, ClassVar
 
@@ -127,6 +127,11 @@ class Client:
         """Whether the client is connected."""
         return self.tab_id is not None
 
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of the outbox metrics of this client (*added in version 3.5.0*)."""
+        return self.outbox.get_metrics()
+
     @property
     def head_html(self) -> str:
         """The HTML code to be inserted in the <head> of the page template."""
@@ -144,13 +149,16 @@ class Client:
     def __exit__(self, *_) -> None:
         self.content.__exit__()
 
+    def _element_dicts(self) -> dict[int, dict[str, Any]]:
+        """Serialize all elements of this client."""
+        return {id: element._to_dict() for id, element in self.elements.items()}  # pylint: disable=protected-access
+
     def build_response(self, request: Request, status_code: int = 200) -> Response:
         """Build a FastAPI response for the client."""
         self.outbox.updates.clear()
+        self.outbox.patches.clear()
         prefix = request.headers.get('X-Forwarded-Prefix', '') + request.scope.get('root_path', '')
-        elements = json.dumps({
-            id: element._to_dict() for id, element in self.elements.items()  # pylint: disable=protected-access
-        })
+        elements = json.dumps(self._element_dicts())
         socket_io_js_query_params = {
             **core.app.config.socket_io_js_query_params,
             'client_id': self.id,
@@ -220,7 +228,9 @@ class Client:
             self._deleted_event.clear()
             await self._deleted_event.wait()
 
-    def run_javascript(self, code: str, *, timeout: float = 1.0) -> AwaitableResponse:
+    def run_javascript(self, code: str, *,
+                       timeout: float = 1.0,
+                       coalesce_key: Hashable | None = None) -> AwaitableResponse:
         """Execute JavaScript on the client.
 
         If the function is awaited, the result of the JavaScript code is returned.
@@ -232,6 +242,7 @@ class Client:
 
         :param code: JavaScript code to run
         :param timeout: timeout in seconds (default: 1.0)
+        :param coalesce_key: if not awaited and the client is lagging, a pending call with the same key is dropped in favor of this one (*added in version 3.5.0*)
 
         :return: AwaitableResponse that can be awaited to get the result of the JavaScript code
         """
@@ -239,7 +250,7 @@ class Client:
         target_id = self._temporary_socket_id or self.id
 
         def send_and_forget():
-            self.outbox.enqueue_message('run_javascript', {'code': code}, target_id)
+            self.outbox.enqueue_message('run_javascript', {'code': code}, target_id, coalesce_key=coalesce_key)
 
         async def send_and_wait():
             self.outbox.enqueue_message('run_javascript', {'code': code, 'request_id': request_id}, target_id)
@@ -282,15 +293,18 @@ class Client:
         """
         self.delete_handlers.append(handler)
 
-    def handle_handshake(self, socket_id: str, document_id: str, next_message_id: int | None) -> None:
+    def handle_handshake(self, socket_id: str, document_id: str, next_message_id: int | None, *,
+                         compression: bool = False) -> None:
         """Cancel pending disconnect task and invoke connect handlers."""
         self._waiting_for_connection.clear()
         self._connected.set()
         self._socket_to_document_id[socket_id] = document_id
         self._cancel_delete_task(document_id)
         self._num_connections[document_id] += 1
+        self.outbox.supports_compression = compression
         if next_message_id is not None:
             self.outbox.try_rewind(next_message_id)
+        self.outbox.schedule()
         storage.request_contextvar.set(self.request)
         for t in self.connect_handlers:
             self.safe_invoke(t)
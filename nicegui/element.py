@@ -3,7 +3,7 @@ from __future__ import annotations
 import inspect
 import re
 import weakref
-from collections.abc import Iterator, Sequence
+from collections.abc import Hashable, Iterator, Sequence
 from copy import copy
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, cast
@@ -210,6 +210,7 @@ class Element(Visibility):
         }
 
     def _to_dict(self) -> dict[str, Any]:
+        Element._to_patch(self)  # NOTE: pending changes are included in the full dictionary
         return {
             'tag': self.tag,
             **({'text': self._text} if self._text is not None else {}),
@@ -233,6 +234,24 @@ class Element(Visibility):
             },
         }
 
+    def _to_patch(self) -> dict[str, Any] | None:
+        """Collect the props, classes and style that changed since the last patch.
+
+        Subclasses can return ``None`` to request a full update instead.
+        """
+        # pylint: disable=protected-access
+        patch: dict[str, Any] = {}
+        if self._classes._pop_changes():
+            patch['class'] = self._classes
+        if self._style._pop_changes():
+            patch['style'] = self._style
+        changed_props, removed_props = self._props._pop_changes()
+        if changed_props:
+            patch['props'] = changed_props
+        if removed_props:
+            patch['removed_props'] = removed_props
+        return patch
+
     @property
     def classes(self) -> Classes[Self]:
         """The classes of the element."""
@@ -402,6 +421,15 @@ class Element(Visibility):
             return
         self.client.outbox.enqueue_update(self)
 
+    def _update_partially(self) -> None:
+        """Update only the changed props, classes and style on the client side."""
+        if type(self).update is not Element.update:
+            self.update()  # NOTE: subclasses overriding update() need to run their own update logic
+            return
+        if self.is_deleted:
+            return
+        self.client.outbox.enqueue_patch(self)
+
     def run_method(self, name: str, *args: Any, timeout: float = 1) -> AwaitableResponse:
         """Run a method on the client side.
 
@@ -414,7 +442,16 @@ class Element(Visibility):
         """
         if not core.loop:
             return NullResponse()
-        return self.client.run_javascript(f'return runMethod({self.id}, "{name}", {json.dumps(args)})', timeout=timeout)
+        return self.client.run_javascript(f'return runMethod({self.id}, "{name}", {json.dumps(args)})',
+                                          timeout=timeout, coalesce_key=self._coalesce_key(name, args))
+
+    def _coalesce_key(self, name: str, args: tuple[Any, ...]) -> Hashable | None:
+        """Return a key for method calls that supersede pending calls with the same key.
+
+        While a client lags behind, only the latest of these calls is sent.
+        By default every call is delivered.
+        """
+        return None
 
     def get_computed_prop(self, prop_name: str, *, timeout: float = 1) -> AwaitableResponse:
         """Return a computed property.
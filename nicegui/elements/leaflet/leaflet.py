@@ -168,9 +168,16 @@ class Leaflet(Element, component='leaflet.js', esm={'nicegui-leaflet': 'dist'},
         super()._handle_delete()
 
     def _to_dict(self):
+        self._sync_view()
+        return super()._to_dict()
+
+    def _to_patch(self):
+        self._sync_view()
+        return super()._to_patch()
+
+    def _sync_view(self) -> None:
         if self._send_update_on_value_change and (
             self._props['center'] != self._client_center or
             self._props['zoom'] != self._client_zoom
         ):
             self.run_map_method('setView', self._props['center'], self._props['zoom'])
-        return super()._to_dict()
@@ -1,4 +1,5 @@
 import asyncio
+from collections.abc import Hashable
 from dataclasses import dataclass
 from typing import Any, Callable, Literal, Optional, Union
 
@@ -58,6 +59,10 @@ class Scene(Element, component='scene.js', esm={'nicegui-scene': 'dist'}, defaul
     from .scene_objects import Text3d as text3d
     from .scene_objects import Texture as texture
 
+    # NOTE: later calls of these methods supersede earlier ones for the same object
+    _OBJECT_STATE_METHODS = {'name', 'material', 'move', 'rotate', 'scale', 'visible', 'draggable',
+                             'set_texture_url', 'set_texture_coordinates', 'set_points'}
+
     def __init__(self,
                  width: int = 400,
                  height: int = 300,
@@ -262,6 +267,13 @@ class Scene(Element, component='scene.js', esm={'nicegui-scene': 'dist'}, defaul
         """
         return await self.run_method('get_camera')
 
+    def _coalesce_key(self, name: str, args: tuple[Any, ...]) -> Optional[Hashable]:
+        if name == 'move_camera':
+            return (self.id, name)
+        if name in self._OBJECT_STATE_METHODS:
+            return (self.id, name, args[0])
+        return None
+
     def _handle_delete(self) -> None:
         binding.remove(list(self.objects.values()))
         super()._handle_delete()
@@ -103,13 +103,23 @@ class Table(FilterElement, component='table.js'):
         self.on('update:pagination', handle_pagination_change)
 
     def _to_dict(self) -> dict[str, Any]:
-        # scan rows for lists and add slot templates if needed
+        self._add_slots_for_lists()
+        return super()._to_dict()
+
+    def _to_patch(self) -> Optional[dict[str, Any]]:
+        if self._add_slots_for_lists():
+            return None  # NOTE: new slots require a full update
+        return super()._to_patch()
+
+    def _add_slots_for_lists(self) -> bool:
+        """Scan rows for lists and add slot templates if needed."""
+        added = False
         for column in self._props['columns']:
             field = column.get('field')
             name = column.get('name')
             if not field or not name or f'body-cell-{name}' in self.slots:
                 continue
-            for row in self._props['rows']:
+            for row in list.__iter__(self._props['rows']):  # NOTE: read-only scan, so rows need not be wrapped
                 value = row.get(field)
                 if isinstance(value, (list, set, tuple)):
                     log.warning(
@@ -122,9 +132,9 @@ class Table(FilterElement, component='table.js'):
                             {{ Array.isArray(props.value) ? props.value.join(', ') : props.value }}
                         </td>
                     ''')
+                    added = True
                     break
-
-        return super()._to_dict()
+        return added
 
     def on_select(self, callback: Handler[TableSelectionEventArguments]) -> Self:
         """Add a callback to be invoked when the selection changes."""
@@ -24,9 +24,15 @@ class EventArguments:
     pass
 
 
+ObservableOperation = Literal['set', 'delete', 'append', 'extend', 'insert', 'slice', 'update', 'clear', 'replace', 'batch']
+
+
 @dataclass(**KWONLY_SLOTS)
 class ObservableChangeEventArguments(EventArguments):
     sender: ObservableCollection
+    op: ObservableOperation = 'replace'
+    path: tuple[Any, ...] = ()  # NOTE: relative to the collection the handler is registered on
+    value: Any = None
 
 
 @dataclass(**KWONLY_SLOTS)
@@ -415,7 +421,7 @@ EventT = TypeVar('EventT', bound=EventArguments)
 Handler = Union[Callable[[EventT], Any], Callable[[], Any]]
 
 
-def handle_event(handler: Handler[EventT] | None, arguments: EventT) -> None:
+def handle_event(handler: Handler[EventT] | None, arguments: EventT, *, pass_arguments: bool | None = None) -> None:
     """Call the given event handler.
 
     The handler is called within the context of the parent slot of the sender.
@@ -425,6 +431,7 @@ def handle_event(handler: Handler[EventT] | None, arguments: EventT) -> None:
 
     :param handler: the event handler
     :param arguments: the event arguments
+    :param pass_arguments: whether to pass the arguments (default: ``None``, i.e. inspect the signature of the handler)
     """
     if handler is None:
         return
@@ -436,7 +443,7 @@ def handle_event(handler: Handler[EventT] | None, arguments: EventT) -> None:
             parent_slot = nullcontext()
 
         with parent_slot:
-            if helpers.expects_arguments(handler):
+            if pass_arguments if pass_arguments is not None else helpers.expects_arguments(handler):
                 result = cast(Callable[[EventT], Any], handler)(arguments)
             else:
                 result = cast(Callable[[], Any], handler)()
@@ -9,13 +9,14 @@ to override Python's default json module.
 """
 
 try:
-    from nicegui.json.orjson_wrapper import NiceGUIJSONResponse, dumps, loads
+    from nicegui.json.orjson_wrapper import NiceGUIJSONResponse, dumps, fragment, loads
 except ImportError:
-    from nicegui.json.builtin_wrapper import NiceGUIJSONResponse, dumps, loads  # type: ignore
+    from nicegui.json.builtin_wrapper import NiceGUIJSONResponse, dumps, fragment, loads  # type: ignore
 
 
 __all__ = [
     'NiceGUIJSONResponse',
     'dumps',
+    'fragment',
     'loads',
 ]
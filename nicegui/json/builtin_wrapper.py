@@ -36,6 +36,14 @@ def loads(value: str) -> Any:
     return json.loads(value)
 
 
+def fragment(value: str) -> Any:
+    """Wrap an already JSON-encoded string so that it is embedded when serializing the surrounding object.
+
+    Python's default json module does not support pre-encoded fragments, so the string is decoded again.
+    """
+    return loads(value)
+
+
 class NiceGUIJSONResponse(Response):
     """FastAPI response class to support our custom json serializer implementation."""
     media_type = 'application/json'
@@ -0,0 +1,93 @@
+import dataclasses
+import datetime
+import enum
+import importlib.util
+import struct
+import uuid
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any
+
+from .. import optional_features
+
+try:
+    import msgpack
+    optional_features.register('msgpack')
+except ImportError:
+    pass
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+NDARRAY_EXT_TYPE = 1
+NDARRAY_DTYPES = ['i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8']  # NOTE: indices must match NDARRAY_TYPES in nicegui.js
+_STRUCT_FORMATS = ['b', 'B', 'h', 'H', 'i', 'I', 'f', 'd']
+
+
+def packb(obj: Any) -> bytes:
+    """Serialize a Python object to MessagePack bytes.
+
+    NumPy arrays with numeric dtype are packed as raw little-endian buffers which ``nicegui.js`` unpacks into lists.
+    """
+    return msgpack.packb(obj, default=_msgpack_converter)
+
+
+def unpackb(value: bytes) -> Any:
+    """Deserialize MessagePack bytes to a corresponding Python object, unpacking NumPy arrays into lists."""
+    return msgpack.unpackb(value, strict_map_key=False, ext_hook=_unpack_ext)
+
+
+def pack_batch(items: Sequence[tuple[str, bytes]]) -> bytes:
+    """Pack already serialized messages into a batch ``{"messages": [[type, payload], ...]}`` without unpacking them."""
+    parts = [b'\x81', msgpack.packb('messages'), _array_header(len(items))]
+    for message_type, payload in items:
+        parts.append(b'\x92')
+        parts.append(msgpack.packb(message_type))
+        parts.append(payload)
+    return b''.join(parts)
+
+
+def _array_header(length: int) -> bytes:
+    if length < 16:
+        return bytes([0x90 | length])
+    if length < 2**16:
+        return struct.pack('>BH', 0xdc, length)
+    return struct.pack('>BI', 0xdd, length)
+
+
+def _msgpack_converter(obj):
+    """Custom serializer/converter, e.g. for NumPy arrays and scalars."""
+    if HAS_NUMPY:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.kind in 'iu' and obj.dtype.itemsize == 8:
+                obj = obj.astype(np.float64)  # NOTE: JavaScript numbers are doubles anyway
+            dtype = obj.dtype.newbyteorder('<')
+            if dtype.kind not in 'iuf' or dtype.str[1:] not in NDARRAY_DTYPES:
+                return obj.tolist()
+            header = struct.pack(f'<BB{obj.ndim}I', NDARRAY_DTYPES.index(dtype.str[1:]), obj.ndim, *obj.shape)
+            return msgpack.ExtType(NDARRAY_EXT_TYPE, header + np.ascontiguousarray(obj, dtype=dtype).tobytes())
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    # NOTE: mirror the types orjson serializes natively
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not MessagePack serializable')
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    if code != NDARRAY_EXT_TYPE:
+        return msgpack.ExtType(code, data)
+    dtype, ndim = data[0], data[1]
+    shape = struct.unpack_from(f'<{ndim}I', data, 2)
+    values = list(memoryview(data[2 + 4 * ndim:]).cast(_STRUCT_FORMATS[dtype]))
+    for size in reversed(shape[1:]):
+        values = [values[i:i + size] for i in range(0, len(values), size)]
+    return values
@@ -48,6 +48,14 @@ def loads(value: str) -> Any:
     return orjson.loads(value)
 
 
+def fragment(value: str) -> Any:
+    """Wrap an already JSON-encoded string so that it is embedded as is when serializing the surrounding object.
+
+    Uses package `orjson` internally.
+    """
+    return orjson.Fragment(value)
+
+
 def _orjson_converter(obj):
     """Custom serializer/converter, e.g. for NumPy object arrays."""
     if HAS_NUMPY:
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from .dataclasses import KWONLY_SLOTS
+
+DURATION_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogram counting observations in fixed buckets given by their upper bounds."""
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds: tuple[float, ...] = DURATION_BOUNDS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: Histogram) -> None:
+        """Add all observations of another histogram with the same bounds."""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return count, sum and the number of observations per bucket upper bound."""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(zip((*self.bounds, float('inf')), self.counts)),
+        }
+
+
+class _Metrics:
+    """Base class for dataclasses of counters and histograms."""
+    __slots__ = ()
+
+    def merge(self, other: _Metrics) -> None:
+        """Add the counters and histograms of another instance."""
+        for f in fields(self):  # type: ignore[arg-type]
+            value = getattr(self, f.name)
+            if isinstance(value, Histogram):
+                value.merge(getattr(other, f.name))
+            else:
+                setattr(self, f.name, value + getattr(other, f.name))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return all counters and histograms as a dictionary."""
+        result = {}
+        for f in fields(self):  # type: ignore[arg-type]
+            value = getattr(self, f.name)
+            result[f.name] = value.to_dict() if isinstance(value, Histogram) else value
+        return result
+
+
+@dataclass(**KWONLY_SLOTS)
+class OutboxMetrics(_Metrics):
+    """Counters and histograms of an outbox."""
+    enqueued_updates: int = 0
+    enqueued_patches: int = 0
+    enqueued_messages: int = 0
+    emitted_messages: int = 0
+    emitted_packets: int = 0
+    emitted_bytes: int = 0
+    flushes: int = 0
+    flush_duration: Histogram = field(default_factory=Histogram)
+    ack_lag: Histogram = field(default_factory=Histogram)
+
+
+@dataclass(**KWONLY_SLOTS)
+class RedisMetrics(_Metrics):
+    """Counters and histograms of a shared Redis connection."""
+    dispatched_messages: int = 0
+    ignored_messages: int = 0
+    dispatch_latency: Histogram = field(default_factory=Histogram)
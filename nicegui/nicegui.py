@@ -11,7 +11,7 @@ import socketio
 from fastapi import HTTPException, Request
 from fastapi.responses import FileResponse, Response
 
-from . import air, background_tasks, binding, core, favicon, helpers, json, run, welcome
+from . import air, background_tasks, binding, core, favicon, helpers, json, outbox, run, welcome
 from .app import App
 from .client import Client
 from .dependencies import dynamic_resources, esm_modules, js_components, libraries, resources, vue_components
@@ -141,6 +141,7 @@ async def _startup() -> None:
     run.setup()
     app.start()
     background_tasks.create(binding.refresh_loop(), name='refresh bindings')
+    background_tasks.create(outbox.loop(), name='outbox loop')
     app.timer(10, Client.prune_instances)
     app.timer(10, Slot.prune_stacks)
     app.timer(10, prune_tab_storage)
@@ -198,7 +199,8 @@ async def _on_handshake(sid: str, data: dict[str, Any]) -> bool:
     else:
         client.environ = sio.get_environ(sid)
         await sio.enter_room(sid, client.id)
-    client.handle_handshake(sid, data['document_id'], data.get('next_message_id'))
+    client.handle_handshake(sid, data['document_id'], data.get('next_message_id'),
+                            compression=bool(data.get('compression')))
     assert client.tab_id is not None
     await core.app.storage._create_tab_storage(client.tab_id)  # pylint: disable=protected-access
     return True
@@ -263,7 +265,7 @@ async def prune_user_storage(*, force: bool = False) -> None:
     for session_id in list(user_storages):
         if session_id not in client_session_ids:
             age = now - user_storages[session_id].last_modified
-            if force or age > 10.0:  # NOTE: do not remove storages created by middleware and still wait for client
+            if force or age > 10.0:  # NOTE: do not remove storages of pages still waiting for their client
                 storages_to_close.append(user_storages.pop(session_id))
     results = await asyncio.gather(*[storage.close() for storage in storages_to_close], return_exceptions=True)
     for result in results:
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
 import abc
+import functools
+import operator
 import time
-from collections.abc import Collection, Iterable
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
 from copy import deepcopy
 from typing import Any, Callable, SupportsIndex
 
 from typing_extensions import Self
 
-from . import events
+from . import events, helpers
+
+
+_observable_types: set[type] = set()
+
+_Handlers = tuple[tuple[Callable, bool], ...]
+_Chain = tuple[tuple['ObservableCollection', ...], int, tuple[_Handlers, ...], tuple[int, ...]]
 
 
 class ObservableCollection(abc.ABC):  # noqa: B024
+    """Base class of collections notifying change handlers about mutations.
+
+    Plain dicts, lists and sets stored in a collection are wrapped lazily when they are read,
+    including ``get``, ``values``, ``items``, iteration, ``copy``, ``dict(...)``, ``{**...}``, ``|`` and ``+``.
+    Only the unbound methods of the builtin types (e.g. ``dict.get(collection, key)`` or ``list.__iter__(collection)``)
+    return the unwrapped containers, which may be read but must not be mutated.
+    """
+    _chain: _Chain | None = None
+    _unwrapped = 0  # NOTE: number of stored plain containers which have not been wrapped yet (upper bound)
+    _chain_version = 0  # NOTE: incremented whenever the parent or a change handler changes
+    _batch_changes: list[events.ObservableChangeEventArguments] | None = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _observable_types.add(cls)
 
     def __init__(self, *,
                  factory: Callable,
@@ -20,54 +44,206 @@ class ObservableCollection(abc.ABC):  # noqa: B024
                  _parent: ObservableCollection | None,
                  ) -> None:
         super().__init__(factory() if data is None else data)  # type: ignore
-        self._parent = _parent
+        self._parent_collection = _parent
+        self._parent_key: Any = None
         self.last_modified = time.time()
         self._change_handlers: list[Callable] = [on_change] if on_change else []
 
+    @property
+    def _parent(self) -> ObservableCollection | None:
+        return self._parent_collection
+
+    @_parent.setter
+    def _parent(self, parent: ObservableCollection | None) -> None:
+        self._parent_collection = parent
+        self._chain_version += 1
+
+    def _handler_chain(self) -> _Chain:
+        """Return this collection and its ancestors, the index of the last one with change handlers,
+        the handlers of each one together with whether they expect arguments and the versions the chain is based on.
+
+        The chain is cached until this collection or one of its ancestors changes its parent or its change handlers,
+        so registering a handler only invalidates the chains of that collection and its descendants.
+        """
+        chain = self._chain
+        if chain is not None:
+            for collection, version in zip(chain[0], chain[3]):
+                if collection._chain_version != version:
+                    break
+            else:
+                return chain
+        collections: list[ObservableCollection] = []
+        handlers: list[_Handlers] = []
+        last = -1
+        collection: ObservableCollection | None = self
+        while collection is not None:
+            if collection._change_handlers:
+                last = len(collections)
+            collections.append(collection)
+            handlers.append(tuple((handler, helpers.expects_arguments(handler))
+                                  for handler in collection._change_handlers))
+            collection = collection._parent_collection
+        self._chain = (tuple(collections), last, tuple(handlers), tuple(c._chain_version for c in collections))
+        return self._chain
+
     @property
     def change_handlers(self) -> list[Callable]:
         """Return a list of all change handlers registered on this collection and its parents."""
-        change_handlers = self._change_handlers[:]
-        if self._parent is not None:
-            change_handlers.extend(self._parent.change_handlers)
-        return change_handlers
-
-    def _handle_change(self) -> None:
+        collections, _, _, _ = self._handler_chain()
+        return [handler for collection in collections for handler in collection._change_handlers]
+
+    def _handle_change(self,
+                       op: events.ObservableOperation = 'replace',
+                       path: tuple[Any, ...] = (),
+                       value: Any = None, *,
+                       sender: ObservableCollection | None = None) -> None:
+        """Notify the change handlers of this collection and its parents.
+
+        If this collection or one of its parents is in a ``batch()`` context,
+        the change is recorded there instead of notifying any handler.
+
+        :param op: the kind of mutation
+        :param path: keys or indices leading from this collection to the changed item
+        :param value: the new value (items for "extend" and "slice", a dictionary for "update")
+        :param sender: the collection that has been mutated (default: this collection)
+        """
         self.last_modified = time.time()
-        for handler in self.change_handlers:
-            events.handle_event(handler, events.ObservableChangeEventArguments(sender=self))
+        collections, last, handlers, _ = self._handler_chain()
+        batching = next((c for c in collections if c._batch_changes is not None), None)
+        if batching is not None:
+            last = collections.index(batching)
+        for i in range(last + 1):
+            collection = collections[i]
+            if i:
+                path = (collection._key_of(collections[i - 1]), *path)
+            if collection is batching:
+                collection._batch_changes.append(  # type: ignore[union-attr]
+                    events.ObservableChangeEventArguments(sender=sender or self, op=op, path=path, value=value))
+                return
+            if batching is None:
+                for handler, pass_arguments in handlers[i]:
+                    arguments = events.ObservableChangeEventArguments(sender=sender or self,
+                                                                      op=op, path=path, value=value)
+                    events.handle_event(handler, arguments, pass_arguments=pass_arguments)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collect all changes of this collection and its nested collections and notify the change handlers once.
+
+        While the context is active,
+        no change handler of this collection, its parents or its nested collections is called.
+        At exit a single change event with the operation "batch" is fired if anything has changed.
+        Its value is the list of recorded change events with paths relative to this collection.
+
+        *Added in version 3.5.0*
+        """
+        if self._batch_changes is not None:
+            yield
+            return
+        self._batch_changes = []
+        try:
+            yield
+        finally:
+            changes, self._batch_changes = self._batch_changes, None
+            if changes:
+                self._handle_change('batch', (), changes)
+
+    def _handle_nested_change(self, child: ObservableCollection, e: events.ObservableChangeEventArguments) -> None:
+        """Forward a change of an observable collection that has been added to this one without being wrapped."""
+        self._handle_change(e.op, (self._key_of(child), *e.path), e.value, sender=e.sender)
+
+    def _key_of(self, child: ObservableCollection) -> Any:
+        """Find the key or index of a child collection, using the last known position as a hint."""
+        try:
+            if self._raw_item(child._parent_key) is child:
+                return child._parent_key
+        except (KeyError, IndexError, TypeError):
+            pass
+        items = dict.items(self) if isinstance(self, dict) else \
+            enumerate(list.__iter__(self)) if isinstance(self, list) else ()  # type: ignore
+        for key, value in items:
+            if value is child:
+                child._parent_key = key
+                return key
+        return None
 
     def on_change(self, handler: Callable) -> None:
-        """Register a handler to be called when the collection changes."""
+        """Register a handler to be called when the collection changes.
+
+        The handler receives an ``ObservableChangeEventArguments`` object
+        with the kind of mutation (``op``), the ``path`` to the changed item relative to this collection
+        and the new ``value``.
+        """
         if handler != self._handle_change:  # pylint: disable=comparison-with-callable
             self._change_handlers.append(handler)
-
-    def _observe(self, data: Any) -> Any:
-        if isinstance(data, ObservableCollection):
-            data.on_change(self._handle_change)
+            self._chain_version += 1
+
+    def remove_change_handler(self, handler: Callable) -> None:
+        """Remove a handler that has been registered with ``on_change``.
+
+        *Added in version 3.5.0*
+        """
+        if handler in self._change_handlers:
+            self._change_handlers.remove(handler)
+            self._chain_version += 1
+
+    def _raw_item(self, key: Any) -> Any:
+        """Return an item without wrapping it."""
+        raise TypeError(f'{type(self).__name__} has no addressable items')
+
+    def _observe(self, data: Any, key: Any = None) -> Any:
+        """Adopt a value that is added to this collection.
+
+        Plain containers are copied, so that the caller cannot mutate them unnoticed,
+        and only wrapped on first access (see ``_wrap``).
+        Existing observable collections forward their changes to this collection.
+        """
+        if _is_observable(data):
+            if data is not self and data._parent is not self:
+                data.on_change(functools.partial(self._handle_nested_change, data))
+            data._parent_key = key
             return data
-        if isinstance(data, dict):
-            return ObservableDict(data, _parent=self)
-        if isinstance(data, list):
-            return ObservableList(data, _parent=self)
-        if isinstance(data, set):
-            return ObservableSet(data, _parent=self)
-        return data
+        value = _copy_containers(data)
+        if value is not data:
+            self._unwrapped += 1
+        return value
+
+    def _wrap(self, key: Any, value: Any) -> Any:
+        """Wrap a plain container read from this collection and store the wrapper in its place."""
+        if not isinstance(value, (dict, list, set)) or _is_observable(value):
+            return value
+        if isinstance(value, dict):
+            wrapper: ObservableCollection = ObservableDict(value, _parent=self)
+        elif isinstance(value, list):
+            wrapper = ObservableList(value, _parent=self)
+        else:
+            wrapper = ObservableSet(value, _parent=self)
+        wrapper._parent_key = key
+        self._store(key, wrapper)
+        self._unwrapped -= 1
+        return wrapper
+
+    def _store(self, key: Any, value: Any) -> None:
+        """Replace an item without notifying the change handlers."""
+
+    def _wrap_all(self) -> None:
+        """Wrap all plain containers of this collection, so that copies share the wrappers."""
 
     def __copy__(self) -> Self:
+        self._wrap_all()
         if isinstance(self, dict):
-            return ObservableDict(self, _parent=self._parent)
+            return ObservableDict(dict(self.items()), _parent=self._parent)  # NOTE: the copy shares the wrapped items
         if isinstance(self, list):
-            return ObservableList(self, _parent=self._parent)
+            return ObservableList(list(self), _parent=self._parent)
         if isinstance(self, set):
             return ObservableSet(self, _parent=self._parent)
         raise NotImplementedError(f'ObservableCollection.__copy__ not implemented for {type(self)}')
 
     def __deepcopy__(self, memo: dict) -> Self:
         if isinstance(self, dict):
-            return ObservableDict({key: deepcopy(self[key]) for key in self}, _parent=self._parent)
+            return ObservableDict({key: deepcopy(value) for key, value in dict.items(self)}, _parent=self._parent)
         if isinstance(self, list):
-            return ObservableList([deepcopy(item) for item in self], _parent=self._parent)
+            return ObservableList([deepcopy(item) for item in list.__iter__(self)], _parent=self._parent)
         if isinstance(self, set):
             return ObservableSet({deepcopy(item) for item in self}, _parent=self._parent)
         raise NotImplementedError(f'ObservableCollection.__deepcopy__ not implemented for {type(self)}')
@@ -82,47 +258,102 @@ class ObservableDict(ObservableCollection, dict):
                  _parent: ObservableCollection | None = None,
                  ) -> None:
         super().__init__(factory=dict, data=data, on_change=on_change, _parent=_parent)
-        for key, value in self.items():
-            super().__setitem__(key, self._observe(value))
+        for key, value in super().items():
+            if _is_observable(value):
+                self._observe(value, key)
+            elif isinstance(value, (dict, list, set)):
+                self._unwrapped += 1
+                if _parent is None:  # NOTE: nested containers of data owned by a parent are not copied
+                    super().__setitem__(key, _copy_containers(value))
+
+    def _raw_item(self, key: Any) -> Any:
+        return super().__getitem__(key)
+
+    def _store(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+
+    def _wrap_all(self) -> None:
+        for key, value in super().items():
+            self._wrap(key, value)
+        self._unwrapped = 0
+
+    def copy(self) -> dict:
+        if self._unwrapped:
+            self._wrap_all()
+        return super().copy()
+
+    def __getitem__(self, key: Any) -> Any:
+        value = dict.__getitem__(self, key)
+        if not self._unwrapped or type(value) in _observable_types or not isinstance(value, (dict, list, set)):
+            return value
+        return self._wrap(key, value)
+
+    def __iter__(self) -> Iterator[Any]:
+        # NOTE: overriding __iter__ makes dict(...) and {**...} read the items via keys() and __getitem__
+        return dict.__iter__(self)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if not self._unwrapped:
+            return dict.get(self, key, default)
+        return self[key] if key in self else default
+
+    def values(self) -> Any:
+        if self._unwrapped:
+            self._wrap_all()
+        return super().values()
+
+    def items(self) -> Any:
+        if self._unwrapped:
+            self._wrap_all()
+        return super().items()
 
     def pop(self, k: Any, d: Any = None) -> Any:
-        item = super().pop(k, d)
-        self._handle_change()
+        if k not in self:
+            return d
+        item = super().pop(k)
+        self._handle_change('delete', (k,))
         return item
 
     def popitem(self) -> Any:
         item = super().popitem()
-        self._handle_change()
+        self._handle_change('delete', (item[0],))
         return item
 
     def update(self, *args: Any, **kwargs: Any) -> None:
-        super().update(self._observe(dict(*args, **kwargs)))
-        self._handle_change()
+        data = {key: self._observe(value, key) for key, value in dict(*args, **kwargs).items()}
+        super().update(data)
+        self._handle_change('update', (), data)
 
     def clear(self) -> None:
         super().clear()
-        self._handle_change()
+        self._unwrapped = 0
+        self._handle_change('clear')
 
     def setdefault(self, __key: Any, __default: Any = None) -> Any:
-        item = super().setdefault(__key, self._observe(__default))
-        self._handle_change()
-        return item
+        if __key in self:
+            return self[__key]
+        item = super().setdefault(__key, self._observe(__default, __key))
+        self._handle_change('set', (__key,), item)
+        return self[__key]
 
     def __setitem__(self, __key: Any, __value: Any) -> None:
-        super().__setitem__(__key, self._observe(__value))
-        self._handle_change()
+        value = self._observe(__value, __key)
+        super().__setitem__(__key, value)
+        self._handle_change('set', (__key,), value)
 
     def __delitem__(self, __key: Any) -> None:
         super().__delitem__(__key)
-        self._handle_change()
+        self._handle_change('delete', (__key,))
 
     def __or__(self, other: Any) -> Any:
+        if self._unwrapped:
+            self._wrap_all()
         return super().__or__(other)
 
     def __ior__(self, other: Any) -> Any:
-        other_dict = self._observe(dict(other))
+        other_dict = {key: self._observe(value, key) for key, value in dict(other).items()}
         super().__ior__(other_dict)
-        self._handle_change()
+        self._handle_change('update', (), other_dict)
         return self
 
 
@@ -135,56 +366,126 @@ class ObservableList(ObservableCollection, list):
                  _parent: ObservableCollection | None = None,
                  ) -> None:
         super().__init__(factory=list, data=data, on_change=on_change, _parent=_parent)
-        for i, item in enumerate(self):
-            super().__setitem__(i, self._observe(item))
+        for i, item in enumerate(super().__iter__()):
+            if _is_observable(item):
+                self._observe(item, i)
+            elif isinstance(item, (dict, list, set)):
+                self._unwrapped += 1
+                if _parent is None:  # NOTE: nested containers of data owned by a parent are not copied
+                    super().__setitem__(i, _copy_containers(item))
+
+    def _raw_item(self, key: Any) -> Any:
+        return super().__getitem__(key)
+
+    def _store(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+
+    def _wrap_all(self) -> None:
+        for i, item in enumerate(super().__iter__()):
+            self._wrap(i, item)
+        self._unwrapped = 0
+
+    def copy(self) -> list:
+        if self._unwrapped:
+            self._wrap_all()
+        return super().copy()
+
+    def __getitem__(self, key: SupportsIndex | slice) -> Any:  # type: ignore[override]
+        if not self._unwrapped:
+            return list.__getitem__(self, key)
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        value = list.__getitem__(self, key)
+        if type(value) in _observable_types or not isinstance(value, (dict, list, set)):
+            return value
+        return self._wrap(self._index(key), value)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._unwrapped:
+            self._wrap_all()
+        return list.__iter__(self)
+
+    def __reversed__(self) -> Iterator[Any]:
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def _index(self, index: SupportsIndex, *, clamp: bool = False) -> int:
+        i = operator.index(index)
+        if i < 0:
+            i += len(self)
+        return min(max(i, 0), len(self)) if clamp else i
 
     def append(self, item: Any) -> None:
-        super().append(self._observe(item))
-        self._handle_change()
+        value = self._observe(item, len(self))
+        super().append(value)
+        self._handle_change('append', (len(self) - 1,), value)
 
     def extend(self, iterable: Iterable) -> None:
-        super().extend(self._observe(list(iterable)))
-        self._handle_change()
+        start = len(self)
+        items = [self._observe(item, start + i) for i, item in enumerate(iterable)]
+        super().extend(items)
+        self._handle_change('extend', (start,), items)
 
     def insert(self, index: SupportsIndex, obj: Any) -> None:
-        super().insert(index, self._observe(obj))
-        self._handle_change()
+        i = self._index(index, clamp=True)
+        value = self._observe(obj, i)
+        super().insert(i, value)
+        self._handle_change('insert', (i,), value)
 
     def remove(self, value: Any) -> None:
-        super().remove(value)
-        self._handle_change()
+        i = self.index(value)
+        super().__delitem__(i)
+        self._handle_change('delete', (i,))
 
     def pop(self, index: SupportsIndex = -1) -> Any:
+        i = self._index(index)
         item = super().pop(index)
-        self._handle_change()
+        self._handle_change('delete', (i,))
         return item
 
     def clear(self) -> None:
         super().clear()
-        self._handle_change()
+        self._unwrapped = 0
+        self._handle_change('clear')
 
     def sort(self, **kwargs: Any) -> None:
         super().sort(**kwargs)
-        self._handle_change()
+        self._handle_change('replace')
 
     def reverse(self) -> None:
         super().reverse()
-        self._handle_change()
+        self._handle_change('replace')
 
     def __delitem__(self, key: SupportsIndex | slice) -> None:
-        super().__delitem__(key)
-        self._handle_change()
+        if isinstance(key, slice):
+            super().__delitem__(key)
+            self._handle_change('slice', (key,), [])
+        else:
+            i = self._index(key)
+            super().__delitem__(key)
+            self._handle_change('delete', (i,))
 
     def __setitem__(self, key: SupportsIndex | slice, value: Any) -> None:
-        super().__setitem__(key, self._observe(value))
-        self._handle_change()
+        if isinstance(key, slice):
+            items = [self._observe(item) for item in value]
+            super().__setitem__(key, items)
+            self._handle_change('slice', (key,), items)
+        else:
+            i = self._index(key)
+            value = self._observe(value, i)
+            super().__setitem__(key, value)
+            self._handle_change('set', (i,), value)
 
     def __add__(self, other: Any) -> Any:
+        if self._unwrapped:
+            self._wrap_all()
         return super().__add__(other)
 
     def __iadd__(self, other: Any) -> Any:
-        super().__iadd__(self._observe(other))
-        self._handle_change()
+        start = len(self)
+        items = [self._observe(item, start + i) for i, item in enumerate(other)]
+        super().__iadd__(items)
+        self._handle_change('extend', (start,), items)
         return self
 
 
@@ -197,8 +498,6 @@ class ObservableSet(ObservableCollection, set):
                  _parent: ObservableCollection | None = None,
                  ) -> None:
         super().__init__(factory=set, data=data, on_change=on_change, _parent=_parent)
-        for item in self:
-            super().add(self._observe(item))
 
     def add(self, item: Any) -> None:
         super().add(self._observe(item))
@@ -268,3 +567,96 @@ class ObservableSet(ObservableCollection, set):
         super().__ixor__(self._observe(other))
         self._handle_change()
         return self
+
+
+def _is_observable(value: Any) -> bool:
+    return type(value) in _observable_types  # NOTE: much faster than isinstance checks against the ABCMeta classes
+
+
+def _copy_containers(value: Any) -> Any:
+    """Copy plain dicts, lists and sets recursively while keeping all other objects including observable collections."""
+    if type(value) in _observable_types or not isinstance(value, (dict, list, set)):
+        return value
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    return set(value)
+
+
+class PatchAccumulator:
+    """Collect the changes of an observable collection as JSON Patch operations (RFC 6902).
+
+    Register it on a collection and call ``pop()`` to retrieve and reset the operations recorded since the last call.
+    Mutations that cannot be expressed per item (sorting, slice assignments, set operations)
+    replace the affected container as a whole.
+    The same applies to ``batch()`` contexts containing such mutations or adding nested containers.
+
+    *Added in version 3.5.0*
+    """
+
+    def __init__(self, collection: ObservableCollection) -> None:
+        self.operations: list[dict[str, Any]] = []
+        collection.on_change(self._record)
+
+    def pop(self) -> list[dict[str, Any]]:
+        """Return the operations recorded since the last call and reset the accumulator."""
+        operations, self.operations = self.operations, []
+        return operations
+
+    def _record(self, e: events.ObservableChangeEventArguments) -> None:
+        *parent_path, key = e.path or (None,)
+        pointer = _json_pointer(parent_path)
+        if e.op == 'set':
+            op = 'replace' if isinstance(e.sender, list) else 'add'
+            self.operations.append({'op': op, 'path': f'{pointer}/{_escape(key)}', 'value': _to_plain(e.value)})
+        elif e.op in ('append', 'insert'):
+            self.operations.append({'op': 'add', 'path': f'{pointer}/{key}', 'value': _to_plain(e.value)})
+        elif e.op == 'extend':
+            for i, item in enumerate(e.value):
+                self.operations.append({'op': 'add', 'path': f'{pointer}/{key + i}', 'value': _to_plain(item)})
+        elif e.op == 'delete':
+            self.operations.append({'op': 'remove', 'path': f'{pointer}/{_escape(key)}'})
+        elif e.op == 'update':
+            pointer = _json_pointer(e.path)
+            for k, value in e.value.items():
+                self.operations.append({'op': 'add', 'path': f'{pointer}/{_escape(k)}', 'value': _to_plain(value)})
+        elif e.op == 'batch' and all(_is_replayable(change) for change in e.value):
+            for change in e.value:
+                self._record(events.ObservableChangeEventArguments(
+                    sender=change.sender, op=change.op, path=(*e.path, *change.path), value=change.value))
+        else:
+            path = e.path[:-1] if e.op == 'slice' else e.path
+            self.operations.append({'op': 'replace', 'path': _json_pointer(path), 'value': _to_plain(e.sender)})
+
+
+def _is_replayable(change: events.ObservableChangeEventArguments) -> bool:
+    """Whether a change recorded during a batch can be replayed per item after the batch.
+
+    Containers might have been mutated after they have been added and whole-container operations have no recorded state,
+    so they can only be expressed by replacing the batched collection with its final state.
+    """
+    if change.op == 'batch':
+        return all(_is_replayable(nested_change) for nested_change in change.value)
+    if change.op in ('clear', 'replace', 'slice'):
+        return False
+    values = change.value if change.op == 'extend' else \
+        change.value.values() if change.op == 'update' else (change.value,)
+    return not any(isinstance(value, (dict, list, set)) for value in values)
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _json_pointer(path: Iterable[Any]) -> str:
+    return ''.join(f'/{_escape(key)}' for key in path)
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert observable collections into plain JSON-compatible containers."""
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, set)):
+        return [_to_plain(item) for item in value]
+    return value
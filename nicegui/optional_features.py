@@ -5,6 +5,7 @@ _optional_features: set[str] = set()
 FEATURE = Literal[
     'highcharts',
     'matplotlib',
+    'msgpack',
     'pandas',
     'pillow',
     'plotly',
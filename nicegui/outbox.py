@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import time
 import weakref
-from collections import deque
-from typing import TYPE_CHECKING, Any
+import zlib
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar, Union
 
-from . import background_tasks, core
+from . import background_tasks, core, json
+from .dataclasses import KWONLY_SLOTS
+from .json import msgpack_wrapper
+from .metrics import OutboxMetrics
 
 if TYPE_CHECKING:
     from .client import Client
@@ -21,7 +28,9 @@ Message = tuple[ClientId, MessageType, Payload]
 
 MessageId = int
 MessageTime = float
-HistoryEntry = tuple[MessageId, MessageTime, Message]
+Packet = Union[str, bytes]  # JSON packet including the message ID or MessagePack payload without it
+Target = tuple[ClientId, bool]  # client or socket ID and whether the browser supports compression
+HistoryEntry = tuple[MessageId, MessageTime, ClientId, MessageType, Packet]
 
 
 class Deleted:
@@ -30,23 +39,145 @@ class Deleted:
 
 deleted = Deleted()
 
+_message_ids = itertools.count()
+_ready_outboxes: dict[Outbox, None] = {}
+_ready_event: asyncio.Event | None = None
+_history: OrderedDict[tuple[Outbox, MessageId], None] = OrderedDict()  # NOTE: live history entries of all outboxes
+_history_size = 0
+
+
+@dataclass(**KWONLY_SLOTS)
+class CompressionStats:
+    """Statistics about compressed packets."""
+    packets: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """The ratio of compressed to original bytes."""
+        return self.compressed_bytes / self.original_bytes if self.original_bytes else 1.0
+
+
+compression_stats = CompressionStats()
+
+
+class EmitCycle:
+    """Collects the packets emitted by all outboxes within one event loop iteration.
+
+    Packets with identical type and encoded payload are sent only once to all target clients.
+    Message IDs are therefore assigned globally and are only guaranteed to increase per client, not to be contiguous.
+    """
+    current: ClassVar[EmitCycle | None] = None
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[Target, MessageType, str | bytes, asyncio.Future[tuple[MessageId, Packet]]]] = []
+
+    @classmethod
+    async def emit(cls, target: Target, message_type: MessageType, encoded: str | bytes) -> tuple[MessageId, Packet]:
+        """Emit the encoded payload together with the packets of other outboxes.
+
+        Returns the message ID and the packet, which is shared by all clients receiving the same payload.
+        """
+        if cls.current is None:
+            cls.current = EmitCycle()
+            background_tasks.create(cls.current._run(), name='emit cycle')  # pylint: disable=protected-access
+        future: asyncio.Future[tuple[MessageId, Packet]] = asyncio.get_running_loop().create_future()
+        cls.current.entries.append((target, message_type, encoded, future))
+        return await future
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.sleep(0)  # NOTE: give other outboxes the chance to join this cycle
+            EmitCycle.current = None
+            groups: defaultdict[tuple[MessageType, str | bytes], list[tuple[Target, asyncio.Future[tuple[MessageId, Packet]]]]] = \
+                defaultdict(list)
+            for target, message_type, encoded, future in self.entries:
+                groups[(message_type, encoded)].append((target, future))
+            for (message_type, encoded), targets in groups.items():
+                message_id = next(_message_ids)
+                packet = encoded if isinstance(encoded, bytes) else \
+                    f'{{"_id":{message_id}' + ('}' if encoded == '{}' else ',' + encoded[1:])
+                try:
+                    await _send_packet(message_type, message_id, packet, [target for target, _ in targets])
+                except Exception as e:
+                    for _, future in targets:
+                        future.set_exception(e)
+                else:
+                    for _, future in targets:
+                        future.set_result((message_id, packet))
+        finally:
+            if EmitCycle.current is self:
+                EmitCycle.current = None
+            for _, _, _, future in self.entries:
+                if not future.done():
+                    future.cancel()
+
+
+async def _send_packet(message_type: MessageType, message_id: MessageId, packet: Packet, targets: list[Target]) -> None:
+    """Send the packet to the given targets and compress it for those supporting compression if it is large enough."""
+    if isinstance(packet, bytes):
+        target_ids = [target_id for target_id, _ in targets]
+        await core.sio.emit(message_type, {'_id': message_id, '_msgpack': packet}, room=target_ids)
+        for target_id in target_ids:
+            if core.air is not None and core.air.is_air_target(target_id):
+                await core.air.emit(message_type, {**msgpack_wrapper.unpackb(packet), '_id': message_id}, room=target_id)
+        return
+    plain_ids = [target_id for target_id, compression in targets if not compression]
+    compressed_ids = [target_id for target_id, compression in targets if compression]
+    threshold = core.app.config.message_compression_threshold
+    if compressed_ids and threshold is not None and len(packet) >= threshold:
+        compressed = _compress(packet)
+        if compressed is not None:
+            await core.sio.emit(message_type, {'_id': message_id, '_deflate': compressed}, room=compressed_ids)
+        else:
+            plain_ids += compressed_ids
+    else:
+        plain_ids += compressed_ids
+    if plain_ids:
+        await core.sio.emit(message_type, json.fragment(packet), room=plain_ids)
+    for target_id, _ in targets:
+        if core.air is not None and core.air.is_air_target(target_id):
+            await core.air.emit(message_type, json.loads(packet), room=target_id)
+
+
+def _compress(packet: str) -> bytes | None:
+    """Compress the packet with zlib or return ``None`` if compression does not reduce its size."""
+    start = time.perf_counter()
+    data = packet.encode()
+    compressed = zlib.compress(data, 1)  # NOTE: the fastest level keeps the event loop responsive
+    compression_stats.packets += 1
+    compression_stats.original_bytes += len(data)
+    compression_stats.compressed_bytes += len(compressed)
+    compression_stats.seconds += time.perf_counter() - start
+    return compressed if len(compressed) < len(data) else None
+
 
 class Outbox:
 
     def __init__(self, client: Client) -> None:
         self._client = weakref.ref(client)
         self.updates: weakref.WeakValueDictionary[ElementId, Element | Deleted] = weakref.WeakValueDictionary()
+        self.patches: weakref.WeakValueDictionary[ElementId, Element] = weakref.WeakValueDictionary()
         self.messages: deque[Message] = deque()
         self.message_history: deque[HistoryEntry] = deque()
+        self.message_history_size = 0
+        self._replays: list[HistoryEntry] = []
+        self._needs_resync = False
+        self.supports_compression = False
         self.next_message_id: int = 0
+        self._pruned_message_id: MessageId = -1
+        self._batch: list[tuple[Message, str | bytes]] = []
+        self._batch_size = 0
+        self._latest_messages: dict[Hashable, Message] = {}
+        self._superseded_messages: set[int] = set()
+        self._in_flight: deque[tuple[MessageId, int, float]] = deque()
+        self.in_flight_bytes = 0
+        self._is_held_back = False
+        self.metrics = OutboxMetrics()
 
         self._should_stop = False
-        self._enqueue_event: asyncio.Event | None = None
-
-        if core.app.is_started:
-            background_tasks.create(self.loop(), name=f'outbox loop {client.id}')
-        else:
-            core.app.on_startup(self.loop)
 
     @property
     def client(self) -> Client:
@@ -56,116 +187,338 @@ class Outbox:
             raise RuntimeError('The client this outbox belongs to has been deleted.')
         return client
 
-    def _set_enqueue_event(self) -> None:
-        """Set the enqueue event while accounting for lazy initialization."""
-        if self._enqueue_event:
-            self._enqueue_event.set()
+    def schedule(self) -> None:
+        """Schedule this outbox to be flushed by the global outbox loop."""
+        if self._should_stop:
+            return
+        _ready_outboxes[self] = None
+        if _ready_event is not None:
+            _ready_event.set()
 
     def enqueue_update(self, element: Element) -> None:
         """Enqueue an update for the given element."""
         self.client.check_existence()
         self.updates[element.id] = element
-        self._set_enqueue_event()
+        self.metrics.enqueued_updates += 1
+        self.schedule()
+
+    def enqueue_patch(self, element: Element) -> None:
+        """Enqueue a partial update of changed props, classes and style for the given element."""
+        self.client.check_existence()
+        self.patches[element.id] = element
+        self.metrics.enqueued_patches += 1
+        self.schedule()
 
     def enqueue_delete(self, element: Element) -> None:
         """Enqueue a deletion for the given element."""
         self.client.check_existence()
         self.updates[element.id] = deleted
-        self._set_enqueue_event()
+        self.metrics.enqueued_updates += 1
+        self.schedule()
+
+    def enqueue_message(self, message_type: MessageType, data: Payload, target_id: ClientId, *,
+                        coalesce_key: Hashable | None = None) -> None:
+        """Enqueue a message for the given client.
 
-    def enqueue_message(self, message_type: MessageType, data: Payload, target_id: ClientId) -> None:
-        """Enqueue a message for the given client."""
+        If a coalesce key is given and the client is lagging,
+        a pending message with the same key is superseded and will not be sent.
+        """
         self.client.check_existence()
-        self.messages.append((target_id, message_type, data))
-        self._set_enqueue_event()
+        message = (target_id, message_type, data)
+        if coalesce_key is not None and self.is_lagging:
+            superseded_message = self._latest_messages.get(coalesce_key)
+            if superseded_message is not None:
+                self._superseded_messages.add(id(superseded_message))
+            self._latest_messages[coalesce_key] = message
+        self.messages.append(message)
+        self.metrics.enqueued_messages += 1
+        self.schedule()
+
+    def _collect(self) -> list[Message]:
+        """Collect all pending patches, updates and messages and clear the queues."""
+        messages: list[Message] = []
+        client = self.client
+        if self._needs_resync:
+            self._needs_resync = False
+            self.updates.clear()
+            self.patches.clear()
+            messages.append((client.id, 'resync', client._element_dicts()))  # pylint: disable=protected-access
+
+        if self.patches:
+            data = {}
+            for element_id, element in self.patches.items():
+                if element_id in self.updates:
+                    continue
+                patch = element._to_patch()  # pylint: disable=protected-access
+                if patch is None:
+                    self.updates[element_id] = element
+                elif patch:
+                    data[element_id] = patch
+            if data:
+                messages.append((client.id, 'patch', data))
+            self.patches.clear()
+
+        if self.updates:
+            data = {
+                element_id: None if element is deleted else element._to_dict()  # type: ignore  # pylint: disable=protected-access
+                for element_id, element in self.updates.items()
+            }
+            messages.append((client.id, 'update', data))
+            self.updates.clear()
+
+        if self._superseded_messages:
+            messages.extend(message for message in self.messages if id(message) not in self._superseded_messages)
+        else:
+            messages.extend(self.messages)
+        self.messages.clear()
+        self._latest_messages.clear()
+        self._superseded_messages.clear()
+        return messages
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Return a snapshot of the counters, histograms and current queue and history sizes of this outbox."""
+        return {
+            **self.metrics.to_dict(),
+            'queue_depth': self.queue_depth,
+            'in_flight_bytes': self.in_flight_bytes,
+            'history_packets': len(self.message_history),
+            'history_bytes': self.message_history_size,
+        }
 
-    async def loop(self) -> None:
-        """Send updates and messages to all clients in an endless loop."""
-        self._enqueue_event = asyncio.Event()
-        self._enqueue_event.set()
+    @property
+    def queue_depth(self) -> int:
+        """The number of pending element updates, patches and messages."""
+        return len(self.updates) + len(self.patches) + len(self.messages)
 
-        while not self._should_stop:
+    @property
+    def is_lagging(self) -> bool:
+        """Whether the client has not yet acknowledged more bytes than allowed by ``message_buffer_size``."""
+        buffer_size = core.app.config.message_buffer_size
+        return buffer_size is not None and buffer_size < self.in_flight_bytes
+
+    async def _flush(self, messages: list[Message]) -> None:
+        start = time.perf_counter()
+        replays, self._replays = self._replays, []
+        for message_id, _, target_id, message_type, packet in replays:
             try:
-                if not self._enqueue_event.is_set():
-                    try:
-                        await asyncio.wait_for(self._enqueue_event.wait(), timeout=1.0)
-                    except (TimeoutError, asyncio.TimeoutError):
-                        continue
-
-                client = self.client
-                if not client or not client.has_socket_connection:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                self._enqueue_event.clear()
-
-                coros = []
-                if self.updates:
-                    data = {
-                        element_id: None if element is deleted else element._to_dict()  # type: ignore  # pylint: disable=protected-access
-                        for element_id, element in self.updates.items()
-                    }
-                    coros.append(self._emit((client.id, 'update', data)))
-                    self.updates.clear()
-
-                if self.messages:
-                    for message in self.messages:
-                        coros.append(self._emit(message))
-                    self.messages.clear()
-
-                for coro in coros:
-                    try:
-                        await coro
-                    except Exception as e:
-                        core.app.handle_exception(e)
-            except asyncio.CancelledError:
-                break
+                await _send_packet(message_type, message_id, packet, [(target_id, self.supports_compression)])
+            except Exception as e:
+                core.app.handle_exception(e)
+            self._track_packet(message_id, packet)
+        for message in messages:
+            try:
+                await self._emit(message)
             except Exception as e:
                 core.app.handle_exception(e)
-                await asyncio.sleep(0.1)
+        try:
+            await self._send_batch()
+        except Exception as e:
+            core.app.handle_exception(e)
+        self.metrics.flushes += 1
+        self.metrics.flush_duration.observe(time.perf_counter() - start)
+
+    def _track_packet(self, message_id: MessageId, packet: Packet) -> None:
+        """Count the sent packet and keep track of it until the client acknowledges it."""
+        self._in_flight.append((message_id, len(packet), time.time()))
+        self.in_flight_bytes += len(packet)
+        config = core.app.config
+        while config.message_buffer_size is None and len(self._in_flight) > config.message_history_length:
+            # NOTE: without backpressure only recent packets are tracked for clients which never acknowledge
+            _, size, _ = self._in_flight.popleft()
+            self.in_flight_bytes -= size
+        self.metrics.emitted_packets += 1
+        self.metrics.emitted_bytes += len(packet)
 
     async def _emit(self, message: Message) -> None:
-        client_id, message_type, data = message
-        data['_id'] = self.next_message_id
-
-        await core.sio.emit(message_type, data, room=client_id)
-        if core.air is not None and core.air.is_air_target(client_id):
-            await core.air.emit(message_type, data, room=client_id)
-
-        client = self.client
-        if client:
-            self.message_history.append((self.next_message_id, time.time(), message))
-            max_age = core.sio.eio.ping_interval + core.sio.eio.ping_timeout + client.page.resolve_reconnect_timeout()
-            while self.message_history and self.message_history[0][1] < time.time() - max_age:
-                self.message_history.popleft()
-            while len(self.message_history) > core.app.config.message_history_length:
-                self.message_history.popleft()
-
-        self.next_message_id += 1
+        """Encode the message and add it to the current batch, which is sent when full or at the end of the flush."""
+        target_id, _, data = message
+        encoded = msgpack_wrapper.packb(data) if core.app.config.socket_encoding == 'msgpack' else json.dumps(data)
+        if self._batch and (
+            self._batch[0][0][0] != target_id or
+            self._batch_size + len(encoded) > core.app.config.message_batch_size
+        ):
+            await self._send_batch()
+        self._batch.append((message, encoded))
+        self.metrics.emitted_messages += 1
+        self._batch_size += len(encoded)
+
+    async def _send_batch(self) -> None:
+        """Send all batched messages as a single packet."""
+        if not self._batch:
+            return
+        batch, self._batch, self._batch_size = self._batch, [], 0
+        target_id = batch[0][0][0]
+        if len(batch) == 1:
+            (_, message_type, _), encoded = batch[0]
+        elif core.app.config.socket_encoding == 'msgpack':
+            message_type = 'batch'
+            encoded = msgpack_wrapper.pack_batch([(type_, payload) for (_, type_, _), payload in batch])  # type: ignore
+        else:
+            message_type = 'batch'
+            encoded = '{"messages":[' + ','.join(f'[{json.dumps(type_)},{payload}]'
+                                                 for (_, type_, _), payload in batch) + ']}'
+        message_id, packet = await EmitCycle.emit((target_id, self.supports_compression), message_type, encoded)
+        self._track_packet(message_id, packet)
+        self._append_to_history((message_id, time.time(), target_id, message_type, packet))
+        self.next_message_id = message_id + 1
+
+    def _append_to_history(self, entry: HistoryEntry) -> None:
+        """Append the packet to the history and evict the oldest packets exceeding age, length or byte budgets."""
+        global _history_size  # pylint: disable=global-statement # noqa: PLW0603
+        client = self._client()
+        if client is None:
+            return
+        config = core.app.config
+        self.message_history.append(entry)
+        self.message_history_size += len(entry[4])
+        _history[(self, entry[0])] = None
+        _history_size += len(entry[4])
+
+        max_age = core.sio.eio.ping_interval + core.sio.eio.ping_timeout + client.page.resolve_reconnect_timeout()
+        while self.message_history and self.message_history[0][1] < time.time() - max_age:
+            self._pop_history()
+        while len(self.message_history) > config.message_history_length:
+            self._pop_history()
+        while self.message_history_size > config.message_history_size:
+            self._pop_history()
+        while _history_size > config.message_history_total_size:
+            outbox, _ = next(iter(_history))
+            outbox._pop_history()  # pylint: disable=protected-access
+
+    def _pop_history(self) -> None:
+        """Remove the oldest packet from the history."""
+        global _history_size  # pylint: disable=global-statement # noqa: PLW0603
+        entry = self.message_history.popleft()
+        self.message_history_size -= len(entry[4])
+        _history.pop((self, entry[0]), None)
+        _history_size -= len(entry[4])
+        self._pruned_message_id = entry[0]
 
     def try_rewind(self, target_message_id: MessageId) -> None:
         """Rewind to the given message ID and discard all messages before it."""
-        # nothing to do, the next message ID is already the target message ID
-        if self.next_message_id == target_message_id:
+        # messages sent via the previous connection are either received or resent below
+        self._in_flight.clear()
+        self.in_flight_bytes = 0
+        self._resume()
+
+        self.prune_history(target_message_id)
+
+        # nothing to do, the client already received all messages
+        if self.next_message_id <= target_message_id:
             return
 
-        # rewind to the target message ID
-        while self.message_history:
-            self.next_message_id, _, message = self.message_history.pop()
-            self.messages.appendleft(message)
-            if self.next_message_id == target_message_id:
-                self.message_history.clear()
-                self._set_enqueue_event()
-                return
+        # resend the already encoded packets the client missed if they are still in the history
+        if self._pruned_message_id < target_message_id:
+            self._replays = list(self.message_history)
+            self.schedule()
+            return
 
-        # target message ID not found, reload the page
-        self.client.run_javascript('window.location.reload()')
+        # missed messages are not available anymore, send a snapshot of all elements instead
+        self._needs_resync = True
+        self.schedule()
 
     def prune_history(self, next_message_id: MessageId) -> None:
-        """Prune the message history up to the given message ID."""
+        """Prune the message history up to the given message ID.
+
+        All messages before this ID have been acknowledged by the client and are no longer in flight.
+        """
         while self.message_history and self.message_history[0][0] < next_message_id:
-            self.message_history.popleft()
+            self._pop_history()
+        now = time.time()
+        while self._in_flight and self._in_flight[0][0] < next_message_id:
+            _, size, sent_time = self._in_flight.popleft()
+            self.in_flight_bytes -= size
+            self.metrics.ack_lag.observe(now - sent_time)
+        if not self.is_lagging:
+            self._resume()
+
+    def _resume(self) -> None:
+        """Schedule pending work that has been held back."""
+        if self._is_held_back:
+            self._is_held_back = False
+            self.schedule()
 
     def stop(self) -> None:
-        """Stop the outbox loop."""
+        """Stop flushing this outbox."""
         self._should_stop = True
+        _ready_outboxes.pop(self, None)
+        while self.message_history:
+            self._pop_history()
+
+
+async def loop() -> None:
+    """Flush all outboxes with pending work in an endless loop.
+
+    Outboxes of clients without socket connection are skipped until they are scheduled again on handshake.
+    Outboxes of lagging clients are held back until the client acknowledges enough messages.
+    Meanwhile element updates are merged and superseded messages are dropped.
+    """
+    global _ready_event  # pylint: disable=global-statement # noqa: PLW0603
+    _ready_event = asyncio.Event()
+    _ready_event.set()
+    while True:
+        try:
+            await _ready_event.wait()
+            _ready_event.clear()
+            flushes = []
+            for outbox in list(_ready_outboxes):
+                del _ready_outboxes[outbox]
+                client = outbox._client()  # pylint: disable=protected-access
+                if client is None or not client.has_socket_connection:
+                    continue
+                if outbox.is_lagging:
+                    outbox._is_held_back = True  # pylint: disable=protected-access
+                    continue
+                try:
+                    messages = outbox._collect()  # pylint: disable=protected-access
+                except Exception as e:
+                    core.app.handle_exception(e)
+                    continue
+                if messages or outbox._replays:  # pylint: disable=protected-access
+                    flushes.append(outbox._flush(messages))  # pylint: disable=protected-access
+            await asyncio.gather(*flushes)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            core.app.handle_exception(e)
+            await asyncio.sleep(0.1)
+
+
+def get_metrics(outboxes: Iterable[Outbox]) -> dict[str, Any]:
+    """Return a snapshot of the metrics aggregated over the given outboxes and the global message history."""
+    metrics = OutboxMetrics()
+    result: dict[str, Any] = {'outboxes': 0, 'queue_depth': 0, 'in_flight_bytes': 0, 'lagging': 0}
+    for outbox in outboxes:
+        metrics.merge(outbox.metrics)
+        result['outboxes'] += 1
+        result['queue_depth'] += outbox.queue_depth
+        result['in_flight_bytes'] += outbox.in_flight_bytes
+        result['lagging'] += outbox.is_lagging
+    return {
+        **metrics.to_dict(),
+        **result,
+        'history_packets': len(_history),
+        'history_bytes': _history_size,
+        'compression': {
+            'packets': compression_stats.packets,
+            'original_bytes': compression_stats.original_bytes,
+            'compressed_bytes': compression_stats.compressed_bytes,
+            'ratio': compression_stats.ratio,
+            'seconds': compression_stats.seconds,
+        },
+    }
+
+
+def reset() -> None:
+    """Clear all scheduled outboxes.
+
+    This function is intended for testing purposes only.
+    """
+    global _ready_event, _history_size  # pylint: disable=global-statement # noqa: PLW0603
+    _ready_outboxes.clear()
+    _ready_event = None
+    _history.clear()
+    _history_size = 0
+    compression_stats.packets = compression_stats.original_bytes = compression_stats.compressed_bytes = 0
+    compression_stats.seconds = 0.0
+    EmitCycle.current = None
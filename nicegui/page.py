@@ -152,6 +152,9 @@ class page:
             request = dec_kwargs['request']
             # NOTE cleaning up the keyword args so the signature is consistent with "func" again
             dec_kwargs = {k: v for k, v in dec_kwargs.items() if k in parameters_of_decorated_func}
+            if 'session' in request.scope and 'id' in request.session:
+                # NOTE load user storage asynchronously so that accessing it while building the page does not block
+                await core.app.storage._create_user_storage(request.session['id'])  # pylint: disable=protected-access
             with Client(self, request=request) as client:
                 if any(p.name == 'client' for p in inspect.signature(func).parameters.values()):
                     dec_kwargs['client'] = client
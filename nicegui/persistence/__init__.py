@@ -2,10 +2,12 @@ from .file_persistent_dict import FilePersistentDict
 from .persistent_dict import PersistentDict
 from .read_only_dict import ReadOnlyDict
 from .redis_persistent_dict import RedisPersistentDict
+from .sqlite_persistent_dict import SqlitePersistentDict
 
 __all__ = [
     'FilePersistentDict',
     'PersistentDict',
     'ReadOnlyDict',
     'RedisPersistentDict',
+    'SqlitePersistentDict',
 ]
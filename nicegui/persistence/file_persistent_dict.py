@@ -1,45 +1,107 @@
+import zlib
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import aiofiles
 
 from nicegui import background_tasks, core, json
 from nicegui.logging import log
+from nicegui.observables import PatchAccumulator
 
 from .persistent_dict import PersistentDict
 
+MIN_COMPACTION_SIZE = 64 * 1024
+'''Minimum size of the journal in bytes before it is compacted into the storage file.'''
+
 
 class FilePersistentDict(PersistentDict):
 
-    def __init__(self, filepath: Path, encoding: Optional[str] = None, *, indent: bool = False) -> None:
+    def __init__(self, filepath: Path, encoding: Optional[str] = None, *,
+                 indent: bool = False,
+                 journal: bool = False,
+                 compaction_ratio: float = 4.0,
+                 ) -> None:
+        """Dictionary that is persisted to a JSON file.
+
+        In journal mode only the changes are appended to a journal file next to the storage file.
+        When the journal grows larger than ``compaction_ratio`` times the storage file,
+        it is compacted into the storage file.
+
+        :param filepath: path to the JSON file
+        :param encoding: file encoding (default: ``None``)
+        :param indent: whether to indent the JSON file (default: ``False``)
+        :param journal: whether to append changes to a journal instead of rewriting the whole file
+            (default: ``False``, *added in version 3.5.0*)
+        :param compaction_ratio: journal size relative to the storage file that triggers a compaction
+            (default: 4.0, *added in version 3.5.0*)
+        """
         self.filepath = filepath
         self.encoding = encoding
         self.indent = indent
-        super().__init__(data={}, on_change=self.backup)
+        self.journal = journal
+        self.compaction_ratio = compaction_ratio
+        self.journal_path = filepath.with_suffix('.journal')
+        self._patches: Optional[PatchAccumulator] = None
+        self._snapshot_checksum = _checksum('')
+        self._snapshot_size = 0
+        self._journal_size = 0
+        self._journal_is_damaged = False
+        self._loading = False
+        super().__init__(data={}, on_change=None if journal else self.backup)
+        if journal:
+            self._patches = PatchAccumulator(self)
+            self.on_change(self.backup)
 
     async def initialize(self) -> None:
         try:
+            snapshot = journal = None
             if self.filepath.exists():
                 async with aiofiles.open(self.filepath, encoding=self.encoding) as f:
-                    data = json.loads(await f.read())
-            else:
-                data = {}
-            self.update(data)
+                    snapshot = await f.read()
+            if self.journal and self.journal_path.exists():
+                async with aiofiles.open(self.journal_path, encoding='utf-8') as f:
+                    journal = await f.read()
+            self._load(snapshot, journal)
         except Exception:
             log.warning(f'Could not load storage file {self.filepath}')
 
     def initialize_sync(self) -> None:
         try:
-            if self.filepath.exists():
-                data = json.loads(self.filepath.read_text(encoding=self.encoding))
-            else:
-                data = {}
-            self.update(data)
+            snapshot = self.filepath.read_text(encoding=self.encoding) if self.filepath.exists() else None
+            journal = self.journal_path.read_text(encoding='utf-8') \
+                if self.journal and self.journal_path.exists() else None
+            self._load(snapshot, journal)
         except Exception:
             log.warning(f'Could not load storage file {self.filepath}')
 
+    def _load(self, snapshot: Optional[str], journal: Optional[str]) -> None:
+        data = json.loads(snapshot) if snapshot else {}
+        if not self.journal:
+            self.update(data)
+            return
+        assert self._patches is not None
+        self._snapshot_checksum = _checksum(snapshot or '')
+        self._snapshot_size = len(snapshot or '')
+        self._journal_size = len(journal or '')
+        if journal:
+            self._journal_is_damaged = not _replay(data, journal, self._snapshot_checksum, self.journal_path)
+        self._loading = True
+        try:
+            self.update(data)
+        finally:
+            self._loading = False
+            self._patches.pop()  # NOTE: the loaded data is already persisted
+
     def backup(self) -> None:
-        """Back up the data to the given file path."""
+        """Back up the data to the given file path.
+
+        In journal mode only the changes since the last backup are appended to the journal.
+        """
+        if self.journal:
+            if not self._loading:
+                self._backup_journal()
+            return
+
         if not self.filepath.exists():
             if not self:
                 return
@@ -55,6 +117,116 @@ class FilePersistentDict(PersistentDict):
         else:
             self.filepath.write_text(json.dumps(self, indent=self.indent), encoding=self.encoding)
 
+    def _backup_journal(self) -> None:
+        if self._journal_size == 0:
+            self.filepath.parent.mkdir(exist_ok=True)
+
+        @background_tasks.await_on_shutdown
+        async def async_backup() -> None:
+            snapshot, journal, mode = self._pop_journal_entries()
+            if snapshot is not None:
+                tmp_path = self.filepath.with_suffix('.tmp')
+                async with aiofiles.open(tmp_path, 'w', encoding=self.encoding) as f:
+                    await f.write(snapshot)
+                tmp_path.replace(self.filepath)
+            if journal:
+                async with aiofiles.open(self.journal_path, mode, encoding='utf-8') as f:
+                    await f.write(journal)
+
+        if core.loop and core.loop.is_running():
+            background_tasks.create_lazy(async_backup(), name=self.filepath.stem)
+        else:
+            snapshot, journal, mode = self._pop_journal_entries()
+            if snapshot is not None:
+                tmp_path = self.filepath.with_suffix('.tmp')
+                tmp_path.write_text(snapshot, encoding=self.encoding)
+                tmp_path.replace(self.filepath)
+            if journal:
+                with self.journal_path.open(mode, encoding='utf-8') as f:
+                    f.write(journal)
+
+    def _pop_journal_entries(self) -> tuple[Optional[str], str, str]:
+        """Return the new storage file content (if the journal is compacted), the journal text and the file mode.
+
+        The journal starts with a header holding the checksum of the storage file it is based on,
+        so that an outdated journal is ignored if the process stops between writing both files.
+        """
+        assert self._patches is not None
+        operations = self._patches.pop()
+        if not operations:
+            return None, '', 'a'
+        header = json.dumps({'snapshot': self._snapshot_checksum}) + '\n' if self._journal_size == 0 else ''
+        entry = header + json.dumps(operations) + '\n'
+        journal_size = self._journal_size + len(entry)
+        compaction_size = max(self.compaction_ratio * self._snapshot_size, MIN_COMPACTION_SIZE)
+        if self._journal_is_damaged or journal_size > compaction_size:
+            snapshot = json.dumps(self, indent=self.indent)
+            self._snapshot_checksum = _checksum(snapshot)
+            self._snapshot_size = len(snapshot)
+            self._journal_is_damaged = False
+            header = json.dumps({'snapshot': self._snapshot_checksum}) + '\n'
+            self._journal_size = len(header)
+            return snapshot, header, 'w'
+        mode = 'w' if self._journal_size == 0 else 'a'
+        self._journal_size = journal_size
+        return None, entry, mode
+
     def clear(self) -> None:
         super().clear()
         self.filepath.unlink(missing_ok=True)
+        if self.journal:
+            assert self._patches is not None
+            self._patches.pop()
+            self.journal_path.unlink(missing_ok=True)
+            self._snapshot_checksum = _checksum('')
+            self._snapshot_size = 0
+            self._journal_size = 0
+            self._journal_is_damaged = False
+
+
+def _checksum(snapshot: str) -> int:
+    return zlib.crc32(snapshot.encode())
+
+
+def _replay(data: dict, journal: str, checksum: int, path: Path) -> bool:
+    """Apply the JSON Patch operations of a journal to the data loaded from the storage file.
+
+    Returns ``False`` if the journal is outdated or could not be applied completely.
+    """
+    header, *entries = journal.splitlines()
+    if json.loads(header).get('snapshot') != checksum:
+        log.warning(f'Ignoring outdated journal {path}')
+        return False
+    for entry in entries:
+        try:
+            for operation in json.loads(entry):
+                _apply(data, operation)
+        except (ValueError, KeyError, IndexError, TypeError):
+            log.warning(f'Ignoring incomplete entry in journal {path}')
+            return False
+    return True
+
+
+def _apply(data: dict, operation: dict[str, Any]) -> None:
+    """Apply a single JSON Patch operation as created by ``PatchAccumulator``."""
+    keys = [key.replace('~1', '/').replace('~0', '~') for key in operation['path'].split('/')[1:]]
+    if not keys:
+        data.clear()
+        data.update(operation['value'])
+        return
+    parent = data
+    for key in keys[:-1]:
+        parent = parent[int(key)] if isinstance(parent, list) else parent[key]
+    key = keys[-1]
+    if isinstance(parent, list):
+        index = len(parent) if key == '-' else int(key)
+        if operation['op'] == 'add':
+            parent.insert(index, operation['value'])
+        elif operation['op'] == 'replace':
+            parent[index] = operation['value']
+        else:
+            del parent[index]
+    elif operation['op'] == 'remove':
+        parent.pop(key, None)
+    else:
+        parent[key] = operation['value']
@@ -1,6 +1,7 @@
 import abc
+from typing import Any, Optional
 
-from nicegui import observables
+from nicegui import events, observables
 
 
 class PersistentDict(observables.ObservableDict, abc.ABC):
@@ -15,3 +16,20 @@ class PersistentDict(observables.ObservableDict, abc.ABC):
 
     async def close(self) -> None:
         """Clean up the persistence layer."""
+
+
+def changed_top_level_keys(e: events.ObservableChangeEventArguments) -> Optional[set[Any]]:
+    """Return the changed top-level keys or ``None`` if the whole dictionary has been replaced."""
+    if e.path:
+        return {e.path[0]}
+    if e.op == 'update':
+        return set(e.value)
+    if e.op == 'batch':
+        keys: set[Any] = set()
+        for change in e.value:
+            change_keys = changed_top_level_keys(change)
+            if change_keys is None:
+                return None
+            keys.update(change_keys)
+        return keys
+    return None
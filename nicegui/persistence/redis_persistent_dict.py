@@ -1,82 +1,319 @@
-from .. import background_tasks, core, json, optional_features
+import asyncio
+import re
+import time
+import uuid
+from typing import Any, Optional
+
+from .. import background_tasks, core, events, json, optional_features
 from ..logging import log
-from .persistent_dict import PersistentDict
+from ..metrics import RedisMetrics
+from .persistent_dict import PersistentDict, changed_top_level_keys
 
 try:
     import redis as redis_sync
     import redis.asyncio as redis
-    import redis.exceptions as redis_exceptions
     optional_features.register('redis')
 except ImportError:
     pass
 
+MAX_CONNECTIONS = 50
+'''Maximum number of connections of the shared pool per Redis URL; further requests wait for a free connection.'''
+
+
+def _client_params(url: str) -> dict[str, Any]:
+    return {
+        'health_check_interval': 10,
+        'socket_connect_timeout': 5,
+        'retry_on_timeout': True,
+        **({'socket_keepalive': True} if not url.startswith('unix://') else {}),
+    }
+
+
+class _SharedConnection:
+    """Redis connection pool and pub/sub connection shared by all persistent dictionaries with the same URL.
+
+    A single listener pattern-subscribes to the change channels of all key prefixes in use
+    and dispatches each message to the dictionaries registered for its channel.
+    Messages of different channels are handled concurrently, messages of the same channel in order of arrival.
+    """
+    instances: dict[str, '_SharedConnection'] = {}
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.pool = redis.BlockingConnectionPool.from_url(url, max_connections=MAX_CONNECTIONS, **_client_params(url))
+        self.client = redis.Redis(connection_pool=self.pool)
+        self.pubsub = self.client.pubsub()
+        self.users = 0
+        self.subscribers: dict[str, list['RedisPersistentDict']] = {}
+        self.patterns: set[str] = set()
+        self.metrics = RedisMetrics()
+        self._new_patterns: list[str] = []
+        self._listening = False
+        self._task: Optional[asyncio.Task] = None
+        self._dispatch_tasks: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def acquire(url: str) -> '_SharedConnection':
+        """Return the shared connection for the given URL and create it if necessary."""
+        if url not in _SharedConnection.instances:
+            _SharedConnection.instances[url] = _SharedConnection(url)
+        connection = _SharedConnection.instances[url]
+        connection.users += 1
+        return connection
+
+    async def release(self) -> None:
+        """Close the connection once it is not used by any dictionary anymore."""
+        self.users -= 1
+        if self.users > 0:
+            return
+        if _SharedConnection.instances.get(self.url) is self:
+            del _SharedConnection.instances[self.url]
+        self._listening = False
+        if self._task is not None:
+            self._task.cancel()
+        for task in self._dispatch_tasks.values():
+            task.cancel()
+        await self.pool.disconnect()  # NOTE: also closes the pub/sub connection, which is taken from the pool
+
+    @property
+    def connection_count(self) -> int:
+        """Number of open connections of the pool including the pub/sub connection."""
+        # pylint: disable=protected-access
+        pool = self.pool
+        if hasattr(pool, '_connections'):  # NOTE: redis < 5
+            return len(pool._connections)
+        return len(pool._available_connections) + len(pool._in_use_connections)
+
+    def subscribe(self, subscriber: 'RedisPersistentDict') -> None:
+        """Dispatch change messages of the subscriber's key to it."""
+        self.subscribers.setdefault(subscriber.key + 'changes', []).append(subscriber)
+        pattern = re.sub(r'([*?\[\]\\])', r'\\\1', subscriber.key_prefix) + '*changes'
+        if pattern not in self.patterns:
+            self.patterns.add(pattern)
+            self._new_patterns.append(pattern)
+        if not self._listening:
+            self._listening = True
+            if core.loop and core.loop.is_running():
+                self._start_listening()
+            else:
+                core.app.on_startup(self._start_listening)
+
+    def unsubscribe(self, subscriber: 'RedisPersistentDict') -> None:
+        """Stop dispatching change messages to the subscriber."""
+        channel = subscriber.key + 'changes'
+        subscribers = [s for s in self.subscribers.get(channel, []) if s is not subscriber]
+        if subscribers:
+            self.subscribers[channel] = subscribers
+        else:
+            self.subscribers.pop(channel, None)
+
+    def _start_listening(self) -> None:
+        if self._listening and self._task is None:
+            self._task = background_tasks.create(self._listen(), name=f'redis-listen-{self.url}')
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                while self._new_patterns:
+                    await self.pubsub.psubscribe(self._new_patterns[0])
+                    self._new_patterns.pop(0)
+                # NOTE: the timeout lets patterns of new key prefixes be subscribed while no messages arrive
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None and message['type'] == 'pmessage':
+                    self._dispatch(message['channel'].decode(), message['data'])
+            except Exception:
+                log.exception(f'Unexpected error in Redis listener for {self.url}')
+                await asyncio.sleep(1.0)
+
+    def _dispatch(self, channel: str, data: bytes) -> None:
+        start = time.perf_counter()
+        subscribers = self.subscribers.get(channel)
+        if not subscribers:
+            self.metrics.ignored_messages += 1
+            return
+        # NOTE: each message only waits for the previous message of its channel, so a slow key does not stall others
+        previous = self._dispatch_tasks.get(channel)
+        task = background_tasks.create(self._deliver(list(subscribers), data, previous, start),
+                                       name=f'redis-dispatch-{channel}')
+        self._dispatch_tasks[channel] = task
+
+        def forget(_: asyncio.Task) -> None:
+            if self._dispatch_tasks.get(channel) is task:
+                del self._dispatch_tasks[channel]
+        task.add_done_callback(forget)
+
+    async def _deliver(self, subscribers: list['RedisPersistentDict'], data: bytes,
+                       previous: Optional[asyncio.Task], start: float) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        for subscriber in subscribers:
+            try:
+                await subscriber._handle_message(data)  # pylint: disable=protected-access
+            except Exception:
+                log.exception(f'Could not apply Redis change notification for {subscriber.key}')
+        self.metrics.dispatched_messages += 1
+        self.metrics.dispatch_latency.observe(time.perf_counter() - start)
+
 
 class RedisPersistentDict(PersistentDict):
 
-    def __init__(self, *, url: str, id: str, key_prefix: str = 'nicegui:') -> None:  # pylint: disable=redefined-builtin
+    def __init__(self, *,
+                 url: str,
+                 id: str,  # pylint: disable=redefined-builtin
+                 key_prefix: str = 'nicegui:',
+                 hash_mode: bool = False,
+                 ) -> None:
+        """Dictionary that is persisted in Redis and synchronized between multiple instances.
+
+        By default the whole dictionary is stored as a single JSON string and published on every change.
+        In hash mode each top-level key is stored as a field of a Redis hash.
+        Only changed fields are written and other instances are notified with the changed keys and a version number,
+        so that they fetch just the changed fields.
+        All dictionaries with the same URL share a connection pool and a single pub/sub connection,
+        which dispatches the change notifications to the affected dictionaries.
+
+        :param url: Redis URL
+        :param id: identifier of the dictionary
+        :param key_prefix: prefix for Redis keys (default: "nicegui:")
+        :param hash_mode: whether to store top-level keys as fields of a Redis hash
+            (default: ``False``, *added in version 3.5.0*)
+        """
         if not optional_features.has('redis'):
             raise ImportError('Redis is not installed. Please run "pip install nicegui[redis]".')
         self.url = url
-        self._redis_client_params = {
-            'health_check_interval': 10,
-            'socket_connect_timeout': 5,
-            'retry_on_timeout': True,
-            **({'socket_keepalive': True} if not url.startswith('unix://') else {}),
-        }
-        self.redis_client = redis.from_url(self.url, **self._redis_client_params)
-        self.pubsub = self.redis_client.pubsub()
+        self.connection = _SharedConnection.acquire(url)
+        self.redis_client = self.connection.client
+        self.key_prefix = key_prefix
         self.key = key_prefix + id
-        self._should_listen = True
-        super().__init__(data={}, on_change=self.publish)
+        self.hash_mode = hash_mode
+        self._closed = False
+        self._source = uuid.uuid4().hex
+        self._version = 0
+        self._changed_keys: set[Any] = set()
+        self._replaced = False
+        self._applying_remote_changes = False
+        super().__init__(data={}, on_change=self._handle_local_change)
 
     async def initialize(self) -> None:
         """Load initial data from Redis and start listening for changes."""
         try:
-            data = await self.redis_client.get(self.key)
-            self.update(json.loads(data) if data else {})
+            if not self.hash_mode:
+                data = await self.redis_client.get(self.key)
+                self.update(json.loads(data) if data else {})
+            elif await self.redis_client.type(self.key) == b'string':
+                self._migrate_to_hash(await self.redis_client.get(self.key))
+            else:
+                await self._reload_hash()
             self._start_listening()
         except Exception:
             log.warning(f'Could not load data from Redis with key {self.key}')
 
     def initialize_sync(self) -> None:
         """Load initial data from Redis and start listening for changes in a synchronous context."""
-        with redis_sync.from_url(self.url, **self._redis_client_params) as redis_client_sync:
+        with redis_sync.from_url(self.url, **_client_params(self.url)) as redis_client_sync:
             try:
-                data = redis_client_sync.get(self.key)
-                self.update(json.loads(data) if data else {})
+                if not self.hash_mode:
+                    data = redis_client_sync.get(self.key)
+                    self.update(json.loads(data) if data else {})
+                elif redis_client_sync.type(self.key) == b'string':
+                    self._migrate_to_hash(redis_client_sync.get(self.key))
+                else:
+                    pipeline = redis_client_sync.pipeline()
+                    pipeline.hgetall(self.key)
+                    pipeline.get(self.key + 'version')
+                    self._load_hash(*pipeline.execute())
                 self._start_listening()
             except Exception:
                 log.warning(f'Could not load data from Redis with key {self.key}')
 
-    def _start_listening(self) -> None:
-        async def listen():
+    def _load_hash(self, fields: dict[bytes, bytes], version: Optional[bytes]) -> None:
+        """Replace the data with the fields of the Redis hash without publishing them again.
+
+        Keys with local changes that have not been written yet are kept, because they are written afterwards.
+        """
+        data = {field.decode(): json.loads(value) for field, value in fields.items()}
+        if not self._replaced:
+            self._applying_remote_changes = True
             try:
-                if not self._should_listen:
-                    return
-                await self.pubsub.subscribe(self.key + 'changes')
-                if not self._should_listen:
-                    await self.pubsub.unsubscribe()
-                    return
-                async for message in self.pubsub.listen():
-                    t = message['type']
-                    if t == 'message':
-                        new_data = json.loads(message['data'])
-                        if new_data != self:
-                            self.update(new_data)
-                    elif t in ('unsubscribe', 'punsubscribe') and message.get('data') == 0:
-                        break
-            except Exception as e:
-                if isinstance(e, redis_exceptions.ConnectionError) and not self._should_listen:
-                    return  # NOTE: on quick instantiation cycles, unsubscribe event might not be received before the connection is closed
-                log.exception(f'Unexpected error in Redis listener for {self.key}')
+                for key in [key for key in self if key not in data and key not in self._changed_keys]:
+                    del self[key]
+                self.update({key: value for key, value in data.items() if key not in self._changed_keys})
+            finally:
+                self._applying_remote_changes = False
+        self._version = max(self._version, int(version or 0))
+
+    async def _reload_hash(self) -> None:
+        """Load the whole Redis hash together with its version, e.g. after missing a change notification."""
+        pipeline = self.redis_client.pipeline()
+        pipeline.hgetall(self.key)
+        pipeline.get(self.key + 'version')
+        self._load_hash(*await pipeline.execute())
+
+    def _apply_fields(self, fields: dict[str, Optional[bytes]]) -> None:
+        """Apply changed fields of the Redis hash without publishing them again; ``None`` marks removed fields."""
+        self._applying_remote_changes = True
+        try:
+            for key, value in fields.items():
+                if key in self._changed_keys or self._replaced:
+                    continue  # NOTE: the local change is written afterwards
+                if value is not None:
+                    self[key] = json.loads(value)
+                elif key in self:
+                    del self[key]
+        finally:
+            self._applying_remote_changes = False
+
+    def _migrate_to_hash(self, data: bytes) -> None:
+        """Load data stored as a single JSON string and store it as a Redis hash instead."""
+        self._applying_remote_changes = True
+        try:
+            self.update(json.loads(data))
+        finally:
+            self._applying_remote_changes = False
+        self._replaced = True
+        self._schedule_hash_backup()
+
+    def _start_listening(self) -> None:
+        if not self._closed:
+            self.connection.subscribe(self)
+
+    async def _handle_message(self, data: bytes) -> None:
+        """Apply a change notification of another instance."""
+        if not self.hash_mode:
+            new_data = json.loads(data)
+            if new_data != self:
+                self.update(new_data)
+            return
+        message = json.loads(data)
+        if message['source'] == self._source or message['version'] <= self._version:
+            return  # NOTE: all versions up to ``self._version`` are already included
+        if message['replaced'] or message['version'] > self._version + 1:  # NOTE: missed a notification
+            await self._reload_hash()
+        else:
+            values = await self.redis_client.hmget(self.key, message['keys'])
+            self._apply_fields(dict(zip(message['keys'], values)))
+            self._version = max(self._version, message['version'])
 
-        if core.loop and core.loop.is_running():
-            background_tasks.create(listen(), name=f'redis-listen-{self.key}')
+    def _handle_local_change(self, e: events.ObservableChangeEventArguments) -> None:
+        if not self.hash_mode:
+            self.publish()
+            return
+        if self._applying_remote_changes:
+            return
+        keys = changed_top_level_keys(e)
+        if keys is None:
+            self._replaced = True
         else:
-            core.app.on_startup(listen())
+            self._changed_keys.update(keys)
+        self._schedule_hash_backup()
 
     def publish(self) -> None:
         """Publish the data to Redis and notify other instances."""
+        if self.hash_mode:
+            self._replaced = True
+            self._schedule_hash_backup()
+            return
+
         async def backup() -> None:
             if not await self.redis_client.exists(self.key) and not self:
                 return
@@ -85,20 +322,83 @@ class RedisPersistentDict(PersistentDict):
             pipeline.publish(self.key + 'changes', json.dumps(self))
             await pipeline.execute()
         if core.loop:
-            background_tasks.create_lazy(backup(), name=f'redis-{self.key}')
+            background_tasks.create_lazy(backup(), name=f'redis-{self.key}-{self._source}')
+        else:
+            core.app.on_startup(backup())
+
+    def _schedule_hash_backup(self) -> None:
+        async def backup() -> None:
+            keys, self._changed_keys = self._changed_keys, set()
+            replaced, self._replaced = self._replaced, False
+            if replaced:
+                keys = set(self)
+            elif not keys:
+                return
+            values = {str(key): json.dumps(dict.__getitem__(self, key)) for key in keys if key in self}
+            deleted = [str(key) for key in keys if key not in self]
+            # NOTE: publishing within the transaction ensures that the notification is never lost between writing
+            # and publishing; the version is watched instead of incremented because the message has to contain it
+            async with self.redis_client.pipeline() as pipeline:
+                while True:
+                    try:
+                        await pipeline.watch(self.key + 'version')
+                        version = int(await pipeline.get(self.key + 'version') or 0) + 1
+                        pipeline.multi()
+                        if replaced:
+                            pipeline.delete(self.key)
+                        if values:
+                            pipeline.hset(self.key, mapping=values)
+                        if deleted:
+                            pipeline.hdel(self.key, *deleted)
+                        pipeline.set(self.key + 'version', version)
+                        pipeline.publish(self.key + 'changes', json.dumps({
+                            'source': self._source,
+                            'version': version,
+                            'keys': [*values, *deleted],
+                            'replaced': replaced,
+                        }))
+                        await pipeline.execute()
+                        break
+                    except redis.WatchError:
+                        continue  # NOTE: another instance has written a new version in the meantime
+            if version == self._version + 1:
+                self._version = version
+            elif version > self._version:
+                await self._reload_hash()  # NOTE: other instances have written versions we have not seen yet
+        if core.loop:
+            background_tasks.create_lazy(backup(), name=f'redis-{self.key}-{self._source}')
         else:
             core.app.on_startup(backup())
 
     async def close(self) -> None:
-        """Close Redis connection and subscription."""
-        self._should_listen = False
-        if self.pubsub.subscribed:
-            await self.pubsub.unsubscribe()
-        await self.pubsub.close()
-        await self.redis_client.close()
+        """Stop receiving changes and release the shared Redis connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self.connection.unsubscribe(self)
+        await self.connection.release()
+
+    @staticmethod
+    def get_metrics() -> dict[str, Any]:
+        """Return a snapshot of the metrics aggregated over all shared Redis connections.
+
+        *Added in version 3.5.0*
+        """
+        metrics = RedisMetrics()
+        result = {'pools': 0, 'connections': 0, 'storages': 0, 'subscriptions': 0, 'patterns': 0}
+        for connection in _SharedConnection.instances.values():
+            metrics.merge(connection.metrics)
+            result['pools'] += 1
+            result['connections'] += connection.connection_count
+            result['storages'] += connection.users
+            result['subscriptions'] += len(connection.subscribers)
+            result['patterns'] += len(connection.patterns)
+        return {**metrics.to_dict(), **result}
 
     def clear(self) -> None:
         super().clear()
+        if self.hash_mode:
+            return  # NOTE: the hash is deleted when publishing the change
         if core.loop:
             background_tasks.create_lazy(self.redis_client.delete(self.key), name=f'redis-delete-{self.key}')
         else:
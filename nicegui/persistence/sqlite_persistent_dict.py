@@ -0,0 +1,241 @@
+import asyncio
+import functools
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .. import core, events, json
+from ..logging import log
+from .persistent_dict import PersistentDict, changed_top_level_keys
+
+MAX_BATCH_SIZE = 1000
+'''Maximum number of queued requests that are committed in a single transaction.'''
+
+
+class _Database:
+    """SQLite database shared by all persistent dictionaries with the same path.
+
+    All reads and writes are executed in order on a single writer thread,
+    which commits all requests that have been queued in the meantime within a single transaction.
+    """
+    instances: dict[Path, '_Database'] = {}
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, name=f'sqlite-storage-{path.name}', daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def get(path: Path) -> '_Database':
+        """Return the database for the given path and create it if necessary."""
+        path = path.resolve()
+        if path not in _Database.instances:
+            _Database.instances[path] = _Database(path)
+        return _Database.instances[path]
+
+    def write(self, dict_id: str, upserts: dict[str, str], deletes: list[str], *,
+              clear: bool = False, on_failure: Optional[Callable[[], None]] = None) -> None:
+        """Queue an update of the rows of a dictionary.
+
+        If the update can not be committed, ``on_failure`` is called on the writer thread.
+        """
+        self.queue.put(('write', dict_id, upserts, deletes, clear, on_failure))
+
+    def read(self, dict_id: str) -> Future:
+        """Queue reading all rows of a dictionary and return a future for the resulting key-value pairs."""
+        future: Future = Future()
+        self.queue.put(('read', dict_id, None, None, False, future))
+        return future
+
+    def delete_all(self) -> Future:
+        """Queue deleting all rows and return a future that is resolved once the deletion has been committed."""
+        future: Future = Future()
+        self.queue.put(('delete_all', None, None, None, False, future))
+        return future
+
+    def sync(self) -> Future:
+        """Return a future that is resolved once all previously queued writes have been committed."""
+        future: Future = Future()
+        self.queue.put(('sync', None, None, None, False, future))
+        return future
+
+    def stop(self) -> Future:
+        """Queue stopping the writer thread and return a future that is resolved once the connection is closed.
+
+        Requests which are queued after stopping are not executed anymore.
+        """
+        if _Database.instances.get(self.path) is self:
+            del _Database.instances[self.path]
+        future: Future = Future()
+        self.queue.put(('stop', None, None, None, False, future))
+        return future
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS storage ('
+                           'id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+                           'PRIMARY KEY (id, key)) WITHOUT ROWID')
+        while True:
+            requests = [self.queue.get()]
+            while len(requests) < MAX_BATCH_SIZE and requests[-1][0] != 'stop' and not self.queue.empty():
+                requests.append(self.queue.get())
+            stopping = requests[-1][0] == 'stop'
+            results: list[tuple[Any, Any]] = []
+            failures: list[tuple[Any, Exception]] = []
+            try:
+                connection.execute('BEGIN')
+                for request in requests:
+                    # NOTE: each request gets its own savepoint, so that a failing request does not discard the others
+                    connection.execute('SAVEPOINT request')
+                    try:
+                        result = self._execute(connection, *request[:-1])
+                        connection.execute('RELEASE request')
+                        results.append((request[-1], result))
+                    except sqlite3.Error as e:
+                        connection.execute('ROLLBACK TO request')
+                        connection.execute('RELEASE request')
+                        failures.append((request[-1], e))
+                connection.execute('COMMIT')
+            except Exception as e:
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                failures = [(request[-1], e) for request in requests]
+                results = []
+            if stopping:
+                connection.close()  # NOTE: closing the last connection also checkpoints the WAL into the database file
+            for callback, exception in failures:
+                log.error(f'Could not write to storage database {self.path}: {exception}')
+                if isinstance(callback, Future):
+                    callback.set_exception(exception)
+                elif callback is not None:
+                    callback()
+            for callback, result in results:
+                if isinstance(callback, Future):
+                    callback.set_result(result)
+            if stopping:
+                return
+
+    @staticmethod
+    def _execute(connection: sqlite3.Connection,
+                 kind: str, dict_id: str, upserts: dict[str, str], deletes: list[str], clear: bool) -> Any:
+        if kind == 'write':
+            if clear:
+                connection.execute('DELETE FROM storage WHERE id = ?', (dict_id,))
+            connection.executemany('DELETE FROM storage WHERE id = ? AND key = ?',
+                                   [(dict_id, key) for key in deletes])
+            connection.executemany('INSERT OR REPLACE INTO storage (id, key, value) VALUES (?, ?, ?)',
+                                   [(dict_id, key, value) for key, value in upserts.items()])
+        elif kind == 'delete_all':
+            connection.execute('DELETE FROM storage')
+        elif kind == 'read':
+            return connection.execute('SELECT key, value FROM storage WHERE id = ?', (dict_id,)).fetchall()
+        return None
+
+
+class SqlitePersistentDict(PersistentDict):
+
+    def __init__(self, *, path: Path, id: str) -> None:  # pylint: disable=redefined-builtin
+        """Dictionary that stores each top-level key as a row in a shared SQLite database.
+
+        The database is used in WAL mode and written by a single thread,
+        which combines the changes of all dictionaries into as few transactions as possible.
+
+        *Added in version 3.5.0*
+
+        :param path: path to the database file
+        :param id: identifier of the dictionary within the database
+        """
+        self.id = id
+        self.database = _Database.get(path)
+        self._changed_keys: set[Any] = set()
+        self._cleared = False
+        self._flush_scheduled = False
+        self._loading = False
+        super().__init__(data={}, on_change=self.backup)
+
+    async def initialize(self) -> None:
+        try:
+            self._load(await asyncio.wrap_future(self.database.read(self.id)))
+        except Exception:
+            log.warning(f'Could not load storage {self.id} from {self.database.path}')
+
+    def initialize_sync(self) -> None:
+        try:
+            self._load(self.database.read(self.id).result())
+        except Exception:
+            log.warning(f'Could not load storage {self.id} from {self.database.path}')
+
+    def _load(self, rows: list[tuple[str, str]]) -> None:
+        self._loading = True
+        try:
+            self.update({key: json.loads(value) for key, value in rows})
+        finally:
+            self._loading = False
+
+    def backup(self, e: events.ObservableChangeEventArguments) -> None:
+        """Queue writing the changed top-level keys to the database."""
+        if self._loading:
+            return
+        keys = changed_top_level_keys(e)
+        if keys is None:
+            self._cleared = True
+            self._changed_keys.update(self)
+        else:
+            self._changed_keys.update(keys)
+        if core.loop and core.loop.is_running():
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                core.loop.call_soon_threadsafe(self._flush)
+        else:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Serialize the changed values and pass them to the writer thread."""
+        self._flush_scheduled = False
+        if not self._changed_keys and not self._cleared:
+            return
+        keys, self._changed_keys = self._changed_keys, set()
+        cleared, self._cleared = self._cleared, False
+        upserts = {str(key): json.dumps(dict.__getitem__(self, key)) for key in keys if key in self}
+        deletes = [str(key) for key in keys if key not in self]
+        self.database.write(self.id, upserts, deletes, clear=cleared,
+                            on_failure=functools.partial(self._handle_write_failure, keys, cleared))
+
+    def _handle_write_failure(self, keys: set[Any], cleared: bool) -> None:
+        """Mark the keys of a failed write as changed again, so that they are written with the next change."""
+        def mark_dirty() -> None:
+            self._changed_keys.update(keys)
+            self._cleared = self._cleared or cleared
+        if core.loop and core.loop.is_running():
+            core.loop.call_soon_threadsafe(mark_dirty)
+        else:
+            mark_dirty()
+
+    async def close(self) -> None:
+        """Write pending changes and wait until they are committed."""
+        self._flush()
+        await asyncio.wrap_future(self.database.sync())
+
+    @staticmethod
+    def delete_all(path: Path) -> Future:
+        """Queue deleting the data of all dictionaries stored in the given database.
+
+        The deletion is executed before any write which is queued afterwards,
+        so there is no need to wait for the returned future before changing the dictionaries again.
+        """
+        return _Database.get(path).delete_all()
+
+    @staticmethod
+    async def close_all() -> None:
+        """Stop the writer threads of all databases and close their connections."""
+        for database in list(_Database.instances.values()):
+            await asyncio.wrap_future(database.stop())
+            database.thread.join()
+
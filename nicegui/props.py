@@ -10,6 +10,7 @@ from .observables import ObservableDict
 
 if TYPE_CHECKING:
     from .element import Element
+    from .events import ObservableChangeEventArguments
 
 PROPS_PATTERN = re.compile(r'''
 # Match a key or key-value pair optionally followed by whitespace or end of string
@@ -58,6 +59,7 @@ T = TypeVar('T', bound='Element')
 class Props(ObservableDict, Generic[T]):
 
     def __init__(self, *args, element: T, **kwargs) -> None:
+        self._changed_keys: set[str] = set()
         super().__init__(*args, on_change=self._update, **kwargs)
         self._element = weakref.ref(element)
         self._warnings: dict[str, str] = {}
@@ -80,12 +82,56 @@ class Props(ObservableDict, Generic[T]):
             raise RuntimeError('The element this props object belongs to has been deleted.')
         return element
 
-    def _update(self) -> None:
+    def _update(self, e: 'ObservableChangeEventArguments') -> None:
+        if e.sender is not self:
+            self._changed_keys.update(e.path[:1] if e.path and e.path[0] in self else self.keys())
         if self._suspend_count > 0:
             return
         element = self._element()
         if element is not None:
-            element.update()
+            element._update_partially()  # pylint: disable=protected-access
+
+    def _pop_changes(self) -> tuple[dict[str, Any], list[str]]:
+        """Return the changed and removed props since the last call and reset the change tracking."""
+        changed = {key: self[key] for key in self._changed_keys if key in self}
+        removed = [key for key in self._changed_keys if key not in self]
+        self._changed_keys.clear()
+        return changed, removed
+
+    def pop(self, k: Any, d: Any = None) -> Any:
+        self._changed_keys.add(k)
+        return super().pop(k, d)
+
+    def popitem(self) -> Any:
+        if self:
+            self._changed_keys.add(next(reversed(self)))
+        return super().popitem()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        data = dict(*args, **kwargs)
+        self._changed_keys.update(data)
+        super().update(data)
+
+    def clear(self) -> None:
+        self._changed_keys.update(self)
+        super().clear()
+
+    def setdefault(self, __key: Any, __default: Any = None) -> Any:
+        self._changed_keys.add(__key)
+        return super().setdefault(__key, __default)
+
+    def __setitem__(self, __key: Any, __value: Any) -> None:
+        self._changed_keys.add(__key)
+        super().__setitem__(__key, __value)
+
+    def __delitem__(self, __key: Any) -> None:
+        self._changed_keys.add(__key)
+        super().__delitem__(__key)
+
+    def __ior__(self, other: Any) -> Any:
+        other_dict = dict(other)
+        self._changed_keys.update(other_dict)
+        return super().__ior__(other_dict)
 
     def add_warning(self, prop: str, message: str) -> None:
         """Add a warning message for a prop."""
@@ -278,6 +278,95 @@ function ack() {
   window.ackedMessageId = window.nextMessageId;
 }
 
+async function decompress(data) {
+  const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream("deflate"));
+  return JSON.parse(await new Response(stream).text());
+}
+
+const NDARRAY_TYPES = [Int8Array, Uint8Array, Int16Array, Uint16Array, Int32Array, Uint32Array, Float32Array, Float64Array];
+const NDARRAY_EXT_TYPE = 1;
+
+function reshape(values, shape) {
+  if (shape.length <= 1) return values;
+  const size = values.length / shape[0];
+  return Array.from({ length: shape[0] }, (_, i) => reshape(values.slice(i * size, (i + 1) * size), shape.slice(1)));
+}
+
+function decodeNdarray(data) {
+  const view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+  const ndim = data[1];
+  const shape = Array.from({ length: ndim }, (_, i) => view.getUint32(2 + 4 * i, true));
+  const buffer = data.buffer.slice(data.byteOffset + 2 + 4 * ndim, data.byteOffset + data.byteLength);
+  return reshape(Array.from(new NDARRAY_TYPES[data[0]](buffer)), shape);
+}
+
+function decodeMsgpack(buffer) {
+  const bytes = new Uint8Array(buffer);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  const textDecoder = new TextDecoder();
+  let offset = 0;
+  const advance = (size) => (offset += size) - size;
+  const str = (length) => textDecoder.decode(bytes.subarray(offset, advance(length) + length));
+  const bin = (length) => bytes.slice(offset, advance(length) + length);
+  const array = (length) => Array.from({ length }, () => read());
+  const map = (length) => {
+    const result = {};
+    for (let i = 0; i < length; i++) {
+      const key = read();
+      result[key] = read();
+    }
+    return result;
+  };
+  const ext = (length) => {
+    const type = view.getInt8(advance(1));
+    const data = bin(length);
+    return type === NDARRAY_EXT_TYPE ? decodeNdarray(data) : data;
+  };
+  function read() {
+    const byte = bytes[advance(1)];
+    if (byte < 0x80) return byte;
+    if (byte < 0x90) return map(byte & 0x0f);
+    if (byte < 0xa0) return array(byte & 0x0f);
+    if (byte < 0xc0) return str(byte & 0x1f);
+    if (byte >= 0xe0) return byte - 0x100;
+    switch (byte) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xc4: return bin(view.getUint8(advance(1)));
+      case 0xc5: return bin(view.getUint16(advance(2)));
+      case 0xc6: return bin(view.getUint32(advance(4)));
+      case 0xc7: return ext(view.getUint8(advance(1)));
+      case 0xc8: return ext(view.getUint16(advance(2)));
+      case 0xc9: return ext(view.getUint32(advance(4)));
+      case 0xca: return view.getFloat32(advance(4));
+      case 0xcb: return view.getFloat64(advance(8));
+      case 0xcc: return view.getUint8(advance(1));
+      case 0xcd: return view.getUint16(advance(2));
+      case 0xce: return view.getUint32(advance(4));
+      case 0xcf: return Number(view.getBigUint64(advance(8)));
+      case 0xd0: return view.getInt8(advance(1));
+      case 0xd1: return view.getInt16(advance(2));
+      case 0xd2: return view.getInt32(advance(4));
+      case 0xd3: return Number(view.getBigInt64(advance(8)));
+      case 0xd4: return ext(1);
+      case 0xd5: return ext(2);
+      case 0xd6: return ext(4);
+      case 0xd7: return ext(8);
+      case 0xd8: return ext(16);
+      case 0xd9: return str(view.getUint8(advance(1)));
+      case 0xda: return str(view.getUint16(advance(2)));
+      case 0xdb: return str(view.getUint32(advance(4)));
+      case 0xdc: return array(view.getUint16(advance(2)));
+      case 0xdd: return array(view.getUint32(advance(4)));
+      case 0xde: return map(view.getUint16(advance(2)));
+      case 0xdf: return map(view.getUint32(advance(4)));
+    }
+    throw new Error(`Invalid MessagePack byte 0x${byte.toString(16)} at offset ${offset - 1}`);
+  }
+  return read();
+}
+
 async function loadDependencies(element, prefix, version) {
   if (element.component) {
     const { name, key, tag } = element.component;
@@ -367,6 +456,7 @@ function createApp(elements, options) {
             tab_id: TAB_ID,
             old_tab_id: OLD_TAB_ID,
             next_message_id: window.nextMessageId,
+            compression: typeof DecompressionStream !== "undefined",
           };
           window.socket.emit("handshake", args, (ok) => {
             if (!ok) {
@@ -414,6 +504,48 @@ function createApp(elements, options) {
             }
           }
         },
+        resync: async (msg) => {
+          const loadPromises = Object.values(msg)
+            .filter((element) => element.component)
+            .map((element) => loadDependencies(element, options.prefix, options.version));
+          await Promise.all(loadPromises);
+
+          for (const id of Object.keys(this.elements)) {
+            if (!(id in msg)) delete this.elements[id];
+          }
+          for (const [id, element] of Object.entries(msg)) {
+            replaceUndefinedAttributes(element);
+            this.elements[id] = element;
+          }
+
+          await this.$nextTick();
+          for (const [id, element] of Object.entries(msg)) {
+            if (element.update_method) {
+              getElement(id)[element.update_method]();
+            }
+          }
+        },
+        patch: async (msg) => {
+          for (const [id, patch] of Object.entries(msg)) {
+            const element = this.elements[id];
+            if (element === undefined) continue;
+            if (patch.class !== undefined) element.class = patch.class;
+            if (patch.style !== undefined) element.style = patch.style;
+            Object.assign(element.props, patch.props ?? {});
+            (patch.removed_props ?? []).forEach((key) => delete element.props[key]);
+          }
+
+          await this.$nextTick();
+          for (const id of Object.keys(msg)) {
+            const update_method = this.elements[id]?.update_method;
+            if (update_method) {
+              getElement(id)[update_method]();
+            }
+          }
+        },
+        batch: async (msg) => {
+          for (const [type, data] of msg.messages) await messageHandlers[type](data);
+        },
         run_javascript: (msg) => runJavascript(msg.code, msg.request_id),
         open: (msg) => {
           const url = msg.path.startsWith("/") ? options.prefix + msg.path : msg.path;
@@ -433,7 +565,15 @@ function createApp(elements, options) {
             window.nextMessageId = message_id + 1;
             delete args[0]._id;
           }
-          socketMessageQueue.push(() => handler(...args));
+          if (args.length > 0 && args[0]._msgpack !== undefined) {
+            const data = decodeMsgpack(args[0]._msgpack);
+            socketMessageQueue.push(() => handler(data));
+          } else if (args.length > 0 && args[0]._deflate !== undefined) {
+            const compressed = args[0]._deflate;
+            socketMessageQueue.push(async () => handler(await decompress(compressed)));
+          } else {
+            socketMessageQueue.push(() => handler(...args));
+          }
           if (!isProcessingSocketMessage) {
             while (socketMessageQueue.length > 0) {
               const handler = socketMessageQueue.shift();
@@ -445,6 +585,7 @@ function createApp(elements, options) {
               }
               isProcessingSocketMessage = false;
             }
+            throttle(ack, 0.5, true, true, "ack"); // NOTE: acknowledge processed messages early to release backpressure
           }
         });
       }
@@ -1,3 +1,4 @@
+import asyncio
 import contextvars
 import os
 import uuid
@@ -6,33 +7,55 @@ from pathlib import Path
 from typing import Any, Optional, Union
 
 from starlette.middleware import Middleware
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from . import core, helpers, observables
+from . import background_tasks, core, helpers, observables
 from .context import context
+from .logging import log
 from .observables import ObservableDict
-from .persistence import FilePersistentDict, PersistentDict, ReadOnlyDict, RedisPersistentDict
+from .persistence import FilePersistentDict, PersistentDict, ReadOnlyDict, RedisPersistentDict, SqlitePersistentDict
 from .persistence.peudo_persistent_dict import PseudoPersistentDict
+from .version import __version__
 
 request_contextvar: contextvars.ContextVar[Optional[Request]] = contextvars.ContextVar('request_var', default=None)
 
 
-class RequestTrackingMiddleware(BaseHTTPMiddleware):
+class RequestTrackingMiddleware:
+    """Pure ASGI middleware which tracks the current request and assigns a session ID.
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    Requests for NiceGUI's versioned assets below ``/_nicegui/{version}/`` are passed through untouched.
+    User storage is not loaded here but on first access of ``app.storage.user``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or _route_path(scope).startswith(f'/_nicegui/{__version__}/'):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         request_contextvar.set(request)
         if 'id' not in request.session:
             request.session['id'] = str(uuid.uuid4())
         request.state.responded = False
-        session_id = request.session['id']
-        if session_id not in core.app.storage._users:  # pylint: disable=protected-access
-            await core.app.storage._create_user_storage(session_id)  # pylint: disable=protected-access
-        response = await call_next(request)
-        request.state.responded = True
-        return response
+
+        async def send_with_tracking(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                request.state.responded = True
+            await send(message)
+
+        await self.app(scope, receive, send_with_tracking)
+
+
+def _route_path(scope: Scope) -> str:
+    """Return the request path relative to the root path, e.g. of a mounted app or behind a reverse proxy."""
+    path: str = scope['path']
+    root_path: str = scope.get('root_path', '')
+    return path[len(root_path):] if root_path and path.startswith(root_path) else path
 
 
 def set_storage_secret(storage_secret: Optional[str] = None,
@@ -54,26 +77,42 @@ class Storage:
     path = Path(os.environ.get('NICEGUI_STORAGE_PATH', '.nicegui')).resolve()
     '''Path to use for local persistence. Defaults to ".nicegui".'''
 
+    backend = os.environ.get('NICEGUI_STORAGE_BACKEND', 'file')
+    '''Backend for persistent storage on the server: "file" (one JSON file per storage) or "sqlite" (a shared database).
+    Defaults to "file". Redis is used instead if a Redis URL is configured.'''
+
+    journal = os.environ.get('NICEGUI_STORAGE_JOURNAL', 'false').lower() == 'true'
+    '''Whether local file storage appends changes to a journal instead of rewriting whole files. Defaults to False.'''
+
     redis_url = os.environ.get('NICEGUI_REDIS_URL', None)
     '''URL to use for shared persistent storage via Redis. Defaults to None, which means local file storage is used.'''
 
     redis_key_prefix = os.environ.get('NICEGUI_REDIS_KEY_PREFIX', 'nicegui:')
     '''Prefix for Redis keys. Defaults to "nicegui:".'''
 
+    redis_hash_mode = os.environ.get('NICEGUI_REDIS_HASH_MODE', 'false').lower() == 'true'
+    '''Whether to store top-level keys as fields of Redis hashes and only write changed fields. Defaults to False.'''
+
     max_tab_storage_age: float = timedelta(days=30).total_seconds()
     '''Maximum age in seconds before tab storage is automatically purged. Defaults to 30 days.'''
 
     def __init__(self) -> None:
         self._general = Storage._create_persistent_dict('general')
         self._users: dict[str, PersistentDict] = {}
+        self._loading_users: dict[str, asyncio.Task] = {}
         self._tabs: dict[str, ObservableDict] = {}
 
     @staticmethod
     def _create_persistent_dict(id: str) -> PersistentDict:  # pylint: disable=redefined-builtin
         if Storage.redis_url:
-            return RedisPersistentDict(url=Storage.redis_url, id=id, key_prefix=Storage.redis_key_prefix)
+            return RedisPersistentDict(url=Storage.redis_url, id=id, key_prefix=Storage.redis_key_prefix,
+                                       hash_mode=Storage.redis_hash_mode)
+        elif Storage.backend == 'sqlite':
+            return SqlitePersistentDict(path=Storage.path / 'storage.sqlite', id=id)
+        elif Storage.backend == 'file':
+            return FilePersistentDict(Storage.path / f'storage-{id}.json', encoding='utf-8', journal=Storage.journal)
         else:
-            return FilePersistentDict(Storage.path / f'storage-{id}.json', encoding='utf-8')
+            raise ValueError(f'Unknown storage backend "{Storage.backend}", expected "file" or "sqlite"')
 
     @property
     def browser(self) -> Union[ReadOnlyDict, dict]:
@@ -103,6 +142,10 @@ class Storage:
 
         The data is stored on the server.
         It is shared between all browser tabs by identifying the user via session cookie ID.
+        The storage is loaded asynchronously before a page is built and on first access in other contexts.
+        Synchronous API endpoints wait for it to be loaded on the event loop.
+        Only when first accessed on the event loop itself, e.g. in an ``async`` API endpoint,
+        it is loaded synchronously and a warning is logged, because this blocks the event loop.
         """
         if core.is_script_mode_preflight():
             return PseudoPersistentDict()
@@ -112,12 +155,51 @@ class Storage:
                 raise RuntimeError('app.storage.user needs a storage_secret passed in ui.run()')
             raise RuntimeError('app.storage.user can only be used within a UI context')
         session_id = request.session['id']
-        assert session_id in self._users, f'user storage for {session_id} should be created before accessing it'
+        if session_id not in self._users:
+            try:
+                on_event_loop = asyncio.get_running_loop() is core.loop
+            except RuntimeError:
+                on_event_loop = False
+            if not on_event_loop and core.loop and core.loop.is_running():
+                asyncio.run_coroutine_threadsafe(self._create_user_storage(session_id), core.loop).result()
+            else:
+                if on_event_loop:
+                    log.warning(f'app.storage.user is loaded synchronously for {request.url.path}, '
+                                'which blocks the event loop; '
+                                'access it within a page or a synchronous endpoint to load it asynchronously')
+                user = Storage._create_persistent_dict(f'user-{session_id}')
+                user.initialize_sync()
+                self._users[session_id] = user
         return self._users[session_id]
 
     async def _create_user_storage(self, session_id: str) -> None:
-        self._users[session_id] = Storage._create_persistent_dict(f'user-{session_id}')
-        await self._users[session_id].initialize()
+        """Load the user storage unless it is already loaded; concurrent calls wait for the same loading task."""
+        if session_id in self._users:
+            return
+        if session_id not in self._loading_users:
+            self._loading_users[session_id] = \
+                background_tasks.create(self._load_user_storage(session_id), name=f'load user storage {session_id}')
+        await asyncio.shield(self._loading_users[session_id])
+
+    async def _load_user_storage(self, session_id: str) -> None:
+        try:
+            user = Storage._create_persistent_dict(f'user-{session_id}')
+            await user.initialize()
+        finally:
+            del self._loading_users[session_id]
+        if session_id in self._users:  # NOTE: the storage has been accessed and loaded synchronously in the meantime
+            await user.close()
+        else:
+            self._users[session_id] = user
+
+    @property
+    def redis_metrics(self) -> dict[str, Any]:
+        """Snapshot of the metrics of the shared Redis connections (*added in version 3.5.0*).
+
+        Contains the number of connection pools, open connections, storages, subscribed channels and patterns,
+        counters for dispatched and ignored change notifications and a histogram of the dispatch latency.
+        """
+        return RedisPersistentDict.get_metrics()
 
     @property
     def general(self) -> PersistentDict:
@@ -171,9 +253,11 @@ class Storage:
         if not helpers.is_pytest():
             context.client.storage.clear()
         self._tabs.clear()
-        for filepath in self.path.glob('storage-*.json'):
+        if Storage.backend == 'sqlite':
+            SqlitePersistentDict.delete_all(Storage.path / 'storage.sqlite')
+        for filepath in [*self.path.glob('storage-*.json'), *self.path.glob('storage-*.journal')]:
             filepath.unlink()
-        if self.path.exists():
+        if self.path.exists() and not any(self.path.iterdir()):
             self.path.rmdir()
 
     async def on_shutdown(self) -> None:
@@ -181,3 +265,4 @@ class Storage:
         for user in self._users.values():
             await user.close()
         await self._general.close()
+        await SqlitePersistentDict.close_all()
@@ -14,6 +14,7 @@ T = TypeVar('T', bound='Element')
 class Style(ObservableDict, Generic[T]):
 
     def __init__(self, *args, element: T, **kwargs) -> None:
+        self._changed = False
         super().__init__(*args, on_change=self._update, **kwargs)
         self._element = weakref.ref(element)
         self._suspend_count = 0
@@ -36,11 +37,18 @@ class Style(ObservableDict, Generic[T]):
         return element
 
     def _update(self) -> None:
+        self._changed = True
         if self._suspend_count > 0:
             return
         element = self._element()
         if element is not None:
-            element.update()
+            element._update_partially()  # pylint: disable=protected-access
+
+    def _pop_changes(self) -> bool:
+        """Return whether the style changed since the last call and reset the change tracking."""
+        changed = self._changed
+        self._changed = False
+        return changed
 
     def __call__(self,
                  add: Optional[str] = None, *,
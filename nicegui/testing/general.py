@@ -5,7 +5,7 @@ from copy import copy
 
 from starlette.routing import Route
 
-from .. import app, binding, core, event, run, ui
+from .. import app, binding, core, event, outbox, run, ui
 from ..client import Client
 
 
@@ -21,6 +21,12 @@ def prepare_simulation() -> None:
         binding_refresh_interval=0.1,
         reconnect_timeout=3.0,
         message_history_length=1000,
+        message_history_size=10_000_000,
+        message_history_total_size=200_000_000,
+        message_batch_size=100_000,
+        message_buffer_size=None,  # NOTE: simulated clients do not acknowledge messages
+        message_compression_threshold=None,
+        socket_encoding='json',
         tailwind=True,
         prod_js=True,
         show_welcome_message=False,
@@ -53,6 +59,7 @@ def nicegui_reset_globals():
     Client.page_routes.clear()
     app.reset()
     binding.reset()
+    outbox.reset()
 
     gc.collect()
 
@@ -58,6 +58,12 @@ def run(root: Optional[Callable] = None, *,
         binding_refresh_interval: Optional[float] = 0.1,
         reconnect_timeout: float = 3.0,
         message_history_length: int = 1000,
+        message_history_size: int = 10_000_000,
+        message_history_total_size: int = 200_000_000,
+        message_batch_size: int = 100_000,
+        message_buffer_size: Optional[int] = None,
+        message_compression_threshold: Optional[int] = None,
+        socket_encoding: Literal['json', 'msgpack'] = 'json',
         cache_control_directives: str = 'public, max-age=31536000, immutable, stale-while-revalidate=31536000',
         fastapi_docs: Union[bool, DocsConfig] = False,
         show: bool = True,
@@ -95,6 +101,12 @@ def run(root: Optional[Callable] = None, *,
     :param binding_refresh_interval: interval for updating active links (default: 0.1 seconds, bigger is more CPU friendly, *since version 3.4.0*: can be ``None`` to disable update loop)
     :param reconnect_timeout: maximum time the server waits for the browser to reconnect (default: 3.0 seconds)
     :param message_history_length: maximum number of messages that will be stored and resent after a connection interruption (default: 1000, use 0 to disable, *added in version 2.9.0*)
+    :param message_history_size: maximum number of bytes of encoded messages that will be stored per client and resent after a connection interruption (default: 10,000,000 bytes, *added in version 3.5.0*)
+    :param message_history_total_size: maximum number of bytes of encoded messages that will be stored for all clients together (default: 200,000,000 bytes, *added in version 3.5.0*)
+    :param message_batch_size: maximum number of bytes of messages that are combined into a single socket.io packet (default: 100,000 bytes, use 0 to disable batching, *added in version 3.5.0*)
+    :param message_buffer_size: maximum number of bytes sent to a client without acknowledgement before further messages are held back and coalesced (default: `None`, backpressure disabled, *added in version 3.5.0*)
+    :param message_compression_threshold: minimum number of bytes of a message to compress it for browsers supporting it (default: `None`, compression disabled, *added in version 3.5.0*)
+    :param socket_encoding: encoding of messages sent to the browser, `'msgpack'` sends binary frames with NumPy arrays as raw buffers and requires the msgpack package (default: `'json'`, *added in version 3.5.0*)
     :param cache_control_directives: cache control directives for internal static files (default: `'public, max-age=31536000, immutable, stale-while-revalidate=31536000'`)
     :param fastapi_docs: enable FastAPI's automatic documentation with Swagger UI, ReDoc, and OpenAPI JSON (bool or dictionary as described `here <https://fastapi.tiangolo.com/tutorial/metadata/>`_, default: `False`, *updated in version 2.9.0*)
     :param show: automatically open the UI in a browser tab (default: `True`)
@@ -161,6 +173,12 @@ def run(root: Optional[Callable] = None, *,
         binding_refresh_interval=binding_refresh_interval,
         reconnect_timeout=reconnect_timeout,
         message_history_length=message_history_length,
+        message_history_size=message_history_size,
+        message_history_total_size=message_history_total_size,
+        message_batch_size=message_batch_size,
+        message_buffer_size=message_buffer_size,
+        message_compression_threshold=message_compression_threshold,
+        socket_encoding=socket_encoding,
         cache_control_directives=cache_control_directives,
         tailwind=tailwind,
         prod_js=prod_js,
@@ -1,11 +1,15 @@
+import asyncio
 import copy
+import time
 import weakref
+from types import SimpleNamespace
 from typing import Optional
 
 import pytest
 from selenium.webdriver.common.keys import Keys
 
 from nicegui import binding, ui
+from nicegui.observables import ObservableDict, ObservableList
 from nicegui.testing import Screen, User
 
 
@@ -146,7 +150,7 @@ def test_bindable_dataclass(screen: Screen):
 
     assert len(binding.bindings) == 2
     assert len(binding.active_links) == 1
-    assert binding.active_links[0][1] == 'not_bindable'
+    assert next(iter(binding.active_links.values()))[1] == 'not_bindable'
 
 
 async def test_copy_instance_with_bindable_property(user: User):
@@ -288,3 +292,424 @@ def test_binding_refresh_interval_none(screen: Screen):
     screen.assert_py_logger(
         'WARNING', 'Starting active binding loop even though it was disabled via binding_refresh_interval=None.',
     )
+
+
+async def test_observable_source_is_not_polled(user: User):
+    data = ObservableDict({'a': 'A', 'nested': {'b': 'B'}})
+    other = ObservableDict({'c': 'C'})
+    calls: list[str] = []
+
+    def transform(value):
+        calls.append(str(value))
+        return str(value)
+
+    @ui.page('/')
+    def page():
+        ui.label().bind_text_from(data, 'a', transform)
+        ui.label().bind_text_from(other, 'c', transform)
+
+    await user.open('/')
+    await user.should_see('A')
+    assert len(binding.active_links) == 0
+    assert len(binding.observed_links) == 2
+
+    calls.clear()
+    binding._refresh_step()  # pylint: disable=protected-access
+    assert not calls, 'unchanged sources should not be visited'
+
+    data['a'] = 'AA'
+    binding._refresh_step()  # pylint: disable=protected-access
+    assert calls == ['AA']
+    await user.should_see('AA')
+
+    calls.clear()
+    data['nested']['b'] = 'BB'
+    binding._refresh_step()  # pylint: disable=protected-access
+    assert calls == ['AA'], 'nested changes should mark the source as dirty'
+
+
+def test_observation_is_dropped_with_last_link():
+    binding.reset()
+    data = ObservableDict({'a': 'A'})
+    target_a = SimpleNamespace(text='')
+    target_b = SimpleNamespace(text='')
+    binding.bind_from(target_a, 'text', data, 'a')
+    binding.bind_from(target_b, 'text', data, 'a')
+    handlers = data._change_handlers  # pylint: disable=protected-access
+    assert len(handlers) == 1
+
+    binding.remove([target_a])
+    assert len(handlers) == 1, 'the source is still observed by the other link'
+
+    binding.remove([target_b])
+    assert not handlers, 'the hook is removed with the last observed link'
+    data['a'] = 'AA'
+    assert not binding._dirty_sources  # pylint: disable=protected-access
+
+
+def test_reset_clears_observation_state():
+    data = ObservableDict({'a': 'A'})
+    binding.bind_from(SimpleNamespace(text=''), 'text', data, 'a')
+    binding._poll_position = 3  # pylint: disable=protected-access
+    binding._poll_round = 5  # pylint: disable=protected-access
+
+    binding.reset()
+    assert not data._change_handlers  # pylint: disable=protected-access
+    assert not binding._observed_sources  # pylint: disable=protected-access
+    assert binding._poll_position == 0  # pylint: disable=protected-access
+    assert binding._poll_round == 0  # pylint: disable=protected-access
+
+
+async def test_object_with_change_hook(user: User):
+    class Model:
+        def __init__(self) -> None:
+            self._callbacks = []
+            self._value = 'first'
+
+        def on_binding_change(self, callback) -> None:
+            self._callbacks.append(callback)
+
+        @property
+        def value(self) -> str:
+            return self._value
+
+        @value.setter
+        def value(self, value: str) -> None:
+            self._value = value
+            for callback in self._callbacks:
+                callback()
+
+    model = Model()
+
+    @ui.page('/')
+    def page():
+        ui.label().bind_text_from(model, 'value')
+        ui.label().bind_text_from(model, 'value', lambda v: f'{v}!')
+
+    await user.open('/')
+    await user.should_see('first!')
+    assert len(binding.active_links) == 0
+    assert len(model._callbacks) == 1  # pylint: disable=protected-access
+
+    model.value = 'second'
+    await user.should_see('second!')
+
+    binding.remove([model])
+    assert len(binding.observed_links) == 0
+    model.value = 'third'
+    binding._refresh_step()  # pylint: disable=protected-access
+    await user.should_see('second!')
+
+
+async def test_unset_bindable_property_is_not_polled(user: User):
+    class Model:
+        value = binding.BindableProperty()
+
+    model = Model()
+
+    @ui.page('/')
+    def page():
+        ui.label().bind_text_from(model, 'value', lambda v: f'value={v}', strict=False)
+        model.value = 1
+
+    await user.open('/')
+    await user.should_see('value=1')
+    assert len(binding.active_links) == 0
+
+
+def test_remove_only_affects_bindings_of_given_objects():
+    class Model:
+        value = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.value = 0
+            self.text = ''
+
+    binding.reset()
+    source = {'x': 1}
+    models = [Model() for _ in range(3)]
+    for model in models:
+        binding.bind_from(model, 'text', source, 'x', str)
+        binding.bind_to(model, 'value', source, f'v{id(model)}')
+    binding.bind(models[0], 'value', models[1], 'value')
+    assert len(binding.active_links) == 3
+    assert len(binding.bindings) == 4
+
+    binding.remove([models[1]])
+    assert len(binding.active_links) == 2
+    assert len(binding.bindings) == 3
+    assert id(models[1]) not in binding._object_links  # pylint: disable=protected-access
+    models[0].value = 42
+    assert source[f'v{id(models[0])}'] == 42
+    assert models[1].value == 0
+
+    binding.remove([models[0], models[2]])
+    assert not binding.active_links
+    assert not binding.bindings
+    assert not binding._links  # pylint: disable=protected-access
+    assert not binding._object_links  # pylint: disable=protected-access
+
+
+def test_batch_propagates_each_source_once():
+    class Model:
+        a = binding.BindableProperty()
+        b = binding.BindableProperty()
+        c = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.a = 0
+            self.b = 0
+            self.c = 0
+
+    binding.reset()
+    model = Model()
+    calls: list[str] = []
+    binding.bind_to(model, 'a', model, 'b', lambda a: calls.append(f'a={a}') or a * 10)
+    binding.bind_to(model, 'b', model, 'c', lambda b: calls.append(f'b={b}') or b + 1)
+    calls.clear()
+
+    with binding.batch():
+        model.b = 5
+        for i in range(1, 4):
+            model.a = i
+        with binding.batch():
+            model.a = 4
+        assert not calls
+        assert model.c == 1
+    assert calls == ['a=4', 'b=40']
+    assert (model.a, model.b, model.c) == (4, 40, 41)
+
+
+async def test_batch_decorator():
+    data = {'value': 0}
+
+    class Model:
+        value = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.value = 0
+
+    binding.reset()
+    model = Model()
+    binding.bind_to(model, 'value', data, 'value')
+
+    @binding.batch()
+    def update_sync() -> None:
+        model.value = 1
+        assert data['value'] == 0
+
+    @binding.batch()
+    async def update_async() -> None:
+        model.value = 2
+        await asyncio.sleep(0)
+        assert data['value'] == 1
+
+    update_sync()
+    assert data['value'] == 1
+    await update_async()
+    assert data['value'] == 2
+
+
+def test_batch_propagates_changes_made_by_change_handlers():
+    class Model:
+        x = binding.BindableProperty(on_change=lambda obj, x: setattr(obj, 'x', min(x, 10)))
+        y = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.x = 0
+            self.y = 0
+
+    binding.reset()
+    model = Model()
+    data: dict = {}
+    binding.bind_to(model, 'y', model, 'x')
+    binding.bind_to(model, 'x', data, 'x')
+
+    with binding.batch():
+        model.y = 20
+    assert model.x == 10
+    assert data['x'] == 10
+
+
+async def test_computed_property(user: User):
+    class Form:
+        first = binding.BindableProperty()
+        last = binding.BindableProperty()
+        tags = binding.BindableProperty()
+        other = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.first = 'Ada'
+            self.last = 'Lovelace'
+            self.tags = ObservableList(['math'])
+            self.other = 0
+
+        @binding.computed
+        def full_name(self) -> str:
+            calls.append('full_name')
+            return f'{self.first} {self.last}'
+
+        @binding.computed
+        def initials(self) -> str:
+            calls.append('initials')
+            return ''.join(part[0] for part in self.full_name.split())
+
+        @binding.computed
+        def tag_count(self) -> int:
+            return len(self.tags)
+
+    calls: list[str] = []
+    form = Form()
+
+    @ui.page('/')
+    def page():
+        ui.label().bind_text_from(form, 'full_name')
+        ui.label().bind_text_from(form, 'initials', lambda i: f'initials: {i}')
+        ui.label().bind_text_from(form, 'tag_count', lambda n: f'{n} tags')
+
+    await user.open('/')
+    await user.should_see('Ada Lovelace')
+    await user.should_see('initials: AL')
+    await user.should_see('1 tags')
+    assert not binding.active_links
+
+    calls.clear()
+    form.other = 1
+    assert not calls, 'unrelated changes should not re-evaluate computed properties'
+    assert form.full_name == 'Ada Lovelace'
+    assert not calls, 'values should be cached'
+
+    form.first = 'Alan'
+    assert calls == ['full_name', 'initials']
+    await user.should_see('Alan Lovelace')
+    await user.should_see('initials: AL')
+
+    calls.clear()
+    form.last = 'Turing'
+    await user.should_see('Alan Turing')
+    await user.should_see('initials: AT')
+
+    form.tags.append('logic')
+    await user.should_see('2 tags')
+
+    with pytest.raises(AttributeError):
+        form.full_name = 'Grace Hopper'
+
+
+def test_refresh_step_respects_time_budget():
+    binding.reset()
+    polled: list[int] = []
+
+    def slow_transform(value: int) -> int:
+        polled.append(value)
+        time.sleep(0.001)
+        return value
+
+    sources = [{'x': i} for i in range(20)]
+    targets = [{'x': None} for _ in range(20)]
+    for source, target in zip(sources, targets):
+        binding.bind_to(source, 'x', target, 'x', slow_transform)
+    polled.clear()
+
+    binding._refresh_step(0.005)  # pylint: disable=protected-access
+    assert 0 < len(polled) < 20
+    while len(polled) < 20:
+        binding._refresh_step(0.005)  # pylint: disable=protected-access
+    assert sorted(polled) == list(range(20)), 'each link should be polled once per round'
+
+
+def test_refresh_backoff_for_unchanged_links():
+    binding.reset()
+    source = {'x': 0}
+    target: dict = {}
+    calls: list[int] = []
+    binding.bind_to(source, 'x', target, 'x', lambda x: calls.append(x) or x)
+
+    def poll_rounds(count: int) -> int:
+        calls.clear()
+        for _ in range(count):
+            binding._refresh_step(1.0)  # pylint: disable=protected-access
+        return len(calls)
+
+    assert poll_rounds(8) < 8, 'unchanged links should be polled less often'
+    assert poll_rounds(2 * binding.MAX_REFRESH_BACKOFF) >= 2, 'backoff should be limited'
+
+    source['x'] = 1
+    poll_rounds(binding.MAX_REFRESH_BACKOFF)
+    assert target['x'] == 1
+
+    binding._refresh_step()  # pylint: disable=protected-access
+    source['x'] = 2
+    binding._refresh_step()  # pylint: disable=protected-access
+    assert target['x'] == 2, 'a full refresh should poll all links'
+
+
+async def test_binding_profiler(user: User, caplog: pytest.LogCaptureFixture):
+    class Model:
+        value = binding.BindableProperty()
+
+        def __init__(self) -> None:
+            self.value = 0
+
+    def slow_transform(value: int) -> str:
+        time.sleep(0.002)
+        return f'slow {value}'
+
+    model = Model()
+    data = {'count': 0}
+    label = None
+
+    @ui.page('/')
+    def page():
+        nonlocal label
+        label = ui.label().bind_text_from(model, 'value', slow_transform)
+        ui.label().bind_text_from(data, 'count', str)
+
+    binding.start_profiling()
+    await user.open('/')
+    model.value = 1
+    model.value = 2
+    data['count'] = 1
+    binding._refresh_step()  # pylint: disable=protected-access
+    await user.should_see('slow 2')
+
+    report = binding.get_profile_report()
+    assert report[0].source == 'Model.value'
+    assert report[0].target == f'Label(id={label.id}).text'
+    assert report[0].evaluations == 3
+    assert report[0].changes == 3
+    assert report[0].transform_time >= 0.006
+    assert any(stats.source == "dict['count']" for stats in report)
+    assert binding.get_profile_report(sort_by='changes', limit=1)[0].changes == 3
+
+    with caplog.at_level('INFO', logger='nicegui'):
+        binding.log_profile_report(limit=1)
+    assert 'Model.value -> Label' in caplog.text
+
+    binding.stop_profiling()
+    assert binding.get_profile_report() == []
+
+
+def test_bindable_properties_registry():
+    class Model:
+        a = binding.BindableProperty()
+        b = binding.BindableProperty()
+
+    binding.reset()
+    model = Model()
+    with pytest.raises(AttributeError, match="'Model' object has no attribute 'a'"):
+        _ = model.a
+    assert not binding.bindable_properties
+
+    model.a = 1
+    assert (id(model), 'a') in binding.bindable_properties
+    assert (id(model), 'b') not in binding.bindable_properties
+    assert binding.bindable_properties[(id(model), 'a')] is model
+
+    model_copy = copy.copy(model)
+    model.b = 2
+    assert set(binding.bindable_properties) == {(id(model), 'a'), (id(model), 'b'), (id(model_copy), 'a')}
+
+    model_id = id(model)
+    del model
+    assert all(obj_id != model_id for obj_id, _ in binding.bindable_properties)
@@ -0,0 +1,50 @@
+import asyncio
+
+from nicegui import app, ui
+from nicegui.metrics import Histogram, OutboxMetrics
+from nicegui.testing import User
+
+
+def test_histogram():
+    histogram = Histogram((1.0, 2.0))
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.to_dict() == {'count': 4, 'sum': 6.0, 'buckets': {1.0: 2, 2.0: 1, float('inf'): 1}}
+
+
+def test_merge_outbox_metrics():
+    a = OutboxMetrics(emitted_packets=1)
+    a.flush_duration.observe(0.01)
+    b = OutboxMetrics(emitted_packets=2)
+    b.flush_duration.observe(0.02)
+    a.merge(b)
+    assert a.emitted_packets == 3
+    assert a.flush_duration.count == 2
+
+
+async def test_outbox_metrics(user: User):
+    @ui.page('/')
+    def page():
+        label = ui.label('Hello')
+        ui.button('Change', on_click=lambda: label.set_text('Hi!'))
+
+    await user.open('/')
+    before = user.client.metrics
+    user.find('Change').click()
+    await asyncio.sleep(0.1)
+    after = user.client.metrics
+    assert after['enqueued_updates'] == before['enqueued_updates'] + 1
+    assert after['emitted_messages'] == before['emitted_messages'] + 1
+    assert after['emitted_bytes'] > before['emitted_bytes']
+    assert after['flush_duration']['count'] > before['flush_duration']['count']
+    assert after['queue_depth'] == 0
+    assert after['history_bytes'] > 0
+
+    metrics = app.metrics
+    assert metrics['outboxes'] >= 1
+    assert metrics['emitted_bytes'] >= after['emitted_bytes']
+    assert metrics['history_bytes'] >= after['history_bytes']
+
+    user.client.outbox.prune_history(user.client.outbox.next_message_id)
+    assert user.client.metrics['ack_lag']['count'] > 0
+    assert user.client.metrics['in_flight_bytes'] == 0
@@ -0,0 +1,35 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from nicegui import json, optional_features
+
+if optional_features.has('msgpack'):
+    from nicegui.json.msgpack_wrapper import pack_batch, packb, unpackb
+
+
+@pytest.mark.skipif(not optional_features.has('msgpack'), reason='requires the msgpack library.')
+@pytest.mark.parametrize('value', [
+    None,
+    'text',
+    True,
+    1.5,
+    [1, 'a', None],
+    {'key1': 'value1', 'key2': 1},
+    date(2020, 1, 31),
+    datetime(2020, 1, 31, 12, 59, 59, 123456),
+    np.array([1.5, 2.5], dtype=np.float32),
+    np.arange(6, dtype=np.int16).reshape(2, 3),
+    np.arange(4).reshape(2, 1, 2),
+    np.array([True, False]),
+    np.float64(3.5),
+])
+def test_msgpack_matches_json(value):
+    assert unpackb(packb(value)) == json.loads(json.dumps(value))
+
+
+@pytest.mark.skipif(not optional_features.has('msgpack'), reason='requires the msgpack library.')
+def test_pack_batch():
+    items = [(f'type{i}', packb({'index': i})) for i in range(20)]
+    assert unpackb(pack_batch(items)) == {'messages': [[f'type{i}', {'index': i}] for i in range(20)]}
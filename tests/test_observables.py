@@ -2,7 +2,7 @@ import asyncio
 import copy
 
 from nicegui import ui
-from nicegui.observables import ObservableDict, ObservableList, ObservableSet
+from nicegui.observables import ObservableDict, ObservableList, ObservableSet, PatchAccumulator
 from nicegui.testing import Screen, User
 
 # pylint: disable=global-statement
@@ -130,6 +130,120 @@ def test_nested_observables():
     assert count == 6
 
 
+def test_change_paths():
+    changes = []
+    data = ObservableDict({'a': 1, 'b': [1, 2, {'x': 1}]}, on_change=lambda e: changes.append((e.op, e.path, e.value)))
+    data['a'] = 2
+    del data['a']
+    data['b'].append(3)
+    data['b'].insert(-1, 0)
+    data['b'][2]['x'] = 2
+    data['b'].extend([4, 5])
+    data['b'].pop(0)
+    data['b'][1:3] = [6]
+    data.pop('missing')
+    assert changes == [
+        ('set', ('a',), 2),
+        ('delete', ('a',), None),
+        ('append', ('b', 3), 3),
+        ('insert', ('b', 3), 0),
+        ('set', ('b', 2, 'x'), 2),
+        ('extend', ('b', 5), [4, 5]),
+        ('delete', ('b', 0), None),
+        ('slice', ('b', slice(1, 3)), [6]),
+    ]
+
+
+def test_change_paths_of_added_observables():
+    changes = []
+    inner = ObservableList([1, 2])
+    data = ObservableDict({'a': inner}, on_change=lambda e: changes.append((e.sender, e.path)))
+    inner.append(3)
+    assert changes == [(inner, ('a', 2))]
+
+
+def test_lazy_wrapping():
+    reset_counter()
+    rows = [{'id': i, 'tags': ['a']} for i in range(3)]
+    data = ObservableDict({'rows': rows}, on_change=increment_counter)
+    assert not isinstance(dict.__getitem__(data, 'rows'), ObservableList)
+
+    data['rows'][1]['tags'].append('b')
+    assert count == 1
+    assert isinstance(list.__getitem__(data['rows'], 1), ObservableDict)
+    assert not isinstance(list.__getitem__(data['rows'], 0), ObservableDict)
+    assert all(isinstance(row, ObservableDict) for row in data['rows'])
+    assert data == {'rows': [{'id': 0, 'tags': ['a']}, {'id': 1, 'tags': ['a', 'b']}, {'id': 2, 'tags': ['a']}]}
+
+
+def test_no_aliasing_of_added_containers():
+    reset_counter()
+    inner = {'tags': ['a']}
+    data = ObservableDict({'a': inner}, on_change=increment_counter)
+    data['b'] = inner
+    data.setdefault('c', []).append(1)
+    inner['tags'].append('b')
+    inner['x'] = 1
+    assert data == {'a': {'tags': ['a']}, 'b': {'tags': ['a']}, 'c': [1]}
+    assert count == 3
+
+    items = [[1]]
+    data = ObservableList(items, on_change=increment_counter)
+    data.append(items[0])
+    items[0].append(2)
+    assert data == [[1], [1]]
+
+
+def test_copy_does_not_expose_internal_containers():
+    reset_counter()
+    data = ObservableDict({'a': {'b': 1}, 'c': [1]}, on_change=increment_counter)
+    copied = data.copy()
+    assert type(copied) is dict  # pylint: disable=unidiomatic-typecheck
+    copied['a']['b'] = 2
+    copied['c'].append(2)
+    assert count == 2
+    assert data == {'a': {'b': 2}, 'c': [1, 2]}
+
+    data = ObservableList([{'a': 1}], on_change=increment_counter)
+    data.copy()[0]['a'] = 2
+    assert count == 3
+    assert data == [{'a': 2}]
+
+
+def test_builtin_copies_wrap_nested_containers():
+    reset_counter()
+    data = ObservableDict({'a': {'b': [1]}}, on_change=increment_counter)
+    dict(data)['a']['b'].append(2)
+    {**data}['a']['b'].append(3)
+    (data | {})['a']['b'].append(4)
+    assert count == 3
+    assert data == {'a': {'b': [1, 2, 3, 4]}}
+
+    data = ObservableList([[1]], on_change=increment_counter)
+    (data + [])[0].append(2)
+    list(data)[0].append(3)
+    assert count == 5
+    assert data == [[1, 2, 3]]
+
+
+def test_patch_accumulator():
+    data = ObservableDict({'a': {'b': [1, 2]}, 'c/d': 1})
+    patches = PatchAccumulator(data)
+    data['a']['b'].append(3)
+    data['a']['b'][0] = 0
+    del data['c/d']
+    data.update(e={'f': 1})
+    data['a']['b'].sort(reverse=True)
+    assert patches.pop() == [
+        {'op': 'add', 'path': '/a/b/2', 'value': 3},
+        {'op': 'replace', 'path': '/a/b/0', 'value': 0},
+        {'op': 'remove', 'path': '/c~1d'},
+        {'op': 'add', 'path': '/e', 'value': {'f': 1}},
+        {'op': 'replace', 'path': '/a/b', 'value': [3, 2, 0]},
+    ]
+    assert patches.pop() == []
+
+
 def test_async_handler(screen: Screen):
     reset_counter()
     data = ObservableList(on_change=increment_counter_slowly)
@@ -178,3 +292,77 @@ async def test_no_infinite_recursion(user: User):
 
     await user.open('/')
     await user.should_see('[1, 2, 3, 1, 2, 3]')
+
+
+def test_batch():
+    changes = []
+    data = ObservableDict({'a': [1]}, on_change=changes.append)
+    with data.batch():
+        data['b'] = 2
+        for i in range(3):
+            data['a'].append(i)
+    assert len(changes) == 1
+    assert changes[0].op == 'batch'
+    assert [(change.op, change.path, change.value) for change in changes[0].value] == [
+        ('set', ('b',), 2),
+        ('append', ('a', 1), 0),
+        ('append', ('a', 2), 1),
+        ('append', ('a', 3), 2),
+    ]
+
+    with data.batch():
+        pass
+    assert len(changes) == 1
+
+
+def test_nested_batch():
+    changes = []
+    data = ObservableDict({'a': {'b': [1]}}, on_change=changes.append)
+    inner = data['a']['b']
+    with data.batch():
+        with inner.batch():
+            inner.append(2)
+        data['c'] = 3
+    assert len(changes) == 1
+    assert [(change.op, change.path) for change in changes[0].value] == [('batch', ('a', 'b')), ('set', ('c',))]
+
+
+def test_patch_accumulator_with_batch():
+    data = ObservableDict({'a': [1, 2]})
+    patches = PatchAccumulator(data)
+    with data['a'].batch():
+        data['a'].append(3)
+        data['a'][0] = 0
+    assert patches.pop() == [
+        {'op': 'add', 'path': '/a/2', 'value': 3},
+        {'op': 'replace', 'path': '/a/0', 'value': 0},
+    ]
+    with data['a'].batch():
+        data['a'].append(4)
+        data['a'].sort(reverse=True)
+    assert patches.pop() == [{'op': 'replace', 'path': '/a', 'value': [4, 3, 2, 0]}]
+
+
+def test_handler_registered_on_parent_after_change():
+    reset_counter()
+    data = ObservableDict({'a': [1]})
+    data['a'].append(2)
+    data.on_change(increment_counter)
+    data['a'].append(3)
+    assert count == 1
+    assert data.change_handlers == [increment_counter]
+
+
+def test_registering_a_handler_keeps_unrelated_chains():
+    reset_counter()
+    data = ObservableDict({'a': {'b': 1}})
+    other = ObservableList()
+    data['a']['b'] = 2
+    chain = data['a']._handler_chain()  # pylint: disable=protected-access
+    other.on_change(increment_counter)
+    assert data['a']._handler_chain() is chain  # pylint: disable=protected-access
+
+    data['a'].on_change(increment_counter)
+    assert data['a']._handler_chain() is not chain  # pylint: disable=protected-access
+    data['a']['b'] = 3
+    assert count == 1
@@ -1,7 +1,33 @@
 import asyncio
+import zlib
+from typing import Any, Callable
 
-from nicegui import app, ui
-from nicegui.testing import Screen
+import numpy as np
+import pytest
+
+from nicegui import app, core, json, ui
+from nicegui import outbox as outbox_module
+from nicegui.outbox import compression_stats
+from nicegui.testing import Screen, User
+
+Emitted = list[tuple[str, Any, Any]]
+
+
+@pytest.fixture
+def emitted(monkeypatch: pytest.MonkeyPatch) -> Emitted:
+    """Record event, data and room of all packets emitted via Socket.IO.
+
+    JSON data is recorded as it is received by the browser, binary payloads are kept as they are.
+    """
+    packets: Emitted = []
+    original_emit = core.sio.emit
+
+    async def emit(event, data=None, room=None, **kwargs):
+        is_binary = isinstance(data, dict) and any(isinstance(value, bytes) for value in data.values())
+        packets.append((event, data if is_binary else json.loads(json.dumps(data)), room))
+        await original_emit(event, data, room=room, **kwargs)
+    monkeypatch.setattr(core.sio, 'emit', emit)
+    return packets
 
 
 def test_removing_outbox_loops(screen: Screen):
@@ -26,3 +52,307 @@ def test_removing_outbox_loops(screen: Screen):
     screen.should_contain('Index page')
     screen.wait(0.5)  # wait for the outbox loop to finish
     assert state['count'] == 1
+
+
+async def test_prop_changes_are_sent_as_patches(user: User):
+    messages: list[tuple[str, dict]] = []
+
+    @ui.page('/')
+    def page():
+        ui.table(rows=[{'id': i} for i in range(100)]).props('dense').classes('w-full')
+
+    await user.open('/')
+    table = user.find(ui.table).elements.pop()
+    original_emit = user.client.outbox._emit
+
+    async def emit(message):
+        messages.append((message[1], message[2]))
+        await original_emit(message)
+    user.client.outbox._emit = emit
+
+    table.props['flat'] = True
+    del table.props['dense']
+    table.classes('p-4')
+    await asyncio.sleep(0.1)
+    assert len(messages) == 1
+    assert messages[0][0] == 'patch'
+    assert messages[0][1][table.id] == {'class': ['w-full', 'p-4'], 'props': {'flat': True}, 'removed_props': ['dense']}
+
+    messages.clear()
+    table.rows[0]['id'] = 42
+    await asyncio.sleep(0.1)
+    assert list(messages[0][1][table.id]['props']) == ['rows']
+
+    messages.clear()
+    table.update()
+    await asyncio.sleep(0.1)
+    assert messages[0][0] == 'update'
+
+
+async def test_prop_changes_call_overridden_update(user: User):
+    class CustomElement(ui.element):
+        def __init__(self) -> None:
+            super().__init__()
+            self.update_count = 0
+
+        def update(self) -> None:
+            self.update_count += 1
+            super().update()
+
+    messages: list[str] = []
+
+    @ui.page('/')
+    def page():
+        CustomElement()
+
+    await user.open('/')
+    element = user.find(CustomElement).elements.pop()
+    original_emit = user.client.outbox._emit
+
+    async def emit(message):
+        messages.append(message[1])
+        await original_emit(message)
+    user.client.outbox._emit = emit
+
+    element.update_count = 0
+    element.props['flat'] = True
+    element.classes('p-4')
+    element.style('color: red')
+    await asyncio.sleep(0.1)
+    assert element.update_count > 0
+    assert messages == ['update']
+
+
+async def test_identical_messages_are_emitted_once(create_user: Callable[[], User], emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    user1 = create_user()
+    user2 = create_user()
+    await user1.open('/')
+    await user2.open('/')
+
+
+    for client in (user1.client, user2.client):
+        client.outbox.enqueue_message('notify', {'message': 'Hi all!'}, client.id)
+    await asyncio.sleep(0.1)
+    assert len(emitted) == 1
+    assert sorted(emitted[0][2]) == sorted([user1.client.id, user2.client.id])
+    assert user1.client.outbox.next_message_id == emitted[0][1]['_id'] + 1
+    assert user2.client.outbox.next_message_id == emitted[0][1]['_id'] + 1
+
+
+async def test_messages_are_batched(user: User, monkeypatch: pytest.MonkeyPatch, emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+
+
+    for i in range(3):
+        user.client.outbox.enqueue_message('notify', {'message': f'Hi {i}!'}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert len(emitted) == 1
+    assert emitted[0][0] == 'batch'
+    assert emitted[0][1]['messages'] == [['notify', {'message': f'Hi {i}!'}] for i in range(3)]
+    assert len(json.loads(user.client.outbox.message_history[-1][4])['messages']) == 3
+
+    emitted.clear()
+    monkeypatch.setattr(core.app.config, 'message_batch_size', 0)
+    for i in range(3):
+        user.client.outbox.enqueue_message('notify', {'message': f'Hi {i}!'}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert [event for event, *_ in emitted] == ['notify', 'notify', 'notify']
+
+
+async def test_single_outbox_loop_for_all_clients(user: User):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    for _ in range(3):
+        await user.open('/')
+    assert len([t for t in asyncio.all_tasks() if t.get_name() == 'outbox loop']) == 1
+
+
+async def test_lagging_client_is_held_back_and_coalesced(user: User, monkeypatch: pytest.MonkeyPatch, emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+    outbox = user.client.outbox
+
+    monkeypatch.setattr(core.app.config, 'message_buffer_size', 10)
+
+    outbox.enqueue_message('notify', {'message': 'first'}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert len(emitted) == 1
+    assert outbox.is_lagging
+
+    for i in range(3):
+        outbox.enqueue_message('notify', {'message': f'position {i}'}, user.client.id, coalesce_key='position')
+    outbox.enqueue_message('notify', {'message': 'last'}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert len(emitted) == 1
+
+    outbox.prune_history(outbox.next_message_id)
+    assert not outbox.is_lagging
+    await asyncio.sleep(0.1)
+    assert len(emitted) == 2
+    assert emitted[1][1]['messages'] == [['notify', {'message': 'position 2'}], ['notify', {'message': 'last'}]]
+
+
+async def test_backpressure_is_disabled_by_default(user: User, monkeypatch: pytest.MonkeyPatch):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+    outbox = user.client.outbox
+    monkeypatch.setattr(core.app.config, 'message_batch_size', 0)
+
+    for i in range(3):
+        outbox.enqueue_message('notify', {'message': f'Hi {i}!' * 1000}, user.client.id)
+        await asyncio.sleep(0.01)
+    assert core.app.config.message_buffer_size is None
+    assert outbox.in_flight_bytes > 0
+    assert not outbox.is_lagging
+    assert outbox.queue_depth == 0
+
+    monkeypatch.setattr(core.app.config, 'message_history_length', 2)
+    emitted_before = outbox.metrics.emitted_packets
+    for i in range(3):
+        outbox.enqueue_message('notify', {'message': f'position {i}'}, user.client.id, coalesce_key='position')
+    await asyncio.sleep(0.1)
+    assert outbox.metrics.emitted_packets == emitted_before + 3, 'messages are not coalesced without lagging'
+    assert len(outbox._in_flight) == 2, 'only recent packets are tracked'  # pylint: disable=protected-access
+
+
+async def test_history_replays_encoded_packets_within_byte_budget(user: User, monkeypatch: pytest.MonkeyPatch,
+                                                                  emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+    outbox = user.client.outbox
+
+    monkeypatch.setattr(core.app.config, 'message_batch_size', 0)
+
+    for i in range(3):
+        outbox.enqueue_message('notify', {'message': f'Hi {i}!'}, user.client.id)
+    await asyncio.sleep(0.1)
+    ids = [data['_id'] for _, data, _ in emitted]
+    assert [entry[0] for entry in outbox.message_history][-3:] == ids
+
+    emitted.clear()
+    outbox.try_rewind(ids[1])
+    await asyncio.sleep(0.1)
+    assert [(event, data) for event, data, _ in emitted] == \
+        [('notify', {'_id': ids[1], 'message': 'Hi 1!'}), ('notify', {'_id': ids[2], 'message': 'Hi 2!'})]
+    assert outbox.next_message_id == ids[2] + 1
+
+    monkeypatch.setattr(core.app.config, 'message_history_size', len(outbox.message_history[-1][4]))
+    outbox.enqueue_message('notify', {'message': 'Hi 3!'}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert len(outbox.message_history) == 1
+    assert outbox.message_history_size == len(outbox.message_history[0][4])
+
+
+async def test_total_history_size_is_a_hard_limit(create_user: Callable[[], User], monkeypatch: pytest.MonkeyPatch):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    user1 = create_user()
+    user2 = create_user()
+    await user1.open('/')
+    await user2.open('/')
+    outbox1 = user1.client.outbox
+    outbox2 = user2.client.outbox
+    monkeypatch.setattr(core.app.config, 'message_batch_size', 0)
+    monkeypatch.setattr(core.app.config, 'message_history_total_size', 200)
+
+    for i in range(20):
+        outbox1.enqueue_message('notify', {'message': f'Hi {i}!'}, user1.client.id)
+        outbox2.enqueue_message('notify', {'message': f'Ho {i}!'}, user2.client.id)
+        await asyncio.sleep(0.01)
+        outbox1.prune_history(outbox1.next_message_id)  # NOTE: acknowledged packets leave the history immediately
+    await asyncio.sleep(0.1)
+    history = outbox_module._history  # pylint: disable=protected-access
+    assert app.metrics['history_bytes'] <= 200
+    assert app.metrics['history_bytes'] == outbox1.message_history_size + outbox2.message_history_size
+    assert app.metrics['history_packets'] == len(outbox1.message_history) + len(outbox2.message_history)
+    assert len(history) == app.metrics['history_packets'], 'no stale entries are kept'
+
+    outbox2.stop()
+    assert app.metrics['history_packets'] == len(outbox1.message_history)
+    assert all(o is not outbox2 for o, _ in history), 'stopped outboxes are purged'
+
+
+async def test_resync_when_history_is_exhausted(user: User, monkeypatch: pytest.MonkeyPatch, emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+    outbox = user.client.outbox
+    label = user.find(ui.label).elements.pop()
+
+    monkeypatch.setattr(core.app.config, 'message_history_length', 1)
+
+    for i in range(3):
+        outbox.enqueue_message('notify', {'message': f'Hi {i}!'}, user.client.id)
+        await asyncio.sleep(0.1)
+    first_id = emitted[0][1]['_id']
+
+    emitted.clear()
+    label.text = 'Hello again'
+    outbox.try_rewind(first_id)
+    await asyncio.sleep(0.1)
+    assert [event for event, *_ in emitted] == ['resync']
+    assert emitted[0][1][str(label.id)]['text'] == 'Hello again'
+
+
+async def test_large_packets_are_compressed(user: User, monkeypatch: pytest.MonkeyPatch, emitted: Emitted):
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+    outbox = user.client.outbox
+
+    monkeypatch.setattr(core.app.config, 'message_compression_threshold', 1000)
+    outbox.supports_compression = True
+
+    outbox.enqueue_message('notify', {'message': 'small'}, user.client.id)
+    await asyncio.sleep(0.1)
+    outbox.enqueue_message('notify', {'message': 'large' * 1000}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert emitted[0][1]['message'] == 'small'
+    assert set(emitted[1][1]) == {'_id', '_deflate'}
+    packet = emitted[1][1]
+    assert json.loads(zlib.decompress(packet['_deflate'])) == {'_id': packet['_id'], 'message': 'large' * 1000}
+    assert compression_stats.packets == 1
+    assert compression_stats.ratio < 0.1
+
+
+async def test_msgpack_encoding(user: User, monkeypatch: pytest.MonkeyPatch, emitted: Emitted):
+    pytest.importorskip('msgpack')
+    from nicegui.json.msgpack_wrapper import unpackb  # pylint: disable=import-outside-toplevel
+
+    @ui.page('/')
+    def page():
+        ui.label('Hello')
+
+    await user.open('/')
+
+    monkeypatch.setattr(core.app.config, 'socket_encoding', 'msgpack')
+
+    user.client.outbox.enqueue_message('notify', {'values': np.arange(3, dtype=np.float32)}, user.client.id)
+    await asyncio.sleep(0.1)
+    assert set(emitted[0][1]) == {'_id', '_msgpack'}
+    assert unpackb(emitted[0][1]['_msgpack']) == {'values': [0.0, 1.0, 2.0]}
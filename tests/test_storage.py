@@ -2,13 +2,19 @@ import asyncio
 import copy
 import time
 from pathlib import Path
+from typing import Callable
 
 import httpx
 import pytest
 
-from nicegui import Client, app, background_tasks, context, core, nicegui, ui
+from nicegui import Client, app, background_tasks, context, core, nicegui, storage, ui
+from nicegui.persistence import file_persistent_dict, sqlite_persistent_dict
 from nicegui.persistence.file_persistent_dict import FilePersistentDict
+from nicegui.persistence.redis_persistent_dict import RedisPersistentDict
+from nicegui.persistence.sqlite_persistent_dict import SqlitePersistentDict
+from nicegui.storage import Storage
 from nicegui.testing import Screen, User
+from nicegui.version import __version__
 
 
 def test_browser_data_is_stored_in_the_browser(screen: Screen):
@@ -354,6 +360,11 @@ async def test_user_storage_is_pruned(screen: Screen):
     def status():
         return 'ok'
 
+    @app.get('/count')
+    def count():
+        app.storage.user['count'] = app.storage.user.get('count', 0) + 1
+        return app.storage.user['count']
+
     screen.ui_run_kwargs['storage_secret'] = 'just a test'
     screen.open('/')
     screen.should_contain('clients: 1')
@@ -365,6 +376,11 @@ async def test_user_storage_is_pruned(screen: Screen):
     assert response.status_code == 200
     assert response.text == '"ok"'
     assert len(Client.instances) == 1
+    assert len(app.storage._users) == 1, 'user storage is only created on access'
+
+    response = httpx.get('http://localhost:3392/count')
+    assert response.status_code == 200
+    assert response.text == '1'
     assert len(app.storage._users) == 2
 
     screen.close()
@@ -374,6 +390,60 @@ async def test_user_storage_is_pruned(screen: Screen):
     assert len(app.storage._users) == 0
 
 
+async def test_user_storage_is_loaded_on_demand(user: User, caplog: pytest.LogCaptureFixture):
+    @ui.page('/')
+    def page():
+        ui.label(f'count: {app.storage.user.get("count", 0)}')
+
+    @app.get('/count')
+    def count():
+        app.storage.user['count'] = app.storage.user.get('count', 0) + 1
+        return app.storage.user['count']
+
+    response = await user.http_client.get(f'/_nicegui/{__version__}/static/favicon.ico')
+    assert response.status_code == 200
+    assert 'set-cookie' not in response.headers, 'asset requests bypass the session handling'
+    assert len(app.storage._users) == 0
+
+    response = await user.http_client.get('/count')
+    assert response.json() == 1
+    assert len(app.storage._users) == 1, 'user storage is loaded on first access'
+
+    await user.open('/')
+    await user.should_see('count: 1')
+    assert len(app.storage._users) == 1
+    assert 'blocks the event loop' not in caplog.text, 'synchronous endpoints load the storage on the event loop'
+
+
+async def test_user_storage_in_async_endpoint_is_loaded_with_warning(user: User, caplog: pytest.LogCaptureFixture):
+    @app.get('/count')
+    async def count():
+        app.storage.user['count'] = app.storage.user.get('count', 0) + 1
+        return app.storage.user['count']
+
+    response = await user.http_client.get('/count')
+    assert response.json() == 1
+    assert len(app.storage._users) == 1
+    assert 'app.storage.user is loaded synchronously for /count, which blocks the event loop' in caplog.text
+
+
+async def test_user_storage_in_upload_handler(user: User):
+    results = []
+
+    @ui.page('/')
+    def page():
+        app.storage.user['name'] = 'Alice'
+        upload = ui.upload(on_upload=lambda _: results.append(app.storage.user['name']))
+        ui.label(upload.props['url']).mark('url')
+
+    await user.open('/')
+    url = user.find('url').elements.pop().text
+    storage.request_contextvar.set(None)  # NOTE: simulated requests run in the context of the test
+    response = await user.http_client.post(url, files={'file': ('test.txt', b'content')})
+    assert response.status_code == 200
+    assert results == ['Alice']
+
+
 async def test_awaiting_backup_scheduled_during_teardown(user: User, tmp_path):
     @ui.page('/')
     def page():
@@ -389,6 +459,321 @@ async def test_awaiting_backup_scheduled_during_teardown(user: User, tmp_path):
     assert path.read_text(encoding='utf-8') == '{"key":"value"}'
 
 
+def test_journal(tmp_path):
+    path = tmp_path / 'storage.json'
+    d = FilePersistentDict(path, encoding='utf-8', journal=True)
+    d.initialize_sync()
+    d['a'] = {'b': [1, 2]}
+    d['a']['b'].append(3)
+    d['c/d'] = 'x'
+    del d['c/d']
+    assert not path.exists(), 'only the journal should be written'
+    assert len(path.with_suffix('.journal').read_text(encoding='utf-8').splitlines()) == 5
+
+    e = FilePersistentDict(path, encoding='utf-8', journal=True)
+    e.initialize_sync()
+    assert e == {'a': {'b': [1, 2, 3]}}
+
+
+async def test_journal_is_written_in_background(user: User, tmp_path):
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    path = tmp_path / 'storage.json'
+    d = FilePersistentDict(path, encoding='utf-8', journal=True)
+    await d.initialize()
+    for i in range(3):
+        d[f'key{i}'] = i
+    await asyncio.sleep(0)  # ensure the task is created
+    await background_tasks.teardown()
+
+    e = FilePersistentDict(path, encoding='utf-8', journal=True)
+    await e.initialize()
+    assert e == {'key0': 0, 'key1': 1, 'key2': 2}
+
+
+def test_journal_compaction(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(file_persistent_dict, 'MIN_COMPACTION_SIZE', 0)
+    path = tmp_path / 'storage.json'
+    d = FilePersistentDict(path, encoding='utf-8', journal=True, compaction_ratio=2)
+    d.initialize_sync()
+    for i in range(10):
+        d['count'] = i
+    assert path.read_text(encoding='utf-8') == '{"count":9}'
+    assert len(path.with_suffix('.journal').read_text(encoding='utf-8').splitlines()) < 10
+
+    e = FilePersistentDict(path, encoding='utf-8', journal=True)
+    e.initialize_sync()
+    assert e == {'count': 9}
+
+
+def test_outdated_journal_is_ignored(tmp_path):
+    path = tmp_path / 'storage.json'
+    d = FilePersistentDict(path, encoding='utf-8', journal=True)
+    d.initialize_sync()
+    d['a'] = 1
+    path.write_text('{"a":2}', encoding='utf-8')
+
+    e = FilePersistentDict(path, encoding='utf-8', journal=True)
+    e.initialize_sync()
+    assert e == {'a': 2}
+
+
+def test_sqlite_storage(tmp_path):
+    path = tmp_path / 'storage.sqlite'
+    a = SqlitePersistentDict(path=path, id='a')
+    b = SqlitePersistentDict(path=path, id='b')
+    a.initialize_sync()
+    b.initialize_sync()
+    a['x'] = {'y': [1, 2]}
+    a['x']['y'].append(3)
+    a[1] = 'one'
+    b['x'] = 'b'
+    del a[1]
+
+    a2 = SqlitePersistentDict(path=path, id='a')
+    a2.initialize_sync()
+    assert a2 == {'x': {'y': [1, 2, 3]}}
+
+    b.clear()
+    b2 = SqlitePersistentDict(path=path, id='b')
+    b2.initialize_sync()
+    assert b2 == {}
+
+
+def test_failing_sqlite_write_does_not_affect_other_writes(tmp_path):
+    database = sqlite_persistent_dict._Database.get(tmp_path / 'storage.sqlite')  # pylint: disable=protected-access
+    failures: list[str] = []
+    database.write('a', {'x': None}, [], on_failure=lambda: failures.append('a'))  # type: ignore[dict-item]
+    database.write('b', {'x': '1'}, [], on_failure=lambda: failures.append('b'))
+    database.sync().result()
+    assert failures == ['a']
+    assert database.read('a').result() == []
+    assert database.read('b').result() == [('x', '1')]
+
+
+def test_failed_sqlite_keys_are_written_again(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / 'storage.sqlite'
+    d = SqlitePersistentDict(path=path, id='d')
+    d.initialize_sync()
+    write = d.database.write
+    monkeypatch.setattr(d.database, 'write', lambda *args, on_failure, **kwargs: on_failure())
+    d['x'] = 1
+    monkeypatch.setattr(d.database, 'write', write)
+    d['y'] = 2
+    d.database.sync().result()
+
+    e = SqlitePersistentDict(path=path, id='d')
+    e.initialize_sync()
+    assert e == {'x': 1, 'y': 2}
+
+
+def test_deleting_all_sqlite_rows_is_queued_in_order(tmp_path):
+    path = tmp_path / 'storage.sqlite'
+    database = sqlite_persistent_dict._Database.get(path)  # pylint: disable=protected-access
+    database.write('a', {'x': '1'}, [])
+    future = SqlitePersistentDict.delete_all(path)
+    database.write('b', {'y': '2'}, [])
+    assert database.read('a').result() == []
+    assert database.read('b').result() == [('y', '2')]
+    assert future.done()
+
+
+async def test_closing_sqlite_databases_stops_writer_threads(tmp_path):
+    path = tmp_path / 'storage.sqlite'
+    d = SqlitePersistentDict(path=path, id='d')
+    await d.initialize()
+    d['x'] = 1
+    await d.close()
+    database = d.database
+
+    await SqlitePersistentDict.close_all()
+    assert not database.thread.is_alive()
+    assert sqlite_persistent_dict._Database.instances == {}  # pylint: disable=protected-access
+    assert not path.with_name('storage.sqlite-wal').exists()
+
+    e = SqlitePersistentDict(path=path, id='d')
+    await e.initialize()
+    assert e == {'x': 1}
+    await SqlitePersistentDict.close_all()
+
+
+def test_unknown_storage_backend(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(Storage, 'backend', 'csv')
+    with pytest.raises(ValueError, match='Unknown storage backend "csv"'):
+        Storage._create_persistent_dict('general')  # pylint: disable=protected-access
+
+
+async def test_sqlite_storage_in_background(user: User, tmp_path):
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    path = tmp_path / 'storage.sqlite'
+    d = SqlitePersistentDict(path=path, id='user')
+    await d.initialize()
+    for i in range(100):
+        d['count'] = i
+    await d.close()
+
+    e = SqlitePersistentDict(path=path, id='user')
+    await e.initialize()
+    assert e == {'count': 99}
+
+
+@pytest.fixture
+def redis_server(monkeypatch: pytest.MonkeyPatch):
+    """Replace the Redis server by an in-memory fake and return a synchronous client to inspect it."""
+    redis = pytest.importorskip('redis.asyncio')
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.BlockingConnectionPool, 'from_url', classmethod(
+        lambda cls, url, **kwargs: cls(connection_class=fakeredis.FakeAsyncRedisConnection, server=server)))
+    return fakeredis.FakeRedis(server=server)
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.parametrize('hash_mode', [False, True])
+async def test_shared_redis_connection(user: User, redis_server, hash_mode: bool):  # pylint: disable=unused-argument
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    a = RedisPersistentDict(url='redis://test', id='shared', hash_mode=hash_mode)
+    b = RedisPersistentDict(url='redis://test', id='shared', hash_mode=hash_mode)
+    c = RedisPersistentDict(url='redis://test', id='other', key_prefix='other:', hash_mode=hash_mode)
+    for d in (a, b, c):
+        await d.initialize()
+    assert a.redis_client is b.redis_client is c.redis_client
+
+    await asyncio.sleep(0.1)
+    a['x'] = {'y': [1]}
+    c['z'] = 2
+    await _wait_for(lambda: b == {'x': {'y': [1]}})
+    assert b == {'x': {'y': [1]}}
+
+    metrics = app.storage.redis_metrics
+    assert metrics['pools'] == 1
+    assert metrics['storages'] == 3
+    assert metrics['subscriptions'] == 2
+    assert metrics['patterns'] == 2
+    assert metrics['dispatched_messages'] >= 2
+    assert metrics['dispatch_latency']['count'] == metrics['dispatched_messages']
+
+    for d in (a, b, c):
+        await d.close()
+    assert app.storage.redis_metrics['pools'] == 0
+
+
+async def test_redis_hash_mode(user: User, redis_server):
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    a = RedisPersistentDict(url='redis://test', id='hash', hash_mode=True)
+    b = RedisPersistentDict(url='redis://test', id='hash', hash_mode=True)
+    for d in (a, b):
+        await d.initialize()
+
+    a['x'] = {'y': [1]}
+    a['z'] = 1
+    await _wait_for(lambda: b == {'x': {'y': [1]}, 'z': 1})
+    assert b == {'x': {'y': [1]}, 'z': 1}
+    assert redis_server.hgetall('nicegui:hash') == {b'x': b'{"y":[1]}', b'z': b'1'}
+
+    redis_server.hset('nicegui:hash', 'z', b'"untouched"')
+    a['x']['y'].append(2)
+    await _wait_for(lambda: b['x'] == {'y': [1, 2]})
+    assert b['x'] == {'y': [1, 2]}
+    assert redis_server.hget('nicegui:hash', 'z') == b'"untouched"', 'only the changed field is written'
+
+    del b['x']
+    await _wait_for(lambda: 'x' not in a)
+    assert a == {'z': 1}
+    assert redis_server.hkeys('nicegui:hash') == [b'z']
+
+    a.clear()
+    await _wait_for(lambda: b == {})
+    assert b == {}
+    assert not redis_server.exists('nicegui:hash')
+
+    for d in (a, b):
+        await d.close()
+
+
+async def test_redis_hash_mode_with_concurrent_writes(user: User, redis_server):  # pylint: disable=unused-argument
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    a = RedisPersistentDict(url='redis://test', id='concurrent', hash_mode=True)
+    b = RedisPersistentDict(url='redis://test', id='concurrent', hash_mode=True)
+    for d in (a, b):
+        await d.initialize()
+
+    for i in range(10):
+        a[f'a{i}'] = i
+        b[f'b{i}'] = i
+        await asyncio.sleep(0)
+    expected = {**{f'a{i}': i for i in range(10)}, **{f'b{i}': i for i in range(10)}}
+    await _wait_for(lambda: a == b == expected)
+    assert a == expected
+    assert b == expected
+
+    for d in (a, b):
+        await d.close()
+
+
+async def test_slow_redis_key_does_not_stall_other_keys(user: User, redis_server, monkeypatch: pytest.MonkeyPatch):
+    # pylint: disable=unused-argument
+    @ui.page('/')
+    def page():
+        ui.label('ok')
+
+    await user.open('/')  # NOTE: needed to ensure NiceGUI's event loop is running
+    a = RedisPersistentDict(url='redis://test', id='slow', hash_mode=True)
+    b = RedisPersistentDict(url='redis://test', id='slow', hash_mode=True)
+    c = RedisPersistentDict(url='redis://test', id='fast', hash_mode=True)
+    d = RedisPersistentDict(url='redis://test', id='fast', hash_mode=True)
+    for x in (a, b, c, d):
+        await x.initialize()
+    await asyncio.sleep(0.1)
+
+    release = asyncio.Event()
+    handle_message = b._handle_message  # pylint: disable=protected-access
+
+    async def slow_handle_message(data: bytes) -> None:
+        await release.wait()
+        await handle_message(data)
+    monkeypatch.setattr(b, '_handle_message', slow_handle_message)
+    a['x'] = 1
+    await asyncio.sleep(0.1)
+    a['x'] = 2
+    c['y'] = 1
+    await _wait_for(lambda: d == {'y': 1})
+    assert d == {'y': 1}
+    assert b == {}
+
+    release.set()
+    await _wait_for(lambda: b == {'x': 2})
+    assert b == {'x': 2}
+
+    for x in (a, b, c, d):
+        await x.close()
+
+
 @pytest.mark.parametrize('custom_cookie_headers', [False, True])
 def test_storage_cookie_headers(screen: Screen, custom_cookie_headers: bool):
     @ui.page('/')
@@ -142,9 +142,17 @@ def strict():
         This is done in a `refresh_loop()` which runs every 0.1 seconds.
         The interval can be configured via `binding_refresh_interval` in `ui.run()`.
 
+    Active links whose source is an observable collection like `app.storage.user`
+    or an object with an `on_binding_change(callback)` method calling `callback()` after each change
+    are only checked in the next step of the `refresh_loop()` after their source reported a change.
+
     The "bindable properties" are very efficient and don't cost anything as long as the values don't change.
-    But the "active links" need to check all bound values 10 times per second.
+    But all other "active links" need to check all bound values 10 times per second.
     This can get costly, especially if you bind to complex objects like lists or dictionaries.
+    Therefore each step of the `refresh_loop()` only polls links for at most `binding.REFRESH_TIME_BUDGET` seconds
+    (default: 0.005) and continues with the remaining links in the next step.
+    Links whose source did not change are checked less often, at least every `binding.MAX_REFRESH_BACKOFF` rounds
+    (default: 8).
 
     Because it is crucial not to block the main thread for too long,
     we show a warning if one step of the `refresh_loop()` takes too long.
@@ -152,6 +160,13 @@ def strict():
     But often the warning is a valuable indicator for a performance or memory issue.
     If your CPU would be busy updating bindings a significant duration,
     nothing else could happen on the main thread and the UI "hangs".
+    To find the bindings causing the most work, you can call `binding.start_profiling()`
+    and later `binding.log_profile_report()` or `binding.get_profile_report()`
+    to list evaluation counts, transform times and change rates per binding.
+
+    When changing many bindable properties at once, you can wrap the changes in a `with binding.batch():` block
+    or decorate the handler with `@binding.batch()`.
+    The changes are then propagated only once when leaving the block.
 
     The following demo shows how to define and use bindable properties for a `Demo` class like in the first demo.
     The `number` property is now a `BindableProperty`,
@@ -192,3 +207,29 @@ def bindable_dataclass():
     ui.slider(min=1, max=3).bind_value(demo, 'number')
     ui.toggle({1: 'A', 2: 'B', 3: 'C'}).bind_value(demo, 'number')
     ui.number(min=1, max=3).bind_value(demo, 'number')
+
+
+@doc.demo('Computed properties', '''
+    The `computed` decorator turns a method into a bindable property whose value is derived from other properties.
+    NiceGUI records which bindable or computed properties are read while evaluating the method,
+    caches the result and only re-evaluates it when one of them changes.
+    Bound elements are only updated if the result actually differs.
+
+    *Added in version 3.5.0*
+''')
+def computed_properties():
+    from nicegui import binding
+
+    @binding.bindable_dataclass
+    class Demo:
+        first: str = 'Ada'
+        last: str = 'Lovelace'
+
+        @binding.computed
+        def full_name(self) -> str:
+            return f'{self.first} {self.last}'
+
+    demo = Demo()
+    ui.input('First name').bind_value(demo, 'first')
+    ui.input('Last name').bind_value(demo, 'last')
+    ui.label().bind_text_from(demo, 'full_name')
@@ -113,10 +113,16 @@ doc.text('', '''
     - `MATPLOTLIB` (default: true) can be set to `false` to avoid the potentially costly import of Matplotlib.
         This will make `ui.pyplot` and `ui.line_plot` unavailable.
     - `NICEGUI_STORAGE_PATH` (default: local ".nicegui") can be set to change the location of the storage files.
+    - `NICEGUI_STORAGE_BACKEND` (default: "file") can be set to "sqlite" to store all persistent storage
+        in a single SQLite database instead of one JSON file per user.
+    - `NICEGUI_STORAGE_JOURNAL` (default: false) can be set to `true` to append changes of local storage files to a journal
+        instead of rewriting the whole file on every change.
     - `MARKDOWN_CONTENT_CACHE_SIZE` (default: 1000): The maximum number of Markdown content snippets that are cached in memory.
     - `RST_CONTENT_CACHE_SIZE` (default: 1000): The maximum number of ReStructuredText content snippets that are cached in memory.
     - `NICEGUI_REDIS_URL` (default: None, means local file storage): The URL of the Redis server to use for shared persistent storage.
     - `NICEGUI_REDIS_KEY_PREFIX` (default: "nicegui:"): The prefix for Redis keys.
+    - `NICEGUI_REDIS_HASH_MODE` (default: false) can be set to `true` to store each top-level key as a field of a Redis hash,
+        so that only changed keys are written and synchronized between instances.
 ''')
 def env_var_demo():
     from nicegui.elements import markdown
@@ -189,6 +189,15 @@ doc.text('Redis storage', '''
     - For `app.storage.user` it's all the data of the user.
     - For `app.storage.tab` it's all the data stored for this specific tab.
 
+    Setting the `NICEGUI_REDIS_HASH_MODE` environment variable to `true` changes this:
+    Each top-level key is stored as a field of a Redis hash
+    and only the changed keys are written and fetched by the other instances.
+    Existing data is converted when it is loaded for the first time.
+
+    All storages of a NiceGUI instance share a pool of at most 50 connections per Redis URL
+    and a single pub/sub connection, which dispatches the change notifications to the affected storages.
+    `app.storage.redis_metrics` provides the number of connections and storages as well as the dispatch latency.
+
     If you have large data sets, we suggest to use a database instead.
     See our [database example](https://github.com/zauberzeug/nicegui/blob/main/examples/sqlite_database/main.py) for a demo with SQLite.
     But of course to sync between multiple instances you should replace SQLite with PostgreSQL or similar.